@@ -0,0 +1,328 @@
+"""Asynchronous HTTP/WebSocket API for running interviews without Streamlit.
+
+Serves the same ``InterviewSession`` flow as the web app. Engine turns
+(translation, generation, sentiment) and session persistence run on thread
+pools, so the event loop only moves messages and one process can hold many
+concurrent interviews:
+
+    python api_server.py --port 8600
+
+Endpoints:
+
+* ``POST /sessions`` starts an interview and returns the greeting.
+* ``GET /sessions/<id>`` returns the conversation so far.
+* ``POST /sessions/<id>/messages`` with ``{"text": ...}`` runs one turn.
+* ``GET /metrics`` serves turn latency histograms in Prometheus format.
+* ``/sessions/<id>/ws`` is a WebSocket; send ``{"text": ...}`` frames and
+  receive ``{"messages": [...], "stage": ..., "ended": ...}`` replies.
+
+Each session accepts at most TALENTSCOUT_API_MAX_PENDING queued turns;
+beyond that REST calls get HTTP 429 and WebSocket clients a ``busy`` error.
+"""
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import tornado.web
+import tornado.websocket
+
+from interview_session import InterviewSession, SUPPORTED_LANGUAGES
+from model_registry import get_model_handle
+from prompt_catalog import prepare_prompt_catalog
+from session_store import get_session_store, SessionSnapshot
+from turn_metrics import render_prometheus
+
+API_PORT = int(os.environ.get("TALENTSCOUT_API_PORT", "8600"))
+# Threads running interview turns (translation, generation, sentiment)
+API_WORKERS = int(os.environ.get("TALENTSCOUT_API_WORKERS", "8"))
+# Turns a single session may have waiting before new ones are refused
+MAX_PENDING = int(os.environ.get("TALENTSCOUT_API_MAX_PENDING", "2"))
+# Live sessions kept in memory; idle ones are reloaded from the session store
+MAX_SESSIONS = int(os.environ.get("TALENTSCOUT_API_MAX_SESSIONS", "10000"))
+# Web pages on other hosts allowed to open interview WebSockets, e.g. "https://jobs.example.com"
+ALLOWED_ORIGINS = {
+    origin.strip().rstrip("/").lower()
+    for origin in os.environ.get("TALENTSCOUT_API_ALLOWED_ORIGINS", "").split(",")
+    if origin.strip()
+}
+
+# Raised when a session already has MAX_PENDING turns waiting
+class SessionBusy(Exception):
+    pass
+
+# One live interview plus what the server needs to serialize its turns
+class SessionEntry:
+    __slots__ = ("interview", "lock", "snapshot", "pending", "sockets")
+
+    def __init__(self, interview, snapshot=None):
+        self.interview = interview
+        self.lock = asyncio.Lock()
+        self.snapshot = snapshot or SessionSnapshot()
+        self.pending = 0
+        # Open WebSockets; the entry stays in memory while any is connected
+        self.sockets = 0
+
+    def idle(self):
+        return not (self.pending or self.sockets or self.lock.locked())
+
+# Function to describe a conversation update for API clients
+def reply(interview, messages):
+    return {
+        "session_id": interview.session_id,
+        "messages": [message.to_dict() for message in messages],
+        "stage": interview.stage,
+        "ended": interview.conversation_ended,
+    }
+
+# Interview sessions for one server process
+class InterviewService:
+    def __init__(self, workers=API_WORKERS, max_sessions=MAX_SESSIONS):
+        # The model is loaded on the first generation, so the server starts without it
+        self.model = get_model_handle("distilgpt2", max_length=100, lazy=True)
+        self.store = get_session_store()
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._turns = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="talentscout-turn")
+        # SQLite writes are serialized anyway; one thread keeps them in order
+        self._persistence = ThreadPoolExecutor(max_workers=1, thread_name_prefix="talentscout-persist")
+
+    def _remember(self, entry):
+        self._sessions[entry.interview.session_id] = entry
+        self._sessions.move_to_end(entry.interview.session_id)
+        # Drop the least recently used idle sessions. With a session store they are
+        # reloaded on the next request; without one they are gone, which keeps memory bounded.
+        excess = len(self._sessions) - self.max_sessions
+        if excess <= 0:
+            return
+        evicted = []
+        for session_id, oldest in self._sessions.items():
+            if len(evicted) >= excess:
+                break
+            if oldest is not entry and oldest.idle():
+                evicted.append(session_id)
+        for session_id in evicted:
+            del self._sessions[session_id]
+
+    def _persist(self, entry):
+        if self.store is None:
+            return
+        state = entry.interview.to_state()
+        fields, appends, rewrites = entry.snapshot.diff(state)
+        if fields or appends or rewrites:
+            self.store.save(entry.interview.session_id, fields, appends, rewrites)
+            entry.snapshot.mark_saved(state)
+
+    def _load(self, session_id):
+        saved = self.store.load(session_id) if self.store is not None else None
+        if saved is None:
+            return None
+        saved["session_id"] = session_id
+        snapshot = SessionSnapshot()
+        snapshot.mark_saved(saved)
+        return SessionEntry(InterviewSession.from_state(saved, model=self.model), snapshot)
+
+    async def create(self):
+        loop = asyncio.get_running_loop()
+        entry = SessionEntry(InterviewSession(model=self.model))
+        async with entry.lock:
+            await loop.run_in_executor(self._turns, entry.interview.greet)
+            await loop.run_in_executor(self._persistence, self._persist, entry)
+            self._remember(entry)
+            return reply(entry.interview, list(entry.interview.messages))
+
+    async def get(self, session_id):
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            # Started by another worker, or evicted while idle
+            loop = asyncio.get_running_loop()
+            entry = await loop.run_in_executor(self._persistence, self._load, session_id)
+            if entry is None:
+                return None
+            # Another request may have loaded it while we waited
+            entry = self._sessions.get(session_id, entry)
+            self._remember(entry)
+        return entry
+
+    async def turn(self, entry, text):
+        if entry.pending >= MAX_PENDING:
+            raise SessionBusy(entry.interview.session_id)
+        loop = asyncio.get_running_loop()
+        entry.pending += 1
+        try:
+            async with entry.lock:
+                interview = entry.interview
+                if interview.conversation_ended:
+                    return reply(interview, [])
+                # Count from the first message ever: old messages may be spilled during the turn
+                start = interview.message_offset + len(interview.messages)
+                await loop.run_in_executor(self._turns, interview.process_user_input, text)
+                await loop.run_in_executor(self._persistence, self._persist, entry)
+                return reply(interview, interview.messages[max(start - interview.message_offset, 0):])
+        finally:
+            entry.pending -= 1
+
+    def bytes_per_session(self, sample=100):
+        # Average over the most recently used sessions; measuring all of them is slow
+        entries = list(self._sessions.values())[-sample:]
+        if not entries:
+            return 0
+        return sum(entry.interview.memory_bytes() for entry in entries) // len(entries)
+
+    def shutdown(self):
+        self._turns.shutdown(wait=True)
+        self._persistence.shutdown(wait=True)
+
+# Shared JSON helpers for the REST handlers
+class JSONHandler(tornado.web.RequestHandler):
+    def initialize(self, service):
+        self.service = service
+
+    def send_json(self, data, status=200):
+        self.set_status(status)
+        self.set_header("Content-Type", "application/json")
+        self.finish(json.dumps(data, ensure_ascii=False))
+
+    def write_error(self, status_code, **kwargs):
+        self.send_json({"error": self._reason}, status_code)
+
+    async def session_or_404(self, session_id):
+        entry = await self.service.get(session_id)
+        if entry is None:
+            raise tornado.web.HTTPError(404, reason="Unknown session")
+        return entry
+
+class HealthHandler(JSONHandler):
+    def get(self):
+        self.send_json({
+            "status": "ok",
+            "sessions": len(self.service._sessions),
+            "bytes_per_session": self.service.bytes_per_session(),
+        })
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4")
+        self.finish(render_prometheus())
+
+class SessionsHandler(JSONHandler):
+    async def post(self):
+        self.send_json(await self.service.create(), 201)
+
+class SessionHandler(JSONHandler):
+    async def get(self, session_id):
+        entry = await self.session_or_404(session_id)
+        async with entry.lock:
+            self.send_json(reply(entry.interview, list(entry.interview.messages)))
+
+class MessagesHandler(JSONHandler):
+    async def post(self, session_id):
+        try:
+            text = json.loads(self.request.body)["text"]
+        except (ValueError, KeyError, TypeError):
+            raise tornado.web.HTTPError(400, reason='Expected a JSON body like {"text": "..."}')
+        entry = await self.session_or_404(session_id)
+        try:
+            self.send_json(await self.service.turn(entry, str(text)))
+        except SessionBusy:
+            raise tornado.web.HTTPError(429, reason="A previous message is still being processed")
+
+# WebSocket connection that runs one interview's turns in order
+class InterviewSocket(tornado.websocket.WebSocketHandler):
+    def initialize(self, service):
+        self.service = service
+        self.entry = None
+        self.inbox = None
+        self.worker = None
+
+    def check_origin(self, origin):
+        # Same-host pages (Tornado's default check) plus the configured allow-list
+        return origin.rstrip("/").lower() in ALLOWED_ORIGINS or super().check_origin(origin)
+
+    async def open(self, session_id):
+        self.entry = await self.service.get(session_id)
+        if self.entry is None:
+            self.close(4404, "Unknown session")
+            return
+        # Keep this copy of the session in memory while the socket is open
+        self.entry.sockets += 1
+        # Bounded per connection: a client that outpaces the engine gets "busy"
+        self.inbox = asyncio.Queue(MAX_PENDING)
+        self.worker = asyncio.ensure_future(self.consume())
+
+    def on_message(self, message):
+        if self.inbox is None:
+            return
+        try:
+            text = str(json.loads(message)["text"])
+        except (ValueError, KeyError, TypeError):
+            self.send({"error": 'Expected a JSON frame like {"text": "..."}'})
+            return
+        try:
+            self.inbox.put_nowait(text)
+        except asyncio.QueueFull:
+            self.send({"error": "busy"})
+
+    async def consume(self):
+        while True:
+            text = await self.inbox.get()
+            if text is None:
+                return
+            try:
+                update = await self.service.turn(self.entry, text)
+            except SessionBusy:
+                update = {"error": "busy"}
+            # Waiting for the write keeps slow readers from piling up replies
+            if not await self.send(update):
+                return
+
+    async def send(self, data):
+        try:
+            await self.write_message(json.dumps(data, ensure_ascii=False))
+            return True
+        except tornado.websocket.WebSocketClosedError:
+            return False
+
+    def on_close(self):
+        if self.inbox is None:
+            return
+        self.entry.sockets -= 1
+        # Let the current turn finish, drop the rest and stop the worker
+        while not self.inbox.empty():
+            self.inbox.get_nowait()
+        self.inbox.put_nowait(None)
+
+# Function to build the Tornado application for a service
+def make_app(service):
+    args = {"service": service}
+    return tornado.web.Application([
+        (r"/health", HealthHandler, args),
+        (r"/metrics", MetricsHandler),
+        (r"/sessions", SessionsHandler, args),
+        (r"/sessions/([0-9A-Za-z_-]+)", SessionHandler, args),
+        (r"/sessions/([0-9A-Za-z_-]+)/messages", MessagesHandler, args),
+        (r"/sessions/([0-9A-Za-z_-]+)/ws", InterviewSocket, args),
+    ])
+
+async def serve(port, workers):
+    service = InterviewService(workers=workers)
+    prepare_prompt_catalog(SUPPORTED_LANGUAGES.values())
+    app = make_app(service)
+    app.listen(port)
+    print(f"TalentScout API listening on http://localhost:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        service.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve interviews over HTTP and WebSocket.")
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="threads running interview turns")
+    args = parser.parse_args()
+    asyncio.run(serve(args.port, args.workers))
+
+if __name__ == "__main__":
+    main()
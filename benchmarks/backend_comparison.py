@@ -0,0 +1,93 @@
+"""Compare latency, throughput and memory of the inference backends.
+
+Each backend runs in its own interpreter so its resident memory is measured
+in isolation. All backends answer the same prompts with the same generation
+controls the app uses:
+
+    python benchmarks/backend_comparison.py --backends pipeline int8 onnx --calls 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TECHS = ["python", "javascript", "react", "java", "sql", "mongodb", "aws", "docker", "git", "devops"]
+PROMPT = "Create a challenging technical interview question about {tech} for a software developer position:"
+
+# Function to benchmark one backend inside this interpreter and return its numbers
+def measure(model_name, backend, calls):
+    from generation_controls import count_tokens, question_generation_kwargs
+    from model_registry import current_rss_bytes, get_model
+
+    rss_start = current_rss_bytes()
+    start = time.perf_counter()
+    model = get_model(model_name, backend=backend)
+    load_s = time.perf_counter() - start
+    if model is None:
+        return {"backend": backend, "error": "model could not be loaded"}
+
+    # One untimed call so lazy initialisation doesn't skew the first sample
+    model(PROMPT.format(tech="python"), **question_generation_kwargs(model))
+
+    latencies, tokens = [], 0
+    for i in range(calls):
+        prompt = PROMPT.format(tech=TECHS[i % len(TECHS)])
+        start = time.perf_counter()
+        text = model(prompt, **question_generation_kwargs(model))[0]["generated_text"]
+        latencies.append(time.perf_counter() - start)
+        tokens += count_tokens(model, text.split(prompt)[1])
+
+    latencies.sort()
+    return {
+        "backend": backend,
+        "load_s": load_s,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p95_ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))],
+        "tokens_per_s": tokens / sum(latencies),
+        "rss_mb": current_rss_bytes() / 2**20,
+        "model_rss_mb": (current_rss_bytes() - rss_start) / 2**20,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="distilgpt2")
+    parser.add_argument("--backends", nargs="+", default=["pipeline", "int8", "onnx"])
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args.model, args.worker, args.calls)))
+        return
+
+    results = []
+    for backend in args.backends:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--model", args.model,
+             "--calls", str(args.calls), "--worker", backend],
+            cwd=ROOT,
+            capture_output=True,
+            text=True
+        )
+        lines = out.stdout.strip().splitlines()
+        try:
+            results.append(json.loads(lines[-1]))
+        except (IndexError, ValueError):
+            results.append({"backend": backend, "error": (out.stderr.strip().splitlines() or ["no output"])[-1]})
+
+    print(f"{'backend':<10}{'load s':>8}{'p50 ms':>10}{'p95 ms':>10}{'tok/s':>8}{'RSS MB':>9}{'model MB':>10}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['backend']:<10}  error: {r['error']}")
+            continue
+        print(f"{r['backend']:<10}{r['load_s']:>8.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+              f"{r['tokens_per_s']:>8.1f}{r['rss_mb']:>9.0f}{r['model_rss_mb']:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure per-turn chat rendering time as the transcript grows.
+
+Seeds a session with transcripts of increasing length and times the script
+runs needed to show one turn. The old full-replay mode drew every bubble
+twice per turn (the run plus st.rerun()); incremental mode draws the recent
+messages once and folds the rest into a single block:
+
+    python benchmarks/chat_render.py --lengths 50 100 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("TALENTSCOUT_TRANSLATOR", "stub")
+os.environ.setdefault("TALENTSCOUT_TRANSLATION_CACHE", "")
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+from streamlit.testing.v1 import AppTest
+
+from interview_session import InterviewSession
+from session_memory import Message
+
+# Function to build a transcript of alternating assistant and user messages
+def make_transcript(length):
+    messages = []
+    for i in range(length):
+        if i % 2:
+            messages.append({
+                "role": "user",
+                "content": f"Answer number {i // 2} with a few sentences of detail about my work.",
+                "sentiment": {"category": ("positive", "neutral", "negative")[i % 3], "score": 0.1},
+            })
+        else:
+            messages.append({"role": "assistant", "content": f"About Python: question number {i // 2}?"})
+    return messages
+
+# Function to time the script runs one turn needs for a transcript length
+def time_turn(length, incremental, repeats):
+    os.environ["TALENTSCOUT_INCREMENTAL_RENDER"] = "1" if incremental else "0"
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    interview = InterviewSession()
+    interview.stage = "technical_questions"
+    interview.messages = [Message.from_dict(message) for message in make_transcript(length)]
+    at.session_state["interview"] = interview
+    at.run()
+    runs_per_turn = 1 if incremental else 2
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(runs_per_turn):
+            at.run()
+        samples.append(time.perf_counter() - start)
+    return 1000 * statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'messages':>9}{'full ms':>10}{'incremental ms':>16}")
+    for length in args.lengths:
+        full = time_turn(length, incremental=False, repeats=args.repeats)
+        incremental = time_turn(length, incremental=True, repeats=args.repeats)
+        print(f"{length:>9}{full:>10.1f}{incremental:>16.1f}")
+
+if __name__ == "__main__":
+    main()
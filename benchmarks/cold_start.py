@@ -0,0 +1,78 @@
+"""Measure cold-start time of app.py with lazy and eager imports.
+
+Each sample imports the app in a fresh interpreter, so module caches never
+carry over between runs. Results can be appended to a JSON file to track
+cold start across releases:
+
+    python benchmarks/cold_start.py --runs 5 --output benchmarks/results/cold_start.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports the app and prints how long it took, in seconds
+_PROBE = (
+    "import time; start = time.perf_counter(); import app; "
+    "print(time.perf_counter() - start)"
+)
+
+# Function to time a single app import in a fresh interpreter
+def time_import(eager):
+    env = dict(os.environ)
+    env["TALENTSCOUT_EAGER_IMPORTS"] = "1" if eager else "0"
+    env["TALENTSCOUT_WARMUP"] = "0"
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+# Function to summarize a list of samples
+def summarize(samples):
+    return {
+        "runs": len(samples),
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "max_s": max(samples),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="JSON file to append results to")
+    args = parser.parse_args()
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "lazy": summarize([time_import(eager=False) for _ in range(args.runs)]),
+        "eager": summarize([time_import(eager=True) for _ in range(args.runs)]),
+    }
+
+    for mode in ("lazy", "eager"):
+        r = results[mode]
+        print(f"{mode:>5}: median {r['median_s'] * 1000:8.1f} ms "
+              f"(min {r['min_s'] * 1000:.1f}, max {r['max_s'] * 1000:.1f}, runs {r['runs']})")
+
+    if args.output:
+        history = []
+        if os.path.exists(args.output):
+            with open(args.output) as f:
+                history = json.load(f)
+        history.append(results)
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(history, f, indent=2)
+
+if __name__ == "__main__":
+    main()
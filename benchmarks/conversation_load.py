@@ -0,0 +1,293 @@
+"""Replay scripted interviews through the engine under load.
+
+Every conversation walks all stages from ``greeting`` to ``wrap_up`` in one
+of several languages and tech stacks. The translator, language detector and
+distilgpt2 pipeline are replaced by deterministic local fakes with
+configurable latency, so runs are repeatable and need no network. Reports
+p50/p95/p99 turn latency per stage, throughput and memory per session, and
+can append the results to a JSON file, comparing p95 with the previous run:
+
+    python benchmarks/conversation_load.py --sessions 200 --concurrency 16 \\
+        --output benchmarks/results/conversation_load.json
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep the run self-contained: no disk caches, no pre-generated pool, and
+# transcripts, search index and session snapshots in a scratch directory
+_scratch = tempfile.mkdtemp(prefix="talentscout-load-")
+os.environ.setdefault("TALENTSCOUT_TRANSLATION_CACHE", "")
+os.environ.setdefault("TALENTSCOUT_PROMPT_CATALOG", "")
+os.environ.setdefault("TALENTSCOUT_QUESTION_POOL", "0")
+os.environ.setdefault("TALENTSCOUT_TRANSCRIPT_DIR", os.path.join(_scratch, "chat_store"))
+os.environ.setdefault("TALENTSCOUT_SEARCH_INDEX", os.path.join(_scratch, "search_index.db"))
+os.environ.setdefault("TALENTSCOUT_SESSION_DB", os.path.join(_scratch, "sessions.db"))
+
+import interview_session
+import model_registry
+import translation_cache
+from interview_session import InterviewSession
+
+# Candidate lines per language and stage: (what the candidate types, English gloss)
+SCRIPTS = {
+    "en": {
+        "greeting": [("I'm doing well, happy to be here today", None)],
+        "experience": [("I have about five years of professional experience", None)],
+        "position": [("I would like to apply for a software developer role", None)],
+        "location": [("I currently live in Toronto, Canada", None)],
+        "technical_questions": [
+            ("I would start by profiling the code to find the slowest parts first", None),
+            ("It varies with the workload, but usually I prefer simple solutions", None),
+        ],
+        "wrap_up": [("No, that covers everything I wanted to say, bye", None)],
+    },
+    "es": {
+        "greeting": [("Estoy muy bien, encantado de estar aquí hoy", "I'm very well, glad to be here today")],
+        "experience": [("Tengo unos cinco años de experiencia profesional", "I have about five years of professional experience")],
+        "position": [("Me gustaría postular a un puesto de desarrollador", "I would like to apply for a developer position")],
+        "location": [("Actualmente vivo en Madrid, España", "I currently live in Madrid, Spain")],
+        "technical_questions": [
+            ("Primero mediría el rendimiento para encontrar las partes lentas", "First I would measure performance to find the slow parts"),
+            ("Depende de la carga, pero prefiero soluciones sencillas", "It varies with the load, but I prefer simple solutions"),
+        ],
+        "wrap_up": [("No, eso es todo lo que quería decir, adiós", "No, that is all I wanted to say, goodbye")],
+    },
+    "fr": {
+        "greeting": [("Je vais très bien, ravi d'être ici aujourd'hui", "I am very well, glad to be here today")],
+        "experience": [("J'ai environ cinq ans d'expérience professionnelle", "I have about five years of professional experience")],
+        "position": [("Je souhaite postuler à un poste de développeur", "I wish to apply for a developer position")],
+        "location": [("J'habite actuellement à Lyon, en France", "I currently live in Lyon, France")],
+        "technical_questions": [
+            ("Je commencerais par mesurer les performances du code", "I would start by measuring the performance of the code"),
+            ("Cela dépend de la charge, mais je préfère la simplicité", "It varies with the load, but I prefer simplicity"),
+        ],
+        "wrap_up": [("Non, c'est tout ce que je voulais dire, au revoir", "No, that is all I wanted to say, goodbye")],
+    },
+    "de": {
+        "greeting": [("Mir geht es sehr gut, schön heute hier zu sein", "I am very well, nice to be here today")],
+        "experience": [("Ich habe etwa fünf Jahre Berufserfahrung", "I have about five years of professional experience")],
+        "position": [("Ich möchte mich als Softwareentwickler bewerben", "I would like to apply as a software developer")],
+        "location": [("Ich wohne derzeit in Berlin, Deutschland", "I currently live in Berlin, Germany")],
+        "technical_questions": [
+            ("Ich würde zuerst die Leistung des Codes messen", "I would first measure the performance of the code"),
+            ("Es hängt von der Last ab, aber ich mag einfache Lösungen", "It varies with the load, but I like simple solutions"),
+        ],
+        "wrap_up": [("Nein, das ist alles, was ich sagen wollte, tschüss", "No, that is all I wanted to say, goodbye")],
+    },
+}
+
+TECH_STACKS = [
+    "Python, SQL",
+    "JavaScript, React, CSS",
+    "Java, Docker",
+    "Go, Python",
+    "Rust, Elixir",
+]
+
+NAMES = ["Ana Lopez", "Jean Martin", "Lena Vogel", "Sam Carter", "Priya Nair", "Kenji Sato"]
+
+# Most turns one scripted conversation may take before it is abandoned
+MAX_TURNS = 60
+
+# English glosses and detected languages for every scripted line
+_GLOSSES = {}
+_LANGUAGES = {}
+for _lang, _stages in SCRIPTS.items():
+    for _lines in _stages.values():
+        for _text, _gloss in _lines:
+            _GLOSSES[_text] = _gloss or _text
+            _LANGUAGES[_text] = _lang
+
+# Deterministic stand-in for GoogleTranslator
+class FakeTranslator:
+    latency = 0.0
+
+    def __init__(self, source="auto", target="en"):
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        time.sleep(self.latency)
+        if self.target == "en":
+            return _GLOSSES.get(text, text)
+        return f"[{self.target}] {text}"
+
+# Deterministic stand-in for langdetect.detect
+class FakeDetector:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def __call__(self, text):
+        time.sleep(self.latency)
+        return _LANGUAGES.get(text, "en")
+
+# Deterministic stand-in for the distilgpt2 text-generation pipeline
+class FakePipeline:
+    def __init__(self, latency):
+        self.latency = latency
+        self._counter = itertools.count()
+
+    def __call__(self, prompts, **kwargs):
+        time.sleep(self.latency)
+        single = isinstance(prompts, str)
+        batch = [prompts] if single else prompts
+        outputs = []
+        for prompt in batch:
+            number = next(self._counter)
+            question = f" How would you approach scaling problem number {number} in this stack?"
+            outputs.append([{"generated_text": prompt + question}])
+        return outputs[0] if single else outputs
+
+# Function to swap the external services for the fakes
+def install_fakes(translate_ms, detect_ms, generate_ms):
+    FakeTranslator.latency = translate_ms / 1000.0
+    translation_cache.make_translator = FakeTranslator
+    interview_session.detect = FakeDetector(detect_ms / 1000.0)
+    if generate_ms < 0:
+        return None
+    model_registry.get_model("distilgpt2", loader=lambda name, max_length: FakePipeline(generate_ms / 1000.0))
+    return model_registry.get_model_handle("distilgpt2", max_length=100)
+
+# Function to pick the candidate's next line for the current stage
+def next_line(number, lang, stage, turn):
+    if stage == "name":
+        return NAMES[number % len(NAMES)]
+    if stage == "email":
+        return f"candidate{number}@example.com"
+    if stage == "phone":
+        return f"+1 555 {number % 10000:04d}"
+    if stage == "tech_stack":
+        return TECH_STACKS[number % len(TECH_STACKS)]
+    lines = SCRIPTS[lang].get(stage) or SCRIPTS[lang]["technical_questions"]
+    return lines[turn % len(lines)][0]
+
+# Function to replay one conversation; returns its [(stage, seconds)] turns
+def replay(number, model, think_s=0.0, keep=None):
+    lang = sorted(SCRIPTS)[number % len(SCRIPTS)]
+    session = InterviewSession(model=model)
+    session.greet()
+    timings = []
+    for turn in range(MAX_TURNS):
+        if session.conversation_ended:
+            break
+        stage = session.stage
+        text = next_line(number, lang, stage, turn)
+        if think_s:
+            time.sleep(think_s)
+        started = time.perf_counter()
+        session.process_user_input(text)
+        timings.append((stage, time.perf_counter() - started))
+    if keep is not None:
+        keep.append(session)
+    return timings
+
+# Function to turn latency samples (seconds) into a millisecond summary
+def summarize(samples):
+    values = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"count": len(samples), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}
+
+# Function to estimate memory held by each finished session
+def memory_per_session(model, sessions):
+    keep = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for number in range(sessions):
+        replay(number, model, keep=keep)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    grown = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Traced growth also counts shared caches; memory_bytes() is the session's own state
+    own = sum(session.memory_bytes() for session in keep)
+    return grown / sessions, own / sessions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8, help="conversations replayed at once")
+    parser.add_argument("--translate-ms", type=float, default=30.0)
+    parser.add_argument("--detect-ms", type=float, default=5.0)
+    parser.add_argument("--generate-ms", type=float, default=150.0, help="negative disables the LLM")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="candidate typing time per turn")
+    parser.add_argument("--memory-sessions", type=int, default=50)
+    parser.add_argument("--output", help="JSON file to append results to")
+    args = parser.parse_args()
+
+    model = install_fakes(args.translate_ms, args.detect_ms, args.generate_ms)
+    # Build the per-language prompt catalog once so it is not charged to a session
+    for number in range(len(SCRIPTS)):
+        replay(number, model)
+
+    by_stage = defaultdict(list)
+    lock = threading.Lock()
+
+    def run(number):
+        timings = replay(number, model, think_s=args.think_ms / 1000.0)
+        with lock:
+            for stage, seconds in timings:
+                by_stage[stage].append(seconds)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(run, range(args.sessions)))
+    elapsed = time.perf_counter() - started
+
+    turns = sum(len(samples) for samples in by_stage.values())
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "stages": {stage: summarize(samples) for stage, samples in by_stage.items()},
+        "all_turns": summarize([s for samples in by_stage.values() for s in samples]),
+        "turns_per_s": turns / elapsed,
+        "sessions_per_s": args.sessions / elapsed,
+    }
+    results["bytes_per_session"], results["state_bytes_per_session"] = memory_per_session(
+        model, args.memory_sessions
+    )
+
+    previous = None
+    if args.output and os.path.exists(args.output):
+        with open(args.output) as f:
+            history = json.load(f)
+        previous = history[-1] if history else None
+
+    print(f"{'stage':<22}{'turns':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'p95 vs last':>13}")
+    for stage, row in list(results["stages"].items()) + [("all", results["all_turns"])]:
+        change = ""
+        if previous is not None:
+            last = previous["all_turns"] if stage == "all" else previous["stages"].get(stage)
+            if last and last["p95_ms"]:
+                change = f"{100 * (row['p95_ms'] / last['p95_ms'] - 1):+.0f}%"
+        print(f"{stage:<22}{row['count']:>7}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{change:>13}")
+    print(f"{results['turns_per_s']:.0f} turns/s, {results['sessions_per_s']:.1f} interviews/s, "
+          f"{results['bytes_per_session'] / 1024:.1f} KiB per finished session "
+          f"({results['state_bytes_per_session'] / 1024:.1f} KiB of interview state)")
+
+    if args.output:
+        history = []
+        if os.path.exists(args.output):
+            with open(args.output) as f:
+                history = json.load(f)
+        history.append(results)
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(history, f, indent=2)
+
+if __name__ == "__main__":
+    main()
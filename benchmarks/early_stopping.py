@@ -0,0 +1,123 @@
+"""Compare question generation with and without early stopping.
+
+Reports tokens generated and latency per call for the old fixed-length
+decoding and for the new stop-at-first-question controls. A fake token-level
+generator is used by default; pass ``--model distilgpt2`` for the real one:
+
+    python benchmarks/early_stopping.py --calls 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generation_controls import first_question, question_generation_kwargs
+from model_registry import get_model
+
+PROMPT = "Create a challenging technical interview question about {tech} for a software developer position:"
+CONTINUATION = (
+    "\n\nHow would you design a caching layer for a read-heavy {tech} service? "
+    "Describe the trade-offs you would consider, how you would keep the cache "
+    "consistent with the database, and which metrics you would watch once it is "
+    "deployed. Then explain how the design changes when traffic grows tenfold and "
+    "when writes become as frequent as reads in production workloads today."
+)
+
+# Word-level tokenizer for the fake generator (id 0 is end-of-sequence)
+class FakeTokenizer:
+    eos_token_id = 0
+
+    def __init__(self):
+        self._ids = {}
+        self._words = {0: ""}
+
+    def encode(self, text):
+        ids = []
+        for word in text.replace("\n", " \n ").split(" "):
+            if word not in self._ids:
+                self._ids[word] = len(self._ids) + 1
+                self._words[self._ids[word]] = word
+            ids.append(self._ids[word])
+        return ids
+
+    def decode(self, ids, skip_special_tokens=False):
+        return " ".join(self._words[int(i)] for i in ids if int(i) != 0).replace(" \n ", "\n")
+
+# Emits one token at a time, honouring the generate() controls like the real pipeline
+class FakeTokenGenerator:
+    def __init__(self, per_token_ms, max_length=100):
+        self.tokenizer = FakeTokenizer()
+        self.per_token = per_token_ms / 1000.0
+        self.max_length = max_length
+
+    def __call__(self, prompt, max_new_tokens=None, max_time=None, stopping_criteria=(), streamer=None, **kwargs):
+        prompt_ids = self.tokenizer.encode(prompt)
+        tech = prompt.split(" about ")[1].split(" for ")[0]
+        script = self.tokenizer.encode(CONTINUATION.format(tech=tech))
+        budget = max_new_tokens or self.max_length - len(prompt_ids)
+        ids = list(prompt_ids)
+        started = time.perf_counter()
+        if streamer is not None:
+            import torch
+            streamer.put(torch.tensor([prompt_ids]))
+        for token in script[:budget]:
+            time.sleep(self.per_token)
+            ids.append(token)
+            if streamer is not None:
+                streamer.put(torch.tensor([token]))
+            if max_time is not None and time.perf_counter() - started > max_time:
+                break
+            if any(criteria([ids], None) for criteria in stopping_criteria):
+                break
+        if streamer is not None:
+            streamer.end()
+        return [{"generated_text": prompt + self.tokenizer.decode(ids[len(prompt_ids):])}]
+
+# Function to time one mode over several techs
+def run(model, kwargs_for, calls):
+    tokenizer = model.tokenizer
+    tokens, latencies, valid = [], [], 0
+    techs = ["python", "react", "sql", "docker", "aws"]
+    for i in range(calls):
+        prompt = PROMPT.format(tech=techs[i % len(techs)])
+        start = time.perf_counter()
+        text = model(prompt, **kwargs_for(model))[0]["generated_text"]
+        latencies.append(time.perf_counter() - start)
+        generated = text.split(prompt)[1]
+        tokens.append(len(tokenizer.encode(generated)))
+        question = first_question(generated)
+        valid += len(question) >= 20 and "?" in question
+    return {
+        "avg_tokens": statistics.mean(tokens),
+        "avg_ms": 1000 * statistics.mean(latencies),
+        "p95_ms": 1000 * sorted(latencies)[int(0.95 * (len(latencies) - 1))],
+        "valid": valid,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="fake", help="'fake' or a HuggingFace model name")
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--per-token-ms", type=float, default=8, help="fake model cost per token")
+    args = parser.parse_args()
+
+    if args.model == "fake":
+        model = FakeTokenGenerator(args.per_token_ms)
+    else:
+        model = get_model(args.model)
+        if model is None:
+            sys.exit(f"Could not load model {args.model!r}")
+
+    full = run(model, lambda m: {}, args.calls)
+    controlled = run(model, question_generation_kwargs, args.calls)
+
+    print(f"{'mode':<16}{'tokens/call':>12}{'avg ms':>10}{'p95 ms':>10}{'valid':>8}")
+    for name, r in (("full length", full), ("early stopping", controlled)):
+        print(f"{name:<16}{r['avg_tokens']:>12.1f}{r['avg_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+              f"{r['valid']:>5}/{args.calls}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare question-generation throughput with and without micro-batching.
+
+Simulates many sessions generating questions at once. By default a fake
+model is used whose cost is a fixed per-pass overhead plus a per-prompt cost,
+serialized like a single CPU; pass ``--model distilgpt2`` to use the real
+pipeline:
+
+    python benchmarks/generation_batching.py --sessions 16 --requests 4
+    python benchmarks/generation_batching.py --model distilgpt2 --sessions 8
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generation_scheduler import GenerationScheduler
+from model_registry import get_model
+
+TECHS = ["python", "javascript", "react", "java", "sql", "mongodb", "aws", "docker"]
+
+# Stand-in for the pipeline: one forward pass costs overhead + per_item * batch size
+class FakeGenerator:
+    def __init__(self, overhead_ms, per_item_ms):
+        self.overhead = overhead_ms / 1000.0
+        self.per_item = per_item_ms / 1000.0
+        self._cpu = threading.Lock()
+
+    def __call__(self, prompts, **kwargs):
+        single = isinstance(prompts, str)
+        batch = [prompts] if single else list(prompts)
+        with self._cpu:
+            time.sleep(self.overhead + self.per_item * len(batch))
+        outputs = [[{"generated_text": p + " What would you change and why?"}] for p in batch]
+        return outputs[0] if single else outputs
+
+# Function to run every session concurrently and time each request
+def run_sessions(generate, sessions, requests):
+    latencies = []
+    lock = threading.Lock()
+
+    def session(index):
+        for i in range(requests):
+            tech = TECHS[(index + i) % len(TECHS)]
+            prompt = f"Create a challenging technical interview question about {tech} for a software developer position:"
+            start = time.perf_counter()
+            generate(prompt)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "throughput_rps": len(latencies) / wall,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p95_ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="fake", help="'fake' or a HuggingFace model name")
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=4, help="requests per session")
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=float, default=20)
+    parser.add_argument("--overhead-ms", type=float, default=60, help="fake model cost per pass")
+    parser.add_argument("--per-item-ms", type=float, default=10, help="fake model cost per prompt")
+    args = parser.parse_args()
+
+    if args.model == "fake":
+        model = FakeGenerator(args.overhead_ms, args.per_item_ms)
+    else:
+        model = get_model(args.model)
+        if model is None:
+            sys.exit(f"Could not load model {args.model!r}")
+
+    per_call = run_sessions(lambda p: model(p), args.sessions, args.requests)
+    scheduler = GenerationScheduler(model, args.max_batch_size, args.max_wait_ms)
+    batched = run_sessions(lambda p: scheduler.generate(p), args.sessions, args.requests)
+
+    print(f"{'mode':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, r in (("per-call", per_call), ("batched", batched)):
+        print(f"{name:<10}{r['throughput_rps']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}")
+    metrics = scheduler.get_metrics()
+    print(f"\nspeedup {batched['throughput_rps'] / per_call['throughput_rps']:.2f}x, "
+          f"avg batch {metrics['avg_batch_size']:.1f}, "
+          f"max queue depth {metrics['max_queue_depth']}, "
+          f"avg queue wait {metrics['avg_queue_wait_ms']:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare sentiment scoring throughput: TextBlob vs the compiled engine.
+
+Scores the same candidate answers three ways and checks that every polarity
+matches TextBlob exactly:
+
+* ``TextBlob(text).sentiment.polarity`` per message (the old live path),
+* ``sentiment_engine.polarity(text)`` per message (the live path now),
+* ``sentiment_engine.score_batch(texts)`` (reprocessing jobs).
+
+By default the answers are synthetic; ``--store`` reads the candidate
+messages of a transcript store instead:
+
+    python benchmarks/sentiment_engine.py --messages 20000
+    python benchmarks/sentiment_engine.py --store chat_store --messages 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from textblob import TextBlob
+
+import sentiment_engine
+from transcript_store import SegmentTranscriptStore
+
+OPENERS = [
+    "I would start by", "Honestly, I think", "In my last project we were", "It is not",
+    "I'm really", "We never", "My team found it", "I usually prefer",
+]
+PHRASES = [
+    "profiling the code to find the slow parts", "very happy with the result", "a bad idea",
+    "not a great fit for large data", "extremely useful for testing", "quite difficult to debug",
+    "simple and reliable", "the best option we had", "terrible at scale", "fine for most cases",
+]
+NAMES = ["Ana Lopez", "Jean Martin", "Lena Vogel", "Sam Carter", "Priya Nair", "Kenji Sato"]
+
+# Function to build candidate-like answers, including short structured ones
+def synthetic_messages(count, seed=7):
+    rng = random.Random(seed)
+    messages = []
+    for number in range(count):
+        kind = number % 5
+        if kind == 0:
+            messages.append(rng.choice(NAMES))
+        elif kind == 1:
+            messages.append(f"I have {rng.randint(1, 20)} years of experience with Python and SQL")
+        else:
+            text = f"{rng.choice(OPENERS)} {rng.choice(PHRASES)}, {rng.choice(PHRASES)}"
+            messages.append(text + rng.choice([".", "!", "", " :)"]))
+    return messages
+
+# Function to read candidate messages from a transcript store
+def stored_messages(directory, limit):
+    messages = []
+    for data in SegmentTranscriptStore(directory).iter_sessions():
+        for message in data.get("messages", []):
+            if message["role"] == "user":
+                messages.append(message["content"])
+                if len(messages) >= limit:
+                    return messages
+    return messages
+
+# Function to time a scorer; returns (scores, messages per second)
+def measure(score, texts):
+    started = time.perf_counter()
+    scores = score(texts)
+    return list(scores), len(texts) / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--store", help="segment store to read candidate messages from")
+    args = parser.parse_args()
+
+    texts = stored_messages(args.store, args.messages) if args.store else synthetic_messages(args.messages)
+    # Build the lexicon table and load TextBlob's corpora outside the timings
+    sentiment_engine.get_lexicon()
+    TextBlob("warm up").sentiment
+
+    reference, textblob_rate = measure(lambda items: [TextBlob(text).sentiment.polarity for text in items], texts)
+    single, single_rate = measure(lambda items: [sentiment_engine.polarity(text) for text in items], texts)
+    batch, batch_rate = measure(lambda items: sentiment_engine.score_batch(items)[0].tolist(), texts)
+
+    print(f"{len(texts)} messages")
+    print(f"{'scorer':<28}{'messages/s':>12}{'speed-up':>10}{'mismatches':>12}")
+    for name, scores, rate in [
+        ("TextBlob per message", reference, textblob_rate),
+        ("engine per message", single, single_rate),
+        ("engine score_batch", batch, batch_rate),
+    ]:
+        mismatches = sum(a != b for a, b in zip(reference, scores))
+        print(f"{name:<28}{rate:>12.0f}{rate / textblob_rate:>9.1f}x{mismatches:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measure time-to-first-token of streamed questions against blocking generation.
+
+Without streaming the candidate sees nothing until the whole question has
+been generated; with streaming the first words appear after one token. A fake
+token-level generator is used by default; pass ``--model distilgpt2`` for the
+real one:
+
+    python benchmarks/streaming_ttft.py --calls 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from early_stopping import FakeTokenGenerator, PROMPT
+from generation_controls import question_generation_kwargs
+from model_registry import get_model
+from question_streaming import get_streaming_stats, stream_generation
+
+TECHS = ["python", "react", "sql", "docker", "aws"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="fake", help="'fake' or a HuggingFace model name")
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--per-token-ms", type=float, default=8, help="fake model cost per token")
+    args = parser.parse_args()
+
+    if args.model == "fake":
+        model = FakeTokenGenerator(args.per_token_ms)
+    else:
+        model = get_model(args.model)
+        if model is None:
+            sys.exit(f"Could not load model {args.model!r}")
+
+    blocking = []
+    for i in range(args.calls):
+        prompt = PROMPT.format(tech=TECHS[i % len(TECHS)])
+        start = time.perf_counter()
+        model(prompt, **question_generation_kwargs(model))
+        blocking.append(time.perf_counter() - start)
+
+    for i in range(args.calls):
+        prompt = PROMPT.format(tech=TECHS[i % len(TECHS)])
+        for _ in stream_generation(model, prompt, **question_generation_kwargs(model)):
+            pass
+
+    stats = get_streaming_stats()
+    print(f"blocking   first text after {1000 * statistics.median(blocking):8.1f} ms (p50)")
+    print(f"streaming  first text after {stats['ttft_p50_ms']:8.1f} ms (p50), "
+          f"p95 {stats['ttft_p95_ms']:.1f} ms, complete after {stats['total_p50_ms']:.1f} ms")
+
+if __name__ == "__main__":
+    main()
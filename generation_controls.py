@@ -0,0 +1,123 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import TimeoutError as GenerationTimeout
+
+# Token budget and wall-clock deadline for each question generation
+MAX_NEW_TOKENS = int(os.environ.get("TALENTSCOUT_MAX_NEW_TOKENS", "40"))
+GENERATION_DEADLINE_S = float(os.environ.get("TALENTSCOUT_GENERATION_DEADLINE_S", "3.0"))
+# Set TALENTSCOUT_EARLY_STOPPING=0 to always decode the full token budget
+EARLY_STOPPING = os.environ.get("TALENTSCOUT_EARLY_STOPPING", "1") == "1"
+
+# Function to check whether generated text already holds a full question or line
+def is_complete_question(text):
+    stripped = text.lstrip()
+    if "?" in stripped:
+        return True
+    # Leading newlines are common right after the prompt, so only count later ones
+    return bool(stripped) and "\n" in stripped
+
+# Function to cut generated text down to its first question (or first line)
+def first_question(text):
+    text = text.strip()
+    question_end = text.find("?")
+    line_end = text.find("\n")
+    if question_end != -1 and (line_end == -1 or question_end < line_end):
+        return text[:question_end + 1].strip()
+    if line_end != -1:
+        return text[:line_end].strip()
+    return text
+
+# Stopping criteria that ends decoding once every row has a complete question
+class StopAtQuestion:
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+        self._start = None
+
+    def __call__(self, input_ids, scores, **kwargs):
+        length = len(input_ids[0])
+        # The first call comes after one new token; a shorter input means a new generate()
+        if self._start is None or length <= self._start:
+            self._start = length - 1
+        eos_token_id = self.tokenizer.eos_token_id
+        for row in input_ids:
+            if eos_token_id is not None and int(row[-1]) == eos_token_id:
+                continue
+            text = self.tokenizer.decode(row[self._start:], skip_special_tokens=True)
+            if not is_complete_question(text):
+                return False
+        return True
+
+    # Equal criteria let the generation scheduler put these calls in one batch
+    def __eq__(self, other):
+        return type(other) is type(self) and other.tokenizer is self.tokenizer
+
+    def __hash__(self):
+        return hash((type(self), id(self.tokenizer)))
+
+# Function to find the tokenizer behind a pipeline or session model handle
+def get_tokenizer(model):
+    if hasattr(model, "get"):
+        model = model.get()
+    return getattr(model, "tokenizer", None)
+
+# Function to build the generate() keyword arguments for one question
+def question_generation_kwargs(model, max_new_tokens=MAX_NEW_TOKENS, deadline_s=GENERATION_DEADLINE_S):
+    kwargs = {"max_new_tokens": max_new_tokens, "max_time": deadline_s}
+    tokenizer = get_tokenizer(model)
+    if EARLY_STOPPING and tokenizer is not None:
+        kwargs["stopping_criteria"] = [StopAtQuestion(tokenizer)]
+    return kwargs
+
+# Per-call token counts and latencies, shared by every session
+class GenerationStats:
+    def __init__(self, recent=256):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=recent)
+        self.calls = 0
+        self.tokens = 0
+        self.seconds = 0.0
+        self.deadline_misses = 0
+
+    def record(self, tokens, seconds, deadline_s=GENERATION_DEADLINE_S):
+        with self._lock:
+            self.calls += 1
+            self.tokens += tokens
+            self.seconds += seconds
+            if seconds >= deadline_s:
+                self.deadline_misses += 1
+            self._recent.append((tokens, seconds))
+
+    def record_timeout(self, seconds):
+        with self._lock:
+            self.calls += 1
+            self.seconds += seconds
+            self.deadline_misses += 1
+            self._recent.append((0, seconds))
+
+    def summary(self):
+        with self._lock:
+            recent = list(self._recent)
+            calls, tokens, seconds, misses = self.calls, self.tokens, self.seconds, self.deadline_misses
+        latencies = sorted(s for _, s in recent)
+        return {
+            "calls": calls,
+            "avg_tokens": tokens / calls if calls else 0.0,
+            "avg_latency_ms": 1000 * seconds / calls if calls else 0.0,
+            "p95_latency_ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "deadline_misses": misses,
+            "recent": [{"tokens": t, "latency_ms": 1000 * s} for t, s in recent[-10:]],
+        }
+
+generation_stats = GenerationStats()
+
+# Function to count tokens in generated text for reporting
+def count_tokens(model, text):
+    tokenizer = get_tokenizer(model)
+    if tokenizer is None:
+        return len(text.split())
+    return len(tokenizer.encode(text))
+
+# Function to report per-call token counts and latencies
+def get_generation_stats():
+    return generation_stats.summary()
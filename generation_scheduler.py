@@ -0,0 +1,180 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+# Set TALENTSCOUT_BATCHING=0 to call the model once per prompt like before
+BATCHING_ENABLED = os.environ.get("TALENTSCOUT_BATCHING", "1") == "1"
+MAX_BATCH_SIZE = int(os.environ.get("TALENTSCOUT_MAX_BATCH_SIZE", "8"))
+MAX_WAIT_MS = float(os.environ.get("TALENTSCOUT_MAX_BATCH_WAIT_MS", "20"))
+
+# Function to let a text-generation pipeline pad prompts of different lengths
+def prepare_for_batching(model):
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None:
+        return
+    # GPT-2 style models have no pad token, and decoder-only models pad on the left
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+        if hasattr(model, "model"):
+            model.model.config.pad_token_id = tokenizer.eos_token_id
+    tokenizer.padding_side = "left"
+
+# Groups prompts from every session into padded batches for one forward pass
+class GenerationScheduler:
+    def __init__(self, model, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        # Waiting requests in arrival order: (prompt, kwargs, future, submitted at)
+        self._queue = deque()
+        self._queue_changed = threading.Condition()
+        self._lock = threading.Lock()
+        self._metrics = {
+            "requests": 0,
+            "batches": 0,
+            "batched_items": 0,
+            "max_batch_size_seen": 0,
+            "max_queue_depth": 0,
+            "total_queue_wait_s": 0.0,
+            "total_batch_s": 0.0,
+            "errors": 0,
+            "cancelled": 0,
+        }
+        prepare_for_batching(model)
+        self._worker = threading.Thread(
+            target=self._run,
+            name="generation-scheduler",
+            daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, prompt, **generate_kwargs):
+        future = Future()
+        with self._queue_changed:
+            self._queue.append((prompt, generate_kwargs, future, time.perf_counter()))
+            depth = len(self._queue)
+            self._queue_changed.notify()
+        with self._lock:
+            self._metrics["requests"] += 1
+            self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], depth)
+        return future
+
+    def generate(self, prompt, timeout=None, **generate_kwargs):
+        future = self.submit(prompt, **generate_kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            # Nobody waits for the answer any more; drop it if it hasn't started
+            future.cancel()
+            raise
+
+    def _take(self, item):
+        # False for requests cancelled while queued; the others can no longer be cancelled
+        if item[2].set_running_or_notify_cancel():
+            return True
+        with self._lock:
+            self._metrics["cancelled"] += 1
+        return False
+
+    def _collect_batch(self):
+        with self._queue_changed:
+            while True:
+                while not self._queue:
+                    self._queue_changed.wait()
+                first = self._queue.popleft()
+                if self._take(first):
+                    break
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                # Only prompts with the same generation settings can share a pass; the
+                # others keep their place in the queue for the next batch
+                waiting = deque()
+                for item in self._queue:
+                    if len(batch) < self.max_batch_size and item[1] == first[1]:
+                        if self._take(item):
+                            batch.append(item)
+                    else:
+                        waiting.append(item)
+                self._queue = waiting
+                remaining = deadline - time.perf_counter()
+                if len(batch) >= self.max_batch_size or remaining <= 0:
+                    break
+                self._queue_changed.wait(remaining)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            prompts = [item[0] for item in batch]
+            generate_kwargs = batch[0][1]
+            started = time.perf_counter()
+            try:
+                outputs = self.model(prompts, batch_size=len(prompts), **generate_kwargs)
+                error = None
+            except Exception as e:
+                outputs = None
+                error = e
+            elapsed = time.perf_counter() - started
+
+            with self._lock:
+                self._metrics["batches"] += 1
+                self._metrics["batched_items"] += len(batch)
+                self._metrics["max_batch_size_seen"] = max(self._metrics["max_batch_size_seen"], len(batch))
+                self._metrics["total_batch_s"] += elapsed
+                self._metrics["total_queue_wait_s"] += sum(started - item[3] for item in batch)
+                if error is not None:
+                    self._metrics["errors"] += 1
+
+            for i, (_, _, future, _) in enumerate(batch):
+                if error is not None:
+                    future.set_exception(error)
+                    continue
+                result = outputs[i]
+                # A pipeline returns one list of candidates per prompt
+                if isinstance(result, dict):
+                    result = [result]
+                future.set_result(result)
+
+    def get_metrics(self):
+        with self._lock:
+            metrics = dict(self._metrics)
+        with self._queue_changed:
+            metrics["queue_depth"] = len(self._queue)
+        batches = metrics["batches"]
+        items = metrics["batched_items"]
+        metrics["avg_batch_size"] = items / batches if batches else 0.0
+        metrics["avg_queue_wait_ms"] = 1000 * metrics["total_queue_wait_s"] / items if items else 0.0
+        return metrics
+
+# One scheduler per loaded model, shared by every session
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+# Function to get the shared scheduler for a model
+def get_scheduler(model):
+    key = getattr(model, "key", id(model))
+    scheduler = _schedulers.get(key)
+    if scheduler is None:
+        with _schedulers_lock:
+            scheduler = _schedulers.get(key)
+            if scheduler is None:
+                # Schedule against the real pipeline rather than a session handle
+                target = model.get() if hasattr(model, "get") else model
+                scheduler = GenerationScheduler(target)
+                _schedulers[key] = scheduler
+    return scheduler
+
+# Function to run a prompt through the model, batched with other sessions if enabled
+def generate_text(model, prompt, timeout=None, **generate_kwargs):
+    if BATCHING_ENABLED:
+        return get_scheduler(model).generate(prompt, timeout=timeout, **generate_kwargs)
+    return model(prompt, **generate_kwargs)
+
+# Function to report queue and batch metrics for every scheduler
+def get_scheduler_metrics():
+    with _schedulers_lock:
+        schedulers = dict(_schedulers)
+    return {str(key): scheduler.get_metrics() for key, scheduler in schedulers.items()}
@@ -0,0 +1,97 @@
+import os
+
+# Which inference backend to load: "pipeline", "int8" or "onnx"
+INFERENCE_BACKEND = os.environ.get("TALENTSCOUT_INFERENCE_BACKEND", "pipeline")
+# Exported ONNX graphs are cached here so the export only happens once
+ONNX_CACHE_DIR = os.environ.get("TALENTSCOUT_ONNX_DIR", "onnx_models")
+
+BACKENDS = ("pipeline", "int8", "onnx")
+
+# Function to load the stock PyTorch fp32 pipeline
+def _load_pipeline(model_name, max_length):
+    from transformers import pipeline
+    return pipeline(
+        "text-generation",
+        model=model_name,
+        max_length=max_length
+    )
+
+# Function to swap GPT-2's Conv1D layers for nn.Linear so they can be quantized
+def conv1d_to_linear(module):
+    import torch
+    from transformers.pytorch_utils import Conv1D
+
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            # Conv1D stores its weight as (in_features, out_features)
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
+        else:
+            conv1d_to_linear(child)
+    return module
+
+# Function to dynamically quantize a causal LM's linear layers to int8
+def quantize_int8(model):
+    import torch
+
+    model.eval()
+    conv1d_to_linear(model)
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+# Function to load a dynamically int8-quantized pipeline
+def _load_int8(model_name, max_length):
+    from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
+
+    model = quantize_int8(AutoModelForCausalLM.from_pretrained(model_name))
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return pipeline(
+        "text-generation",
+        model=model,
+        tokenizer=tokenizer,
+        max_length=max_length
+    )
+
+# Function to load an ONNX Runtime graph with KV-cache, exporting it on first use
+def _load_onnx(model_name, max_length):
+    from optimum.onnxruntime import ORTModelForCausalLM
+    from transformers import AutoTokenizer, pipeline
+
+    export_dir = os.path.join(ONNX_CACHE_DIR, model_name.replace("/", "--"))
+    if os.path.isdir(export_dir):
+        model = ORTModelForCausalLM.from_pretrained(export_dir, use_cache=True)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        model = ORTModelForCausalLM.from_pretrained(model_name, export=True, use_cache=True)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+    return pipeline(
+        "text-generation",
+        model=model,
+        tokenizer=tokenizer,
+        max_length=max_length
+    )
+
+_LOADERS = {
+    "pipeline": _load_pipeline,
+    "int8": _load_int8,
+    "onnx": _load_onnx,
+}
+
+# Function to load a model with the chosen backend, falling back to the stock pipeline
+def load_backend(model_name, max_length, backend=None):
+    backend = backend or INFERENCE_BACKEND
+    if backend not in _LOADERS:
+        print(f"Warning: unknown inference backend '{backend}'. Using 'pipeline'.")
+        backend = "pipeline"
+    try:
+        return _LOADERS[backend](model_name, max_length)
+    except ImportError as e:
+        if backend == "pipeline":
+            raise
+        # Optional dependencies (e.g. optimum for ONNX) are not installed
+        print(f"Warning: inference backend '{backend}' is unavailable ({e}). Using 'pipeline'.")
+        return _load_pipeline(model_name, max_length)
@@ -0,0 +1,42 @@
+import re
+
+# Inputs shorter than this are too short for reliable language detection
+SHORT_INPUT_CHARS = 20
+# Consecutive matching detections before a session's language is treated as stable
+LANGUAGE_LOCK_VOTES = 2
+
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+PHONE_PATTERN = re.compile(r"\+?\d[\d\s().-]{5,}\d")
+
+# Function to compile exit phrases into a whole-word pattern
+def compile_exit_pattern(phrases):
+    alternatives = "|".join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternatives})\b", re.IGNORECASE)
+
+# Function to pull an email address out of the input, or None
+def parse_email(text):
+    match = EMAIL_PATTERN.search(text)
+    return match.group(0) if match else None
+
+# Function to pull a phone number (7-15 digits) out of the input, or None
+def parse_phone(text):
+    match = PHONE_PATTERN.search(text)
+    if not match:
+        return None
+    digits = re.sub(r"\D", "", match.group(0))
+    if not 7 <= len(digits) <= 15:
+        return None
+    return match.group(0).strip()
+
+# Function to clean up a name; None if empty or if it is really an exit phrase
+def parse_name(text, exit_pattern=None):
+    name = " ".join(text.split())
+    if not name or len(name) > 100:
+        return None
+    if exit_pattern is not None and exit_pattern.search(name):
+        return None
+    return name
+
+# Function to decide whether an input is worth running language detection on
+def needs_language_detection(text):
+    return len(text.strip()) >= SHORT_INPUT_CHARS
@@ -0,0 +1,625 @@
+"""Headless interview engine.
+
+``InterviewSession`` holds one candidate's conversation and runs the stage
+machine without Streamlit, so the same flow can be driven from the web UI,
+other front ends or a load test:
+
+    session = InterviewSession()
+    session.greet()
+    session.process_user_input("Hi there")
+    print(session.messages[-1].content)
+
+Stages that only record a candidate field are described by ``FIELD_STAGES``;
+the rest dispatch through ``STAGE_HANDLERS``.
+"""
+import random
+import time
+from datetime import datetime
+
+from startup import lazy_attr
+from translation_cache import cached_translate
+from prompt_catalog import render_prompt, DEFAULT_QUESTIONS, FALLBACK_RESPONSES
+from question_prefetch import prefetch_question, PREFETCH_ENABLED
+from generation_scheduler import generate_text
+from generation_controls import (
+    question_generation_kwargs, first_question, count_tokens,
+    generation_stats, GenerationTimeout, GENERATION_DEADLINE_S
+)
+from question_pool import get_question_pool, QUESTION_POOL_ENABLED, LOW_WATERMARK as POOL_LOW_WATERMARK
+from question_streaming import STREAMING_ENABLED
+from transcript_store import get_transcript_store, new_session_id
+from transcript_search import get_search_index
+from question_bank import get_question_bank
+from input_parsing import (
+    compile_exit_pattern, parse_name, parse_email, parse_phone,
+    needs_language_detection, LANGUAGE_LOCK_VOTES
+)
+from turn_metrics import span, turn, count
+from sentiment_engine import polarity
+from session_memory import (
+    Message, SentimentSeries, QuestionLog, deep_size, MAX_LIVE_MESSAGES
+)
+
+# Heavy dependencies are imported on first use to keep cold start fast
+detect = lazy_attr("langdetect", "detect")
+
+# Exit phrases that trigger the conversation ending
+EXIT_PHRASES = ["bye", "goodbye", "exit", "quit", "end", "thank you", "thanks"]
+EXIT_PATTERN = compile_exit_pattern(EXIT_PHRASES)
+
+# Stages whose input is parsed locally, without language detection or translation
+STRUCTURED_FIELD_PARSERS = {
+    "name": lambda text: parse_name(text, EXIT_PATTERN),
+    "email": parse_email,
+    "phone": parse_phone,
+}
+
+# Supported languages and their codes
+SUPPORTED_LANGUAGES = {
+    "English": "en",
+    "Spanish": "es",
+    "French": "fr",
+    "German": "de",
+    "Chinese": "zh",
+    "Japanese": "ja",
+    "Russian": "ru",
+    "Arabic": "ar",
+    "Hindi": "hi",
+    "Portuguese": "pt"
+}
+
+# Technical questions asked about each technology before moving on
+QUESTIONS_PER_TECH = 3
+
+# Stages that store the answer in candidate_info and ask the next prompt:
+# stage -> (candidate_info field or None, next stage, prompt to ask)
+FIELD_STAGES = {
+    "greeting": (None, "name", "ask_name"),
+    "name": ("name", "email", "ask_email"),
+    "email": ("email", "phone", "ask_phone"),
+    "phone": ("phone", "experience", "ask_experience"),
+    "experience": ("experience", "position", "ask_position"),
+    "position": ("position", "location", "ask_location"),
+    "location": ("location", "tech_stack", "ask_tech_stack"),
+}
+
+# Stages with their own logic: stage -> InterviewSession method name
+STAGE_HANDLERS = {
+    "tech_stack": "handle_tech_stack",
+    "technical_questions": "handle_technical_answer",
+    "wrap_up": "handle_wrap_up_answer",
+}
+
+# Every stage in the order an interview goes through them
+STAGE_ORDER = tuple(FIELD_STAGES) + tuple(STAGE_HANDLERS)
+
+# Function to check for a usable model (a lazy handle whose load failed is not one)
+def model_available(model):
+    return model is not None and getattr(model, "available", True)
+
+# Function to build the LLM prompt for a technology
+def question_prompt(tech):
+    return f"Create a challenging technical interview question about {tech} for a software developer position:"
+
+# Function to generate a question with a given model (safe to call off the script thread)
+def generate_question_with_model(model, tech):
+    if not model_available(model):
+        return None
+
+    prompt = question_prompt(tech)
+
+    started = time.perf_counter()
+    try:
+        with span("generate_question"):
+            result = generate_text(
+                model,
+                prompt,
+                timeout=GENERATION_DEADLINE_S,
+                **question_generation_kwargs(model)
+            )[0]['generated_text']
+        # Clean up the result to get just the first question
+        generated = result.split(prompt)[1]
+        question = first_question(generated)
+        generation_stats.record(count_tokens(model, generated), time.perf_counter() - started)
+        # If question is too short or incomplete, return None
+        if len(question) < 20 or "?" not in question:
+            count("generation_failures_total", reason="rejected")
+            return None
+        return question
+    except GenerationTimeout:
+        # Missed the deadline; the caller falls back to the question bank
+        generation_stats.record_timeout(time.perf_counter() - started)
+        count("generation_failures_total", reason="timeout")
+        return None
+    except Exception:
+        count("generation_failures_total", reason="error")
+        return None
+
+# One candidate's interview: conversation state plus the stage machine
+class InterviewSession:
+    # Plain-data attributes that make up the conversation (see to_state)
+    STATE_FIELDS = (
+        "session_id",
+        "stage",
+        "messages",
+        "candidate_info",
+        "tech_stack_str",
+        "questions_asked",
+        "question_cursors",
+        "current_tech",
+        "asked_questions_count",
+        "conversation_ended",
+        "sentiment_history",
+        "language",
+        "language_name",
+        "language_locked",
+        "language_votes",
+        "service_calls",
+        "message_offset",
+        "spilled_parts",
+    )
+
+    def __init__(self, model=None, session_id=None, stream_question=None):
+        # model: LLM handle (None uses the question bank only)
+        # stream_question: optional callable(tech) -> question that shows tokens as they arrive
+        self.model = model
+        self.stream_question = stream_question
+        self.question_prefetch = None
+
+        self.session_id = session_id or new_session_id()
+        self.stage = "greeting"
+        self.messages = []
+        self.candidate_info = {
+            "name": "",
+            "email": "",
+            "phone": "",
+            "experience": "",
+            "position": "",
+            "location": "",
+            "tech_stack": []
+        }
+        self.tech_stack_str = ""
+        self.questions_asked = QuestionLog()
+        # Position of this session in each question bank range (see QuestionBank.draw)
+        self.question_cursors = {}
+        self.current_tech = ""
+        self.asked_questions_count = 0
+        self.conversation_ended = False
+        self.sentiment_history = SentimentSeries()
+        self.language = "en"
+        self.language_name = "English"
+        self.language_locked = False
+        self.language_votes = []
+        # Detector and translator round trips made for this interview
+        self.service_calls = {"detect": 0, "translate": 0}
+        # Messages already moved to the transcript store, and in how many parts
+        self.message_offset = 0
+        self.spilled_parts = 0
+
+    def to_state(self):
+        return {field: getattr(self, field) for field in self.STATE_FIELDS}
+
+    @classmethod
+    def from_state(cls, state, model=None, stream_question=None):
+        session = cls(model=model, session_id=state.get("session_id"), stream_question=stream_question)
+        for field in cls.STATE_FIELDS:
+            if field in state:
+                setattr(session, field, state[field])
+        # Saved state holds plain JSON; rebuild the compact containers
+        session.messages = [Message.from_dict(message) for message in session.messages]
+        session.sentiment_history = SentimentSeries(session.sentiment_history)
+        session.questions_asked = QuestionLog(session.questions_asked)
+        return session
+
+    # Function to estimate the memory held by this conversation, in bytes
+    def memory_bytes(self):
+        seen = set()
+        return sum(deep_size(getattr(self, field), seen) for field in self.STATE_FIELDS)
+
+    # Function to switch the reply language at the candidate's request
+    def set_language(self, name):
+        self.language = SUPPORTED_LANGUAGES[name]
+        self.language_name = name
+        # An explicit choice means we no longer need to detect the language
+        self.language_locked = True
+
+    # Sentiment analysis function (TextBlob's lexicon, via the compiled sentiment engine)
+    def analyze_sentiment(self, text):
+        with span("analyze_sentiment"):
+            sentiment_score = polarity(text)
+
+        # Record sentiment for visualization
+        self.sentiment_history.append((self.message_offset + len(self.messages), sentiment_score))
+
+        # Return sentiment category and score
+        if sentiment_score > 0.3:
+            return "positive", sentiment_score
+        elif sentiment_score < -0.3:
+            return "negative", sentiment_score
+        else:
+            return "neutral", sentiment_score
+
+    # Function to detect language and translate text
+    def detect_and_translate(self, text, target_lang="en"):
+        try:
+            with span("detect_and_translate"):
+                self.service_calls["detect"] += 1
+                detected_lang = detect(text)
+
+                # If detected language is not target language, translate it
+                if detected_lang != target_lang:
+                    translated = cached_translate(text, 'auto', target_lang, self.service_calls)
+                    return translated, detected_lang
+                else:
+                    return text, detected_lang
+        except Exception:
+            # If detection fails, return original text
+            count("translator_failures_total", call="detect_and_translate")
+            return text, "en"
+
+    # Function to translate text to user's preferred language
+    def translate_to_user_language(self, text, source_lang="en"):
+        target_lang = self.language
+        if source_lang != target_lang:
+            try:
+                with span("translate_to_user_language"):
+                    return cached_translate(text, source_lang, target_lang, self.service_calls)
+            except Exception:
+                count("translator_failures_total", call="translate_to_user_language")
+                return text
+        return text
+
+    # Function to add a message to the chat
+    def add_message(self, role, content):
+        message = Message(role, content)
+        self.messages.append(message)
+
+        # Analyze sentiment if it's a user message
+        if role == "user":
+            # Save sentiment information with the message
+            message.category, message.score = self.analyze_sentiment(content)
+            message.stage = self.stage
+
+        if MAX_LIVE_MESSAGES and len(self.messages) > MAX_LIVE_MESSAGES:
+            self.spill_messages()
+
+    # Function to move the older half of the live messages to the transcript store
+    def spill_messages(self):
+        spilled = len(self.messages) - MAX_LIVE_MESSAGES // 2
+        part = self.spilled_parts + 1
+        data = {
+            "part_of": self.session_id,
+            "part": part,
+            "first_message": self.message_offset,
+            "messages": [message.to_dict() for message in self.messages[:spilled]],
+        }
+        try:
+            with span("spill_messages"):
+                get_transcript_store().save(f"{self.session_id}-part{part}", data)
+        except Exception as e:
+            # Keep everything in memory rather than lose messages
+            print(f"Warning: could not spill messages of session {self.session_id}: {e}")
+            return
+        del self.messages[:spilled]
+        self.message_offset += spilled
+        self.spilled_parts = part
+
+    # Function to get every message of the interview, including spilled ones
+    def all_messages(self):
+        messages = []
+        store = get_transcript_store()
+        for part in range(1, self.spilled_parts + 1):
+            data = store.load(f"{self.session_id}-part{part}")
+            if data is None:
+                print(f"Warning: part {part} of session {self.session_id} is missing")
+                continue
+            messages.extend(data["messages"])
+        messages.extend(message.to_dict() for message in self.messages)
+        return messages
+
+    # Function to add an assistant message from the prompt catalog
+    def say(self, key, **values):
+        self.add_message("assistant", render_prompt(key, self.language, **values))
+
+    # Function to save chat history to the transcript store
+    def save_chat_history(self):
+        data = {
+            "candidate_info": self.candidate_info,
+            "stage": self.stage,
+            "messages": self.all_messages(),
+            "sentiment_history": self.sentiment_history.to_list(),
+            "service_calls": self.service_calls,
+            "language": self.language,
+            "saved_at": datetime.now().isoformat(timespec="seconds")
+        }
+
+        with span("save_chat_history"):
+            get_transcript_store().save(self.session_id, data)
+
+        # Make the interview searchable right away; the index can be rebuilt from the store
+        index = get_search_index()
+        if index is not None:
+            try:
+                with span("index_transcript"):
+                    index.add(self.session_id, data)
+            except Exception as e:
+                print(f"Warning: could not index session {self.session_id}: {e}")
+
+    # Function to translate free-text input to English, detecting the language only when useful
+    def understand_free_text(self, user_input):
+        language = self.language
+
+        # Once the language is stable (or the input too short to tell) skip detection
+        if self.language_locked or not needs_language_detection(user_input):
+            if language == "en":
+                return user_input
+            try:
+                with span("translate_from_user_language"):
+                    return cached_translate(user_input, language, "en", self.service_calls)
+            except Exception:
+                count("translator_failures_total", call="translate_from_user_language")
+                return user_input
+
+        translated_input, detected_lang = self.detect_and_translate(user_input, "en")
+
+        # If a different language was detected, update the user's preferred language
+        if detected_lang != "en" and detected_lang in SUPPORTED_LANGUAGES.values():
+            self.language = detected_lang
+            # Find language name from code
+            for name, code in SUPPORTED_LANGUAGES.items():
+                if code == detected_lang:
+                    self.language_name = name
+                    break
+
+        # Lock the language after enough consecutive detections agree
+        votes = self.language_votes
+        votes.append(detected_lang)
+        del votes[:-LANGUAGE_LOCK_VOTES]
+        if len(votes) == LANGUAGE_LOCK_VOTES and len(set(votes)) == 1 and votes[0] == self.language:
+            self.language_locked = True
+
+        return translated_input
+
+    # Function to handle user input based on current stage
+    def process_user_input(self, user_input):
+        with turn(self.stage):
+            self._process_user_input(user_input)
+
+    def _process_user_input(self, user_input):
+        parse_field = STRUCTURED_FIELD_PARSERS.get(self.stage)
+
+        if parse_field is not None:
+            # Structured fields are parsed locally, with no detection or translation
+            self.add_message("user", user_input)
+            working_input = parse_field(user_input)
+
+            if working_input is None:
+                if EXIT_PATTERN.search(user_input):
+                    self.cancel_question_prefetch()
+                    self.handle_exit()
+                else:
+                    self.ask_field_again(self.stage)
+                return
+        else:
+            # Use the translated input for processing
+            working_input = self.understand_free_text(user_input)
+
+            # Add the original user input to messages
+            self.add_message("user", user_input)
+
+            # Check for exit phrases
+            if EXIT_PATTERN.search(working_input) and self.stage != "greeting":
+                self.cancel_question_prefetch()
+                self.handle_exit()
+                return
+
+        # Process based on current stage
+        transition = FIELD_STAGES.get(self.stage)
+        if transition is not None:
+            field, next_stage, prompt = transition
+            if field is not None:
+                self.candidate_info[field] = working_input
+            self.stage = next_stage
+            self.say(prompt, name=self.candidate_info["name"])
+        elif self.stage in STAGE_HANDLERS:
+            getattr(self, STAGE_HANDLERS[self.stage])(working_input)
+        else:
+            # Fallback for unexpected stage
+            self.handle_fallback()
+
+        # A speculative question is useless once we've left the technical stage
+        if self.stage != "technical_questions":
+            self.cancel_question_prefetch()
+
+    def handle_tech_stack(self, working_input):
+        self.tech_stack_str = working_input
+
+        # Match names, aliases and misspellings to the question bank ("Node.js", "JS", "Postgres")
+        bank = get_question_bank()
+        techs = bank.resolve_stack(working_input)
+        self.candidate_info["tech_stack"] = techs
+
+        # Find valid technologies in our question bank
+        valid_techs = [tech for tech in techs if tech in bank]
+
+        if valid_techs:
+            self.stage = "technical_questions"
+            self.current_tech = valid_techs[0]
+            self.ask_technical_questions()
+        else:
+            self.handle_unknown_tech_stack()
+
+    def handle_technical_answer(self, working_input):
+        self.asked_questions_count += 1
+
+        # If we've asked enough questions about the current technology
+        if self.asked_questions_count >= QUESTIONS_PER_TECH:
+            self.next_tech_or_wrap_up()
+        else:
+            # Ask another question about the current technology
+            self.ask_technical_questions()
+
+    def handle_wrap_up_answer(self, working_input):
+        self.handle_exit()
+
+    # Function to move on to the next technology, or wrap up after the last one
+    def next_tech_or_wrap_up(self):
+        techs = self.candidate_info["tech_stack"]
+        current_index = techs.index(self.current_tech)
+
+        if current_index + 1 < len(techs):
+            self.current_tech = techs[current_index + 1]
+            self.asked_questions_count = 0
+            self.ask_technical_questions()
+        else:
+            # No more technologies to ask about
+            self.stage = "wrap_up"
+            self.wrap_up_interview()
+
+    # Stage-specific functions
+
+    def greet(self):
+        self.say("greet")
+
+    # Function to ask again for a structured field that could not be parsed
+    def ask_field_again(self, stage):
+        if stage == "name":
+            self.say("ask_name")
+        else:
+            self.say(f"invalid_{stage}")
+
+    def ask_technical_questions(self):
+        current_tech = self.current_tech
+        question_localized = False
+
+        # Try to generate a question using the LLM first
+        llm_question = None
+        translated_question = None
+        if model_available(self.model) and QUESTION_POOL_ENABLED:
+            # Draw a pre-generated question so the live turn usually skips the model
+            llm_question = self.get_shared_question_pool().draw(current_tech, self.questions_asked)
+        if model_available(self.model) and not llm_question:
+            # Pool disabled or dry: use the prefetched question, or generate one now
+            prefetch = self.take_question_prefetch()
+            if prefetch is not None and prefetch.matches(current_tech):
+                # Use the question generated while the candidate was answering
+                llm_question, translated_question = prefetch.take()
+                if prefetch.language != self.language:
+                    translated_question = None
+            else:
+                if prefetch is not None:
+                    prefetch.cancel()
+                if STREAMING_ENABLED and self.stream_question is not None and self.language == "en":
+                    with span("generate_question"):
+                        llm_question = self.stream_question(current_tech)
+                else:
+                    llm_question = generate_question_with_model(self.model, current_tech)
+
+        # If LLM generated a valid question, use it
+        if llm_question:
+            question = llm_question
+            self.questions_asked.append(question)
+            if translated_question:
+                question = translated_question
+                question_localized = True
+        else:
+            count("llm_fallbacks_total", reason="no_question" if model_available(self.model) else "no_model")
+            # Fall back to predefined questions
+            bank = get_question_bank()
+            if current_tech in bank:
+                question = bank.draw(
+                    current_tech, self.question_cursors, self.asked_questions_count, self.questions_asked
+                )
+                if question is not None:
+                    self.questions_asked.append(question)
+                else:
+                    # All questions for this tech have been asked
+                    self.next_tech_or_wrap_up()
+                    return
+            else:
+                # Use default questions for unknown tech stacks (already in the catalog)
+                index = random.randrange(len(DEFAULT_QUESTIONS))
+                question = render_prompt(f"default_question.{index}", self.language)
+                question_localized = True
+
+        # Translate only the question; the surrounding text comes from the catalog
+        if not question_localized and self.language != "en":
+            question = self.translate_to_user_language(question)
+
+        self.say("about_tech", tech=get_question_bank().display_name(current_tech), question=question)
+
+        # Start generating the next question while the candidate types their answer
+        self.schedule_question_prefetch()
+
+    # Function to get the process-wide pool of pre-generated questions
+    def get_shared_question_pool(self):
+        model = self.model
+        return get_question_pool(
+            lambda tech: generate_question_with_model(model, tech),
+            get_question_bank().techs.keys()
+        )
+
+    # Function to speculatively generate the next technical question in the background
+    def schedule_question_prefetch(self):
+        if not PREFETCH_ENABLED or not model_available(self.model):
+            return
+        if self.stage != "technical_questions":
+            return
+
+        # Work out which technology the next question will be about
+        techs = self.candidate_info["tech_stack"]
+        next_tech = self.current_tech
+        if self.asked_questions_count + 1 >= QUESTIONS_PER_TECH:
+            current_index = techs.index(next_tech)
+            if current_index + 1 >= len(techs):
+                # The interview wraps up after this answer
+                return
+            next_tech = techs[current_index + 1]
+
+        # A well-stocked pool will serve the next question; prefetch only when it runs low
+        if QUESTION_POOL_ENABLED and self.get_shared_question_pool().size(next_tech) >= POOL_LOW_WATERMARK:
+            return
+
+        model = self.model
+        self.cancel_question_prefetch()
+        self.question_prefetch = prefetch_question(
+            lambda tech: generate_question_with_model(model, tech),
+            next_tech,
+            self.language
+        )
+
+    # Function to remove and return the pending prefetched question, if any
+    def take_question_prefetch(self):
+        prefetch = self.question_prefetch
+        self.question_prefetch = None
+        return prefetch
+
+    # Function to drop a pending prefetched question
+    def cancel_question_prefetch(self):
+        prefetch = self.take_question_prefetch()
+        if prefetch is not None:
+            prefetch.cancel()
+
+    def handle_unknown_tech_stack(self):
+        self.say("unknown_tech_stack")
+
+        # Ask a general technical question
+        self.say("general_technical_question")
+
+        self.stage = "wrap_up"
+
+    def wrap_up_interview(self):
+        self.say("wrap_up", name=self.candidate_info['name'])
+
+    def handle_exit(self):
+        if not self.conversation_ended:
+            info = self.candidate_info
+            self.say("farewell", name=info['name'], email=info['email'], phone=info['phone'])
+            self.conversation_ended = True
+
+            # Save the chat history
+            self.save_chat_history()
+
+    def handle_fallback(self):
+        index = random.randrange(len(FALLBACK_RESPONSES))
+        self.say(f"fallback.{index}")
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+
+from inference_backends import load_backend, INFERENCE_BACKEND
+
+# Process-wide registry of loaded models, shared by every session
+_models = {}
+_stats = {}
+_lock = threading.Lock()
+
+# Function to read the resident memory of this process in bytes
+def current_rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+            # ru_maxrss is reported in kilobytes on Linux
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except Exception:
+            return 0
+
+# Function to build the registry key for a model and inference backend
+def _model_key(model_name, backend):
+    return f"{model_name} [{backend or INFERENCE_BACKEND}]"
+
+# Function to get (loading once if needed) the shared model for a name and backend
+def get_model(model_name="distilgpt2", max_length=100, loader=None, backend=None):
+    key = _model_key(model_name, backend)
+    model = _models.get(key)
+    if model is not None or key in _stats:
+        return model
+
+    with _lock:
+        # Another thread may have finished loading while we waited
+        if key in _stats:
+            return _models.get(key)
+
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
+        try:
+            if loader is not None:
+                model = loader(model_name, max_length)
+            else:
+                model = load_backend(model_name, max_length, backend)
+            error = None
+        except Exception as e:
+            model = None
+            error = str(e)
+            print("Warning: HuggingFace model could not be loaded. Using predefined questions.")
+
+        _models[key] = model
+        _stats[key] = {
+            "loaded": model is not None,
+            "load_seconds": time.perf_counter() - start,
+            "rss_delta_bytes": max(current_rss_bytes() - rss_before, 0),
+            "error": error,
+        }
+        return model
+
+# Function to report load time and memory for every registered model
+def get_model_stats():
+    with _lock:
+        stats = {name: dict(info) for name, info in _stats.items()}
+    return {
+        "models": stats,
+        "rss_bytes": current_rss_bytes(),
+    }
+
+# Function to drop a model from the registry (e.g. to force a reload)
+def unload_model(model_name="distilgpt2", backend=None):
+    key = _model_key(model_name, backend)
+    with _lock:
+        _models.pop(key, None)
+        _stats.pop(key, None)
+
+# Lightweight per-session handle; the model itself lives in the registry
+class ModelHandle:
+    __slots__ = ("model_name", "max_length", "backend")
+
+    def __init__(self, model_name="distilgpt2", max_length=100, backend=None):
+        self.model_name = model_name
+        self.max_length = max_length
+        self.backend = backend or INFERENCE_BACKEND
+
+    @property
+    def key(self):
+        return _model_key(self.model_name, self.backend)
+
+    @property
+    def available(self):
+        # False once loading has failed; a handle that hasn't loaded yet counts as available
+        info = _stats.get(self.key)
+        return info is None or info["loaded"]
+
+    def get(self):
+        return get_model(self.model_name, self.max_length, backend=self.backend)
+
+    def __call__(self, *args, **kwargs):
+        model = self.get()
+        if model is None:
+            raise RuntimeError(f"Model '{self.model_name}' is not available")
+        return model(*args, **kwargs)
+
+    def __repr__(self):
+        return f"ModelHandle({self.model_name!r}, backend={self.backend!r})"
+
+# Function to get a session handle, or None when the model cannot be loaded
+# (lazy=True skips the load; the model is then loaded on the first generation)
+def get_model_handle(model_name="distilgpt2", max_length=100, backend=None, lazy=False):
+    if lazy:
+        info = _stats.get(_model_key(model_name, backend))
+        if info is not None and not info["loaded"]:
+            return None
+    elif get_model(model_name, max_length, backend=backend) is None:
+        return None
+    return ModelHandle(model_name, max_length, backend)
@@ -0,0 +1,276 @@
+"""Per-language catalog of the assistant's fixed prompts.
+
+Prompts are templates with ``{placeholder}`` fields. Before translation each
+field is swapped for an opaque token so the translator leaves it alone, which
+means a prompt is translated once per language instead of once per candidate.
+
+Build the catalog for every supported language with:
+
+    python prompt_catalog.py
+
+Languages missing from the catalog file are translated in a background thread
+when the app or API server starts (and on the first miss), and saved to the
+file; until then their prompts are served in English, so the translator is
+never on the request path.
+"""
+import json
+import os
+import re
+import string
+import threading
+import time
+
+from translation_cache import cached_translate
+from transcript_store import atomic_write
+from turn_metrics import count
+
+# Where the precomputed catalog is stored
+CATALOG_PATH = os.environ.get("TALENTSCOUT_PROMPT_CATALOG", "prompt_catalog.json")
+# Seconds before a language whose background translation failed is tried again
+FILL_RETRY_S = 60
+
+# Fixed assistant prompts, keyed by ID
+PROMPTS = {
+    "greet": """
+    👋 Hello! I'm the TalentScout AI Assistant.
+
+    I'll be helping you through the initial screening process for your job application.
+    I'll ask you a series of questions to learn more about you and your technical skills.
+
+    Let's get started! How are you doing today?
+    """,
+    "ask_name": "First, could you please tell me your full name?",
+    "ask_email": "Nice to meet you, {name}! Could you please provide your email address?",
+    "invalid_email": "That doesn't look like a valid email address. Could you please check it and try again?",
+    "ask_phone": "Great! Now, could you share your phone number?",
+    "invalid_phone": "That doesn't look like a valid phone number. Could you please enter it again, including the country code if possible?",
+    "ask_experience": "How many years of experience do you have in your field?",
+    "ask_position": "Thanks! What position(s) are you interested in applying for at TalentScout?",
+    "ask_location": "What is your current location?",
+    "ask_tech_stack": "Please list the technologies you're proficient in, separated by commas (e.g., Python, JavaScript, React, MongoDB).",
+    "about_tech": "About {tech}: {question}",
+    "unknown_tech_stack": "I don't have specific technical questions for the technologies you've mentioned. Let's have a more general discussion about your skills.",
+    "general_technical_question": "Can you describe your technical background and the projects you've worked on?",
+    "wrap_up": """
+    Thank you for answering the technical questions, {name}!
+
+    Based on our conversation, I have a good understanding of your background and technical skills.
+
+    Is there anything else you'd like to share about yourself or do you have any questions about the position?
+    """,
+    "farewell": """
+        Thank you for taking the time to chat with me today, {name}!
+
+        Our team at TalentScout will review your profile, and we'll be in touch via email ({email}) or phone ({phone}) within the next 3-5 business days.
+
+        Have a great day!
+        """,
+}
+
+# Default questions for unknown tech stacks
+DEFAULT_QUESTIONS = [
+    "Can you describe your experience with this technology?",
+    "What projects have you worked on using this technology?",
+    "What are some challenges you've faced with this technology and how did you overcome them?",
+    "How do you stay updated with the latest developments in this field?",
+    "Can you explain a complex concept in this technology in simple terms?"
+]
+
+# Fallback responses when the bot doesn't understand
+FALLBACK_RESPONSES = [
+    "I'm not sure I understand. Could you please rephrase that?",
+    "I didn't quite catch that. Can you elaborate?",
+    "I'm having trouble following. Could you clarify what you mean?",
+    "I'm sorry, I didn't understand. Let's try a different approach.",
+    "I may have missed something. Could you provide more details?"
+]
+
+_TOKEN = "__PH{}__"
+_TOKEN_RE = re.compile(r"__\s*PH\s*(\d+)\s*__", re.IGNORECASE)
+
+# Function to list every English template in the catalog, keyed by ID
+def english_templates():
+    templates = dict(PROMPTS)
+    for i, question in enumerate(DEFAULT_QUESTIONS):
+        templates[f"default_question.{i}"] = question
+    for i, response in enumerate(FALLBACK_RESPONSES):
+        templates[f"fallback.{i}"] = response
+    return templates
+
+# Function to swap {placeholders} for opaque tokens the translator won't touch
+def protect_placeholders(template):
+    names = []
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        parts.append(literal)
+        if field is not None:
+            if field not in names:
+                names.append(field)
+            parts.append(_TOKEN.format(names.index(field)))
+    return "".join(parts), names
+
+# Function to turn tokens back into {placeholders}; None if any were lost
+def restore_placeholders(translated, names):
+    # Escape braces the translator may have introduced before re-adding fields
+    translated = translated.replace("{", "{{").replace("}", "}}")
+    seen = set()
+
+    def replace(match):
+        index = int(match.group(1))
+        if index >= len(names):
+            return match.group(0)
+        seen.add(index)
+        return "{" + names[index] + "}"
+
+    restored = _TOKEN_RE.sub(replace, translated)
+    if len(seen) != len(names):
+        return None
+    return restored
+
+# Function to translate one template, keeping its placeholders intact
+def translate_template(template, lang, translate=cached_translate):
+    protected, names = protect_placeholders(template)
+    try:
+        translated = translate(protected, "en", lang)
+    except Exception:
+        count("translator_failures_total", call="prompt_template")
+        return None
+    if not translated:
+        return None
+    return restore_placeholders(translated, names)
+
+# Translated templates for every language, loaded once per process
+class PromptCatalog:
+    def __init__(self, path=CATALOG_PATH, translate=cached_translate):
+        self.path = path
+        self.translate = translate
+        self._english = english_templates()
+        self._languages = {}
+        self._lock = threading.Lock()
+        # Languages being translated in the background, and when each fill last started
+        self._filling = {}
+        self._fill_started = {}
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: prompt catalog could not be loaded: {e}")
+            return
+        with self._lock:
+            for lang, templates in data.get("languages", {}).items():
+                self._languages[lang] = dict(templates)
+
+    def save(self, path=None):
+        path = path or self.path
+        with self._lock:
+            data = json.dumps({"languages": self._languages}, indent=2, ensure_ascii=False)
+        atomic_write(path, data.encode("utf-8"))
+
+    def languages(self):
+        return sorted(self._languages)
+
+    def build_language(self, lang, translate=cached_translate):
+        templates = {}
+        for key, template in self._english.items():
+            # Keep the English text if placeholders didn't survive translation
+            templates[key] = translate_template(template, lang, translate) or template
+        with self._lock:
+            self._languages[lang] = templates
+        return templates
+
+    def get_template(self, key, lang="en"):
+        if lang == "en":
+            return self._english[key]
+        templates = self._languages.get(lang)
+        if templates is not None and key in templates:
+            return templates[key]
+
+        # Not precomputed yet: answer in English and translate the language in the background
+        self.fill_in_background(lang)
+        return self._english[key]
+
+    def missing(self, lang):
+        templates = self._languages.get(lang, {})
+        return [key for key in self._english if key not in templates]
+
+    # Function to start translating the missing prompts of each language, off the request path
+    def fill_missing(self, languages):
+        threads = [self.fill_in_background(lang) for lang in languages if lang != "en" and self.missing(lang)]
+        return [thread for thread in threads if thread is not None]
+
+    def fill_in_background(self, lang):
+        with self._lock:
+            if lang in self._filling or time.monotonic() - self._fill_started.get(lang, -FILL_RETRY_S) < FILL_RETRY_S:
+                return None
+            self._fill_started[lang] = time.monotonic()
+            thread = self._filling[lang] = threading.Thread(
+                target=self._fill, args=(lang,), name=f"prompt-catalog-{lang}", daemon=True
+            )
+        thread.start()
+        return thread
+
+    def _fill(self, lang):
+        try:
+            filled = 0
+            for key in self.missing(lang):
+                # Untranslated keys stay missing and are retried by a later fill
+                translated = translate_template(self._english[key], lang, self.translate)
+                if translated is not None:
+                    with self._lock:
+                        self._languages.setdefault(lang, {})[key] = translated
+                    filled += 1
+            if filled and self.path:
+                self.save()
+        except Exception as e:
+            print(f"Warning: prompts for '{lang}' could not be translated: {e}")
+        finally:
+            with self._lock:
+                self._filling.pop(lang, None)
+
+    def render(self, key, lang="en", **values):
+        template = self.get_template(key, lang)
+        try:
+            return template.format(**values)
+        except (KeyError, IndexError, ValueError):
+            return self._english[key].format(**values)
+
+# Process-wide catalog shared by every session
+_catalog = None
+_catalog_lock = threading.Lock()
+
+# Function to get the shared prompt catalog
+def get_prompt_catalog():
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = PromptCatalog()
+    return _catalog
+
+# Function to render a prompt in the given language
+def render_prompt(key, lang="en", **values):
+    return get_prompt_catalog().render(key, lang, **values)
+
+# Function to translate, in the background, every language the catalog file lacks (run at startup)
+def prepare_prompt_catalog(languages):
+    return get_prompt_catalog().fill_missing(languages)
+
+# Function to precompute and save the catalog for the given language codes
+def build_catalog(languages, path=CATALOG_PATH, translate=cached_translate):
+    catalog = PromptCatalog(path)
+    for lang in languages:
+        if lang != "en":
+            catalog.build_language(lang, translate)
+    catalog.save(path)
+    return catalog
+
+if __name__ == "__main__":
+    from interview_session import SUPPORTED_LANGUAGES
+
+    built = build_catalog(SUPPORTED_LANGUAGES.values())
+    print(f"Saved prompts for {', '.join(built.languages())} to {built.path}")
@@ -0,0 +1,282 @@
+"""Indexed bank of predefined technical questions.
+
+The questions live in ``question_bank.json`` instead of the code:
+
+    {"technologies": {"nodejs": {"name": "Node.js",
+                                 "aliases": ["node", "express"],
+                                 "questions": [{"text": "...", "difficulty": "easy"}]}}}
+
+At load time the bank is turned into an indexed structure:
+
+* every question gets an integer id, and the ids of one technology and
+  difficulty form a contiguous range, so a session picks an unused question
+  with a per-session cursor (a random walk over the range with a coprime
+  stride) in O(1) instead of scanning the questions already asked;
+* names and aliases are normalized ("Node.js", "node js" -> "nodejs") into
+  one alias table, and a trigram index over the aliases resolves misspelled
+  names ("Javascipt", "Postgress") when there is no exact match.
+
+With ``TALENTSCOUT_QUESTION_BANK_MMAP=1`` the JSON file is compiled into a
+``.bin`` sidecar (rebuilt whenever the JSON changes) and the question texts
+are read from a memory map, so worker processes share one copy of a large
+bank in the page cache. Check how a tech stack is understood with:
+
+    python question_bank.py resolve "Node.js, JS, Postgres and ReactJS"
+    python question_bank.py stats
+"""
+import argparse
+import json
+import math
+import mmap
+import os
+import random
+import re
+import struct
+import threading
+from array import array
+from collections import Counter
+
+from transcript_store import atomic_write
+
+BANK_PATH = os.environ.get(
+    "TALENTSCOUT_QUESTION_BANK",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank.json")
+)
+# Set TALENTSCOUT_QUESTION_BANK_MMAP=1 to read the questions from a compiled, memory-mapped file
+MMAP_ENABLED = os.environ.get("TALENTSCOUT_QUESTION_BANK_MMAP", "0") == "1"
+
+DIFFICULTIES = ("easy", "medium", "hard")
+DEFAULT_DIFFICULTY = "medium"
+# Trigram (Dice) similarity needed to accept a misspelled technology name
+FUZZY_THRESHOLD = 0.5
+# Shorter names must match an alias exactly ("go", "c", "r" are too ambiguous)
+FUZZY_MIN_LENGTH = 4
+
+# Compiled file: magic, header length, JSON header, question offsets, UTF-8 texts
+_MAGIC = b"TSQBANK1"
+_HEADER = struct.Struct("<Q")
+
+# Separators between technologies in a free-text tech stack
+_SEPARATORS = re.compile(r"[,;\n&|]|\band\b", re.IGNORECASE)
+_WORDS = re.compile(r"[\s/]+")
+_NOT_NAME = re.compile(r"[^\w+#]")
+
+# Function to normalize a technology name: "Node.js" / "node js" -> "nodejs"
+def normalize(name):
+    return _NOT_NAME.sub("", name.lower())
+
+# Function to get the set of trigrams of a normalized name
+def trigrams(key):
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# Question texts stored back to back in a memory-mapped buffer
+class MappedTexts:
+    def __init__(self, buffer, offsets):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return str(self.buffer[self.offsets[index]:self.offsets[index + 1]], "utf-8")
+
+class QuestionBank:
+    def __init__(self, techs, aliases, texts):
+        # techs: tech -> {"name": display name, "ranges": {difficulty: [start, end)}}
+        self.techs = techs
+        self.aliases = aliases
+        self.texts = texts
+        # Trigram -> alias keys containing it, for names without an exact match
+        self.trigram_index = {}
+        self.trigram_counts = {}
+        for key in aliases:
+            if len(key) >= FUZZY_MIN_LENGTH:
+                grams = trigrams(key)
+                self.trigram_counts[key] = len(grams)
+                for gram in grams:
+                    self.trigram_index.setdefault(gram, []).append(key)
+
+    @classmethod
+    def from_dict(cls, data):
+        techs, aliases, texts = {}, {}, []
+        for tech, entry in data.get("technologies", {}).items():
+            by_difficulty = {difficulty: [] for difficulty in DIFFICULTIES}
+            for question in entry.get("questions", []):
+                if isinstance(question, str):
+                    question = {"text": question}
+                difficulty = question.get("difficulty", DEFAULT_DIFFICULTY)
+                by_difficulty.setdefault(difficulty, []).append(question["text"])
+            ranges = {}
+            for difficulty, questions in by_difficulty.items():
+                if questions:
+                    ranges[difficulty] = [len(texts), len(texts) + len(questions)]
+                    texts.extend(questions)
+            techs[tech] = {"name": entry.get("name", tech.capitalize()), "ranges": ranges}
+            for alias in [tech, entry.get("name", tech)] + entry.get("aliases", []):
+                aliases.setdefault(normalize(alias), tech)
+        return cls(techs, aliases, texts)
+
+    @classmethod
+    def load(cls, path=BANK_PATH, use_mmap=MMAP_ENABLED):
+        if use_mmap:
+            compiled = f"{path}.bin"
+            if not os.path.exists(compiled) or os.path.getmtime(compiled) < os.path.getmtime(path):
+                compile_bank(path, compiled)
+            return cls.open_compiled(compiled)
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def open_compiled(cls, path):
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path} is not a compiled question bank")
+        start = len(_MAGIC) + _HEADER.size
+        (header_size,) = _HEADER.unpack_from(buffer, len(_MAGIC))
+        header = json.loads(buffer[start:start + header_size])
+        view = memoryview(buffer)
+        offsets_start = start + header_size
+        offsets_end = offsets_start + 8 * (header["count"] + 1)
+        offsets = view[offsets_start:offsets_end].cast("Q")
+        texts = MappedTexts(view[offsets_end:], offsets)
+        return cls(header["techs"], header["aliases"], texts)
+
+    def __contains__(self, tech):
+        return tech in self.techs
+
+    def __len__(self):
+        return len(self.texts)
+
+    def display_name(self, tech):
+        entry = self.techs.get(tech)
+        return entry["name"] if entry else tech.capitalize()
+
+    # Function to map one technology name to its bank key, or None
+    def resolve(self, name):
+        key = normalize(name)
+        if not key:
+            return None
+        tech = self.aliases.get(key)
+        if tech is not None or len(key) < FUZZY_MIN_LENGTH:
+            return tech
+        grams = trigrams(key)
+        shared = Counter(alias for gram in grams for alias in self.trigram_index.get(gram, ()))
+        best, best_score = None, FUZZY_THRESHOLD
+        for alias, common in shared.items():
+            score = 2 * common / (len(grams) + self.trigram_counts[alias])
+            if score >= best_score:
+                best, best_score = alias, score
+        return self.aliases[best] if best is not None else None
+
+    # Function to turn a free-text tech stack into bank keys; unknown entries are kept as written
+    def resolve_stack(self, text):
+        techs = []
+        for piece in _SEPARATORS.split(text):
+            piece = piece.strip().lower()
+            if not piece:
+                continue
+            tech = self.aliases.get(normalize(piece))
+            if tech is not None:
+                found = [tech]
+            else:
+                # "I mostly use node.js", "HTML/CSS": exact aliases word by word, then a fuzzy match
+                found = [self.aliases[key] for key in map(normalize, _WORDS.split(piece)) if key in self.aliases]
+                if not found:
+                    tech = self.resolve(piece)
+                    found = [tech] if tech is not None else []
+            for tech in found or [piece]:
+                if tech not in techs:
+                    techs.append(tech)
+        return techs
+
+    # Function to draw an unused question for one session in O(1)
+    def draw(self, tech, cursors, number=0, exclude=()):
+        # cursors: the session's {"tech:difficulty": [offset, stride, drawn]}, updated in place
+        # number: how many questions were already asked about tech, to pick the difficulty
+        ranges = self.techs[tech]["ranges"]
+        target = min(number, len(DIFFICULTIES) - 1)
+        order = sorted(DIFFICULTIES, key=lambda difficulty: abs(DIFFICULTIES.index(difficulty) - target))
+        for difficulty in order + [d for d in ranges if d not in DIFFICULTIES]:
+            if difficulty not in ranges:
+                continue
+            start, end = ranges[difficulty]
+            size = end - start
+            cursor = cursors.get(f"{tech}:{difficulty}")
+            if cursor is None:
+                cursor = cursors[f"{tech}:{difficulty}"] = [random.randrange(size), _stride(size), 0]
+            while cursor[2] < size:
+                question = self.texts[start + (cursor[0] + cursor[2] * cursor[1]) % size]
+                cursor[2] += 1
+                # Only a question already asked through another path is skipped
+                if question not in exclude:
+                    return question
+        return None
+
+# Function to pick a random step that visits every question of a range exactly once
+def _stride(size):
+    if size <= 2:
+        return 1
+    while True:
+        stride = random.randrange(1, size)
+        if math.gcd(stride, size) == 1:
+            return stride
+
+# Function to compile the JSON bank into the memory-mappable format
+def compile_bank(source, output):
+    with open(source, encoding="utf-8") as f:
+        bank = QuestionBank.from_dict(json.load(f))
+    blobs = [bank.texts[index].encode("utf-8") for index in range(len(bank))]
+    offsets = array("Q", [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    header = json.dumps({"count": len(blobs), "techs": bank.techs, "aliases": bank.aliases}).encode("utf-8")
+    # Keep the offsets 8-byte aligned
+    header += b" " * (-(len(_MAGIC) + _HEADER.size + len(header)) % 8)
+    atomic_write(output, b"".join([_MAGIC, _HEADER.pack(len(header)), header, offsets.tobytes()] + blobs))
+    return bank
+
+_bank = None
+_bank_lock = threading.Lock()
+
+# Function to get the process-wide question bank, loaded on first use
+def get_question_bank():
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                try:
+                    _bank = QuestionBank.load()
+                except (OSError, ValueError) as e:
+                    print(f"Warning: question bank could not be loaded: {e}")
+                    _bank = QuestionBank({}, {}, [])
+    return _bank
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bank", default=BANK_PATH, help="question bank JSON file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("compile", help="write the memory-mappable .bin file next to the bank")
+    commands.add_parser("stats", help="count technologies, aliases and questions")
+    resolve = commands.add_parser("resolve", help="show how a tech stack is matched to the bank")
+    resolve.add_argument("text")
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        bank = compile_bank(args.bank, f"{args.bank}.bin")
+        print(f"Compiled {len(bank)} questions to {args.bank}.bin")
+        return
+    bank = QuestionBank.load(args.bank)
+    if args.command == "stats":
+        print(f"{len(bank.techs)} technologies, {len(bank.aliases)} aliases, {len(bank)} questions")
+        for tech, entry in bank.techs.items():
+            sizes = ", ".join(f"{difficulty} {end - start}" for difficulty, (start, end) in entry["ranges"].items())
+            print(f"{tech:<16}{entry['name']:<20}{sizes}")
+    else:
+        for tech in bank.resolve_stack(args.text):
+            print(f"{tech:<16}{bank.display_name(tech) if tech in bank else '(not in the bank)'}")
+
+if __name__ == "__main__":
+    main()
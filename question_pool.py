@@ -0,0 +1,228 @@
+"""Pool of pre-generated, validated LLM questions for each technology.
+
+Interview turns draw from the pool instead of running the model; a background
+thread tops each technology back up once it drops below the low watermark.
+Fill the pool offline (for example while building a release) with:
+
+    python question_pool.py --target 20
+
+Every process keeps its own copy of the pool. Processes sharing the pool file
+save under an exclusive file lock and merge what the others saved, leaving
+out questions they have drawn themselves.
+"""
+import argparse
+import json
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Not on POSIX: saves are not coordinated across processes
+    fcntl = None
+
+from transcript_store import atomic_write
+
+# Set TALENTSCOUT_QUESTION_POOL=0 to generate questions live like before
+QUESTION_POOL_ENABLED = os.environ.get("TALENTSCOUT_QUESTION_POOL", "1") == "1"
+POOL_PATH = os.environ.get("TALENTSCOUT_QUESTION_POOL_PATH", "question_pool.json")
+LOW_WATERMARK = int(os.environ.get("TALENTSCOUT_QUESTION_POOL_LOW", "5"))
+TARGET_SIZE = int(os.environ.get("TALENTSCOUT_QUESTION_POOL_TARGET", "20"))
+
+class QuestionPool:
+    def __init__(self, generate, techs, path=POOL_PATH, low_watermark=LOW_WATERMARK, target_size=TARGET_SIZE):
+        # generate(tech) returns a validated question or None
+        self.generate = generate
+        self.techs = list(techs)
+        self.path = path
+        self.low_watermark = low_watermark
+        self.target_size = target_size
+        self._pools = {tech: deque() for tech in self.techs}
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._pending_set = set()
+        # Questions drawn since the last save, so a merge doesn't bring them back
+        self._drawn = set()
+        self._wakeup = threading.Event()
+        self._worker = None
+        self.stats = {"draws": 0, "hits": 0, "generated": 0, "rejected": 0}
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: question pool could not be loaded: {e}")
+            return
+        with self._lock:
+            for tech, questions in data.items():
+                pool = self._pools.get(tech)
+                if pool is None:
+                    continue
+                for question in questions:
+                    if len(pool) >= self.target_size:
+                        break
+                    if question not in pool and question not in self._drawn:
+                        pool.append(question)
+
+    def save(self):
+        if not self.path:
+            return
+        with locked(self.path):
+            # Merge what other processes saved since we loaded
+            self.load()
+            with self._lock:
+                data = {tech: list(questions) for tech, questions in self._pools.items()}
+                self._drawn.clear()
+            atomic_write(self.path, json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8"))
+
+    def size(self, tech):
+        with self._lock:
+            return len(self._pools.get(tech, ()))
+
+    def sizes(self):
+        with self._lock:
+            return {tech: len(questions) for tech, questions in self._pools.items()}
+
+    def draw(self, tech, exclude=()):
+        # Take a question this session hasn't seen yet; None if the pool is dry
+        question = None
+        with self._lock:
+            self.stats["draws"] += 1
+            pool = self._pools.get(tech)
+            if pool is None:
+                return None
+            for candidate in pool:
+                if candidate not in exclude:
+                    question = candidate
+                    break
+            if question is not None:
+                pool.remove(question)
+                self._drawn.add(question)
+                self.stats["hits"] += 1
+            needs_refill = len(pool) < self.low_watermark
+        if needs_refill:
+            self.request_refill(tech)
+        return question
+
+    def fill(self, tech, target_size=None):
+        # Generate until the pool for tech reaches target_size (bounded attempts)
+        target_size = target_size or self.target_size
+        attempts = 0
+        while self.size(tech) < target_size and attempts < target_size * 3:
+            attempts += 1
+            question = self.generate(tech)
+            with self._lock:
+                if not question or question in self._pools[tech]:
+                    self.stats["rejected"] += 1
+                    continue
+                self._pools[tech].append(question)
+                self.stats["generated"] += 1
+        return self.size(tech)
+
+    def request_refill(self, tech):
+        with self._lock:
+            if tech in self._pending_set:
+                return
+            self._pending.append(tech)
+            self._pending_set.add(tech)
+        self._start_worker()
+        self._wakeup.set()
+
+    def refill_low(self):
+        # Queue every technology that is below the low watermark
+        for tech, size in self.sizes().items():
+            if size < self.low_watermark:
+                self.request_refill(tech)
+
+    def _start_worker(self):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="question-pool-refill",
+                    daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        self._wakeup.clear()
+                        break
+                    tech = self._pending.popleft()
+                try:
+                    self.fill(tech)
+                    self.save()
+                except Exception as e:
+                    print(f"Warning: question pool refill for '{tech}' failed: {e}")
+                finally:
+                    with self._lock:
+                        self._pending_set.discard(tech)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["sizes"] = self.sizes()
+        return stats
+
+# Function to hold an exclusive lock on a pool file (a sidecar .lock file) across processes
+@contextmanager
+def locked(path):
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+# Process-wide pool shared by every session
+_pool = None
+_pool_lock = threading.Lock()
+
+# Function to get the shared question pool, creating it on first use
+def get_question_pool(generate, techs):
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = QuestionPool(generate, techs)
+                _pool.refill_low()
+    return _pool
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the pre-generated question pool.")
+    parser.add_argument("--target", type=int, default=TARGET_SIZE, help="questions per technology")
+    parser.add_argument("--tech", action="append", help="only fill these technologies")
+    args = parser.parse_args()
+
+    from interview_session import generate_question_with_model
+    from question_bank import get_question_bank
+    from model_registry import get_model_handle
+
+    model = get_model_handle("distilgpt2", max_length=100)
+    if model is None:
+        raise SystemExit("The model could not be loaded; nothing to generate.")
+
+    pool = QuestionPool(lambda tech: generate_question_with_model(model, tech), get_question_bank().techs.keys())
+    for tech in args.tech or pool.techs:
+        if tech not in pool.techs:
+            print(f"{tech:<12} skipped (not in the question bank)")
+            continue
+        size = pool.fill(tech, args.target)
+        pool.save()
+        print(f"{tech:<12} {size} questions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from translation_cache import cached_translate
+
+# Set TALENTSCOUT_PREFETCH=0 to generate questions synchronously like before
+PREFETCH_ENABLED = os.environ.get("TALENTSCOUT_PREFETCH", "1") == "1"
+PREFETCH_WORKERS = int(os.environ.get("TALENTSCOUT_PREFETCH_WORKERS", "2"))
+
+# Process-wide worker pool shared by every session
+_executor = None
+_executor_lock = threading.Lock()
+
+# Function to get the shared prefetch pool
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=PREFETCH_WORKERS,
+                    thread_name_prefix="question-prefetch"
+                )
+    return _executor
+
+# Function run on a worker: generate a question and translate it if needed
+def _generate_and_translate(generate, tech, language):
+    question = generate(tech)
+    if not question:
+        return None, None
+    translated = question
+    if language != "en":
+        try:
+            translated = cached_translate(question, "en", language)
+        except Exception:
+            translated = question
+    return question, translated
+
+# A speculative question being generated for one session
+class QuestionPrefetch:
+    def __init__(self, tech, language, future):
+        self.tech = tech
+        self.language = language
+        self.future = future
+
+    def matches(self, tech):
+        return self.tech == tech and not self.future.cancelled()
+
+    def take(self, timeout=None):
+        # Returns (question, translated) or (None, None) if generation failed
+        try:
+            return self.future.result(timeout=timeout)
+        except Exception:
+            # Cancelled, timed out or failed on the worker
+            return None, None
+
+    def cancel(self):
+        # Running generations can't be interrupted; their result is just dropped
+        self.future.cancel()
+
+# Function to start generating the next question for a technology in the background
+def prefetch_question(generate, tech, language="en"):
+    future = get_executor().submit(_generate_and_translate, generate, tech, language)
+    return QuestionPrefetch(tech, language, future)
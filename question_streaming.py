@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+from collections import deque
+
+from generation_controls import get_tokenizer
+
+# Set TALENTSCOUT_STREAMING=1 to show generated questions token by token
+STREAMING_ENABLED = os.environ.get("TALENTSCOUT_STREAMING", "0") == "1"
+
+# Time-to-first-token and total streaming time, shared by every session
+class StreamingStats:
+    def __init__(self, recent=256):
+        self._lock = threading.Lock()
+        self._ttft = deque(maxlen=recent)
+        self._total = deque(maxlen=recent)
+
+    def record(self, ttft_s, total_s):
+        with self._lock:
+            if ttft_s is not None:
+                self._ttft.append(ttft_s)
+            self._total.append(total_s)
+
+    def summary(self):
+        with self._lock:
+            ttft = sorted(self._ttft)
+            total = sorted(self._total)
+
+        def percentile(values, p):
+            return 1000 * values[int(p * (len(values) - 1))] if values else 0.0
+
+        return {
+            "streams": len(total),
+            "ttft_p50_ms": percentile(ttft, 0.5),
+            "ttft_p95_ms": percentile(ttft, 0.95),
+            "total_p50_ms": percentile(total, 0.5),
+            "total_p95_ms": percentile(total, 0.95),
+        }
+
+streaming_stats = StreamingStats()
+
+# Function to run generation on a helper thread and yield text chunks as they arrive
+def stream_generation(model, prompt, timeout=None, **generate_kwargs):
+    started = time.perf_counter()
+    first_token_at = None
+    tokenizer = get_tokenizer(model)
+
+    if tokenizer is None:
+        # Models without a tokenizer can't stream; hand back the whole continuation
+        text = model(prompt, **generate_kwargs)[0]["generated_text"]
+        first_token_at = time.perf_counter()
+        yield text.split(prompt, 1)[-1]
+    else:
+        from transformers import TextIteratorStreamer
+
+        streamer = TextIteratorStreamer(
+            tokenizer,
+            skip_prompt=True,
+            skip_special_tokens=True,
+            timeout=timeout
+        )
+        errors = []
+
+        def run():
+            try:
+                model(prompt, streamer=streamer, **generate_kwargs)
+            except Exception as e:
+                errors.append(e)
+                # Unblock the reader if generation failed before finishing
+                streamer.end()
+
+        worker = threading.Thread(target=run, name="question-stream", daemon=True)
+        worker.start()
+        for chunk in streamer:
+            if chunk and first_token_at is None:
+                first_token_at = time.perf_counter()
+            yield chunk
+        worker.join()
+        if errors:
+            raise errors[0]
+
+    ttft = first_token_at - started if first_token_at is not None else None
+    streaming_stats.record(ttft, time.perf_counter() - started)
+
+# Function to report time-to-first-token percentiles
+def get_streaming_stats():
+    return streaming_stats.summary()
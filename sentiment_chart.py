@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+
+# Most points the sidebar chart ever draws, however long the conversation gets
+MAX_CHART_POINTS = int(os.environ.get("TALENTSCOUT_MAX_CHART_POINTS", "120"))
+
+# Function to map sentiment scores to chart colors in one vectorized pass
+def sentiment_colors(scores):
+    scores = np.asarray(scores, dtype=float)
+    return np.select([scores > 0.3, scores < -0.3], ["green", "red"], default="yellow")
+
+# Per-session sentiment series, downsampled incrementally by rolling means
+class SentimentChartState:
+    def __init__(self, max_points=MAX_CHART_POINTS):
+        # Buckets are merged in pairs, so keep an even number of them
+        self.max_points = max(2, max_points - max_points % 2)
+        self.reset()
+
+    def reset(self):
+        self.cursor = 0
+        self.bucket_size = 1
+        self.buckets = 0
+        self.x_sum = np.zeros(self.max_points)
+        self.y_sum = np.zeros(self.max_points)
+        self.counts = np.zeros(self.max_points, dtype=np.int64)
+        self.version = 0
+        self.figure = None
+        self.figure_version = -1
+
+    def _halve(self):
+        # Merge neighbouring buckets so every bucket covers twice as many points
+        half = self.max_points // 2
+        for values in (self.x_sum, self.y_sum, self.counts):
+            values[:half] = values[0::2] + values[1::2]
+            values[half:] = 0
+        self.buckets = half
+        self.bucket_size *= 2
+
+    def add(self, x, y):
+        last = self.buckets - 1
+        if last < 0 or self.counts[last] >= self.bucket_size:
+            if self.buckets == self.max_points:
+                self._halve()
+            last = self.buckets
+            self.buckets += 1
+        self.x_sum[last] += x
+        self.y_sum[last] += y
+        self.counts[last] += 1
+
+    def sync(self, history):
+        # Fold in only the (message index, score) points added since the last run
+        if self.cursor > len(history):
+            self.reset()
+        if self.cursor == len(history):
+            return False
+        for x, y in history[self.cursor:]:
+            self.add(x, y)
+        self.cursor = len(history)
+        self.version += 1
+        return True
+
+    def series(self):
+        counts = self.counts[:self.buckets]
+        return self.x_sum[:self.buckets] / counts, self.y_sum[:self.buckets] / counts
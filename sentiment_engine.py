@@ -0,0 +1,221 @@
+"""Lexicon sentiment scoring with a batch API.
+
+Gives the same polarity as ``TextBlob(text).sentiment.polarity`` (the
+default pattern analyzer) without building a TextBlob per message. The
+pattern lexicon is compiled once into a lookup table: a token -> id map plus
+NumPy arrays of polarity, intensity and modifier flags. Each text goes
+through TextBlob's own tokenizer and the same negation / modifier / "!" /
+emoticon rules, but over small integer codes instead of dictionaries, and the
+per-text averages and ±0.3 categories are computed with NumPy.
+
+* Live turns call ``polarity(text)`` / ``analyze(text)``.
+* Reprocessing jobs call ``score_batch(texts)``, which also scores each
+  distinct text only once.
+
+Compare the speed with ``python benchmarks/sentiment_engine.py``.
+"""
+import re
+import threading
+
+import numpy as np
+
+# Polarity above / below these is positive / negative, as in the interview flow
+POSITIVE_THRESHOLD = 0.3
+NEGATIVE_THRESHOLD = -0.3
+
+# Token codes that are not lexicon ids
+_SHORT = -1       # unknown word of up to two characters: keeps a pending modifier
+_LONG = -2        # other unknown word: drops a pending modifier
+_EXCLAMATION = -3
+_IRONY = -4
+_EMOTICON = -5    # followed by an index into Lexicon.emoticon_polarity
+
+# Runs of letters and digits; a lexicon word can only match a token made of its own runs
+_RUNS = re.compile(r"[^\W_]+")
+
+# The pattern lexicon compiled into lookup arrays
+class Lexicon:
+    def __init__(self):
+        from textblob.en import sentiment
+        from textblob._text import EMOTICONS, PUNCTUATION, replacements
+
+        if dict.__len__(sentiment) == 0:
+            sentiment.load()
+        self.tokenize = sentiment.tokenizer
+        self.negations = frozenset(sentiment.negations)
+        self.punctuation = PUNCTUATION
+        self.ids = {}
+        polarity, intensity, modifier = [], [], []
+        for word, tags in dict.items(sentiment):
+            self.ids[word] = len(polarity)
+            p, _, i = tags[None]
+            polarity.append(p)
+            intensity.append(i)
+            modifier.append(any(tag in tags for tag in sentiment.modifiers))
+        self.polarity = np.array(polarity, dtype=np.float64)
+        self.intensity = np.array(intensity, dtype=np.float64)
+        self.modifier = np.array(modifier, dtype=bool)
+        # Plain lists are faster than NumPy scalars inside the per-token loop
+        self._polarity = polarity
+        self._intensity = intensity
+        self._modifier = modifier
+        self._ends_ly = [word.endswith("ly") for word in self.ids]
+        self._negation = [word in self.negations for word in self.ids]
+
+        # The first emoticon group that contains a token wins, as in pattern
+        self.emoticons = {}
+        for (_, p), group in EMOTICONS.items():
+            for emoticon in group:
+                self.emoticons.setdefault(emoticon.lower(), p)
+        self.emoticon_polarity = list(self.emoticons.values())
+        self._emoticon_index = {emoticon: i for i, emoticon in enumerate(self.emoticons)}
+        self._codes = {}
+
+        # For the zero-score shortcut: every letter/digit run of a lexicon word or
+        # emoticon, and the other characters emoticons and "(!)" are made of
+        self._replacements = list(replacements.items())
+        # (single characters too, since pattern also matches emoticons written with spaces: "x D")
+        self._fragments = frozenset(
+            [run for key in list(self.ids) + list(self.emoticons) for run in _RUNS.findall(key)]
+            + [char for emoticon in self.emoticons for char in emoticon if char.isalnum()]
+        )
+        self._symbols = frozenset(
+            char for key in list(self.emoticons) + ["(!)"] for char in key if not char.isalnum()
+        )
+
+    def code(self, token):
+        code = self._codes.get(token)
+        if code is None:
+            code = self._classify(token)
+            if len(self._codes) < 200000:
+                self._codes[token] = code
+        return code
+
+    def _classify(self, token):
+        word_id = self.ids.get(token)
+        if word_id is not None:
+            return word_id
+        if token == "!":
+            return _EXCLAMATION
+        if token == "(!)":
+            return _IRONY
+        if token.isalpha() is False and len(token) <= 5 and token not in self.punctuation:
+            index = self._emoticon_index.get(token)
+            if index is not None:
+                return _EMOTICON - index
+        return _SHORT if len(token) <= 2 else _LONG
+
+    def may_score(self, text):
+        # False only when no token of the text can be a lexicon word, emoticon or "(!)"
+        if not self._symbols.isdisjoint(text):
+            return True
+        text = text.lower()
+        for contraction, split in self._replacements:
+            text = text.replace(contraction, split)
+        return not self._fragments.isdisjoint(_RUNS.findall(text))
+
+    def tokens(self, text):
+        return [token.lower() for token in " ".join(self.tokenize(text)).split()]
+
+    def assessments(self, text):
+        # (polarity, negated) per assessment, following pattern's Sentiment.assessments()
+        found = []
+        if not self.may_score(text):
+            return found
+        modifier = None     # id of the pending modifier word
+        negation = None     # pending negation token
+        polarity, intensity = self._polarity, self._intensity
+        for token in self.tokens(text):
+            code = self.code(token)
+            if code >= 0:
+                if modifier is None:
+                    found.append([polarity[code], intensity[code], False])
+                else:
+                    last = found[-1]
+                    last[0] = max(-1.0, min(polarity[code] * last[1], 1.0))
+                    last[1] = intensity[code]
+                if negation is not None:
+                    found[-1][1] = 1.0 / found[-1][1]
+                    found[-1][2] = True
+                modifier = code if self._modifier[code] else None
+                negation = token if self._negation[code] else None
+                continue
+
+            if token in self.negations:
+                negation = token
+            elif negation and len(token.strip("'")) > 1:
+                negation = None
+            if negation is not None and modifier is not None and self._ends_ly[modifier]:
+                found[-1][2] = True
+                negation = None
+            elif modifier is not None and len(token) > 2:
+                modifier = None
+            if code == _EXCLAMATION and found:
+                found[-1][0] = max(-1.0, min(found[-1][0] * 1.25, 1.0))
+            elif code == _IRONY:
+                found.append([0.0, 1.0, False])
+            elif code <= _EMOTICON:
+                found.append([self.emoticon_polarity[_EMOTICON - code], 1.0, False])
+        return found
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+# Function to get the compiled lexicon, built on first use
+def get_lexicon():
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = Lexicon()
+    return _lexicon
+
+# Function to map polarity scores to "positive" / "neutral" / "negative"
+def categorize(scores):
+    scores = np.asarray(scores, dtype=np.float64)
+    return np.where(
+        scores > POSITIVE_THRESHOLD, "positive",
+        np.where(scores < NEGATIVE_THRESHOLD, "negative", "neutral")
+    )
+
+# Function to score many texts; returns (polarity array, category array)
+def score_batch(texts):
+    lexicon = get_lexicon()
+    texts = list(texts)
+    unique = {}
+    positions = np.fromiter((unique.setdefault(text, len(unique)) for text in texts), dtype=np.int64, count=len(texts))
+
+    # One flat array of assessment polarities, tagged with the text they belong to
+    owners, values, negated = [], [], []
+    for number, text in enumerate(unique):
+        for value, _, is_negated in lexicon.assessments(text):
+            owners.append(number)
+            values.append(value)
+            negated.append(is_negated)
+    owners = np.array(owners, dtype=np.int64)
+    values = np.array(values, dtype=np.float64)
+    # "not good" is slightly bad, "not bad" slightly good
+    values = np.where(np.array(negated, dtype=bool), values * -0.5, values)
+
+    sums = np.bincount(owners, weights=values, minlength=len(unique))
+    counts = np.bincount(owners, minlength=len(unique))
+    scores = (sums / np.maximum(counts, 1))[positions]
+    return scores, categorize(scores)
+
+# Function to score one message (the live-turn path)
+def polarity(text):
+    total = 0.0
+    found = get_lexicon().assessments(text)
+    for value, _, is_negated in found:
+        total += value * -0.5 if is_negated else value
+    return total / (len(found) or 1)
+
+# Function to get (category, polarity) for one message
+def analyze(text):
+    score = polarity(text)
+    if score > POSITIVE_THRESHOLD:
+        return "positive", score
+    elif score < NEGATIVE_THRESHOLD:
+        return "negative", score
+    else:
+        return "neutral", score
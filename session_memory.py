@@ -0,0 +1,124 @@
+"""Compact containers for the per-session conversation state.
+
+A live interview keeps its messages as ``__slots__`` records, its sentiment
+series in two typed arrays and the questions it has asked as 64-bit content
+hashes. Once a session holds more than TALENTSCOUT_MAX_LIVE_MESSAGES
+messages, the older half is written to the transcript store and dropped
+from memory (see ``InterviewSession.spill_messages``).
+"""
+import hashlib
+import os
+import sys
+from array import array
+
+# Most messages a session keeps in memory; 0 keeps them all
+MAX_LIVE_MESSAGES = int(os.environ.get("TALENTSCOUT_MAX_LIVE_MESSAGES", "200"))
+
+# One chat message; sentiment and stage are only set on candidate messages
+class Message:
+    __slots__ = ("role", "content", "category", "score", "stage")
+
+    def __init__(self, role, content, category=None, score=None, stage=None):
+        self.role = role
+        self.content = content
+        self.category = category
+        self.score = score
+        # The interview stage the candidate was answering
+        self.stage = stage
+
+    @property
+    def sentiment(self):
+        if self.category is None:
+            return None
+        return {"category": self.category, "score": self.score}
+
+    def to_dict(self):
+        data = {"role": self.role, "content": self.content}
+        if self.category is not None:
+            data["sentiment"] = self.sentiment
+        if self.stage is not None:
+            data["stage"] = self.stage
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        sentiment = data.get("sentiment") or {}
+        return cls(
+            data["role"], data["content"], sentiment.get("category"), sentiment.get("score"), data.get("stage")
+        )
+
+# (message number, score) points in two typed arrays instead of a list of tuples
+class SentimentSeries:
+    __slots__ = ("positions", "scores")
+
+    def __init__(self, points=()):
+        self.positions = array("I")
+        self.scores = array("d")
+        for point in points:
+            self.append(point)
+
+    def append(self, point):
+        position, score = point
+        self.positions.append(position)
+        self.scores.append(score)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __iter__(self):
+        return zip(self.positions, self.scores)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(zip(self.positions[index], self.scores[index]))
+        return self.positions[index], self.scores[index]
+
+    def to_list(self):
+        return [[position, score] for position, score in self]
+
+# Function to get the stable 64-bit ID of a question's text
+def question_id(question):
+    if isinstance(question, int):
+        return question
+    return int.from_bytes(hashlib.blake2b(question.encode("utf-8"), digest_size=8).digest(), "big")
+
+# Questions already asked, kept as IDs; `text in log` still works
+class QuestionLog:
+    __slots__ = ("ids",)
+
+    def __init__(self, questions=()):
+        self.ids = array("Q", (question_id(question) for question in questions))
+
+    def append(self, question):
+        self.ids.append(question_id(question))
+
+    def __contains__(self, question):
+        return question_id(question) in self.ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __getitem__(self, index):
+        return self.ids[index]
+
+# Function to estimate the bytes held by an object graph (shared objects counted once)
+def deep_size(obj, seen=None):
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_size(getattr(obj, slot), seen) for slot in obj.__slots__ if hasattr(obj, slot))
+    elif hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    return size
@@ -0,0 +1,203 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# "sqlite" (default), "memory" for a single-process stand-in, or "none" to disable
+SESSION_STORE_BACKEND = os.environ.get("TALENTSCOUT_SESSION_STORE", "sqlite")
+SESSION_DB_PATH = os.environ.get("TALENTSCOUT_SESSION_DB", "sessions.db")
+
+# Interview state that is persisted; the model handle and caches are left out
+PERSISTED_FIELDS = (
+    "stage",
+    "candidate_info",
+    "tech_stack_str",
+    "question_cursors",
+    "current_tech",
+    "asked_questions_count",
+    "conversation_ended",
+    "language",
+    "language_name",
+    "language_locked",
+    "language_votes",
+    "service_calls",
+    "message_offset",
+    "spilled_parts",
+)
+# Lists that only grow during an interview (until old messages are spilled); only new items are written
+APPEND_ONLY_FIELDS = (
+    "messages",
+    "sentiment_history",
+    "questions_asked",
+)
+
+# Function to turn compact session records (e.g. messages) into plain JSON
+def _plain(value):
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if to_dict is not None else str(value)
+
+# Function to serialize a value the same way every time
+def _dumps(value):
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=_plain)
+
+# Remembers what was last persisted for one session so only changes are written
+class SessionSnapshot:
+    def __init__(self):
+        self.field_values = {}
+        # key -> (persisted length, serialized last item) to spot non-append edits
+        self.list_marks = {}
+
+    def diff(self, state):
+        fields = {}
+        appends = {}
+        rewrites = {}
+        for key in PERSISTED_FIELDS:
+            if key not in state:
+                continue
+            value = _dumps(state[key])
+            if self.field_values.get(key) != value:
+                fields[key] = value
+        for key in APPEND_ONLY_FIELDS:
+            if key not in state:
+                continue
+            items = list(state[key])
+            length, last = self.list_marks.get(key, (0, None))
+            if len(items) >= length and (length == 0 or _dumps(items[length - 1]) == last):
+                if len(items) > length:
+                    appends[key] = (length, [_dumps(item) for item in items[length:]])
+            else:
+                # The list was trimmed or edited in place; write it out again
+                rewrites[key] = [_dumps(item) for item in items]
+        return fields, appends, rewrites
+
+    def mark_saved(self, state):
+        for key in PERSISTED_FIELDS:
+            if key in state:
+                self.field_values[key] = _dumps(state[key])
+        for key in APPEND_ONLY_FIELDS:
+            if key in state:
+                items = state[key]
+                self.list_marks[key] = (len(items), _dumps(items[-1]) if items else None)
+
+# Session snapshots in a local SQLite database in WAL mode
+class SQLiteSessionStore:
+    def __init__(self, path=SESSION_DB_PATH):
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY, updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS session_fields ("
+            " session_id TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " PRIMARY KEY (session_id, key));"
+            "CREATE TABLE IF NOT EXISTS session_items ("
+            " session_id TEXT NOT NULL, key TEXT NOT NULL, seq INTEGER NOT NULL, value TEXT NOT NULL,"
+            " PRIMARY KEY (session_id, key, seq));"
+        )
+        self._db.commit()
+
+    def save(self, session_id, fields, appends, rewrites):
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO session_fields VALUES (?, ?, ?)",
+                [(session_id, key, value) for key, value in fields.items()]
+            )
+            for key in rewrites:
+                self._db.execute(
+                    "DELETE FROM session_items WHERE session_id=? AND key=?",
+                    (session_id, key)
+                )
+            writes = dict(appends)
+            writes.update((key, (0, items)) for key, items in rewrites.items())
+            for key, (start, items) in writes.items():
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO session_items VALUES (?, ?, ?, ?)",
+                    [(session_id, key, start + i, value) for i, value in enumerate(items)]
+                )
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?)",
+                (session_id, time.time())
+            )
+
+    def load(self, session_id):
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM sessions WHERE session_id=?", (session_id,)).fetchone() is None:
+                return None
+            fields = self._db.execute(
+                "SELECT key, value FROM session_fields WHERE session_id=?", (session_id,)
+            ).fetchall()
+            items = self._db.execute(
+                "SELECT key, value FROM session_items WHERE session_id=? ORDER BY key, seq", (session_id,)
+            ).fetchall()
+        state = {key: json.loads(value) for key, value in fields}
+        for key in APPEND_ONLY_FIELDS:
+            state[key] = []
+        for key, value in items:
+            state[key].append(json.loads(value))
+        return state
+
+    def delete(self, session_id):
+        with self._lock, self._db:
+            for table in ("session_items", "session_fields", "sessions"):
+                self._db.execute(f"DELETE FROM {table} WHERE session_id=?", (session_id,))
+
+    def prune(self, max_age_s):
+        # Drop sessions nobody has touched for max_age_s seconds
+        cutoff = time.time() - max_age_s
+        with self._lock:
+            stale = [row[0] for row in self._db.execute(
+                "SELECT session_id FROM sessions WHERE updated_at < ?", (cutoff,)
+            )]
+        for session_id in stale:
+            self.delete(session_id)
+        return len(stale)
+
+# In-process stand-in with the same interface, for tests and single-worker runs
+class MemorySessionStore:
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def save(self, session_id, fields, appends, rewrites):
+        with self._lock:
+            stored = self._sessions.setdefault(session_id, {"fields": {}, "items": {}})
+            stored["fields"].update(fields)
+            for key, items in rewrites.items():
+                stored["items"][key] = list(items)
+            for key, (start, items) in appends.items():
+                stored["items"][key] = stored["items"].get(key, [])[:start] + list(items)
+
+    def load(self, session_id):
+        with self._lock:
+            stored = self._sessions.get(session_id)
+            if stored is None:
+                return None
+            state = {key: json.loads(value) for key, value in stored["fields"].items()}
+            for key in APPEND_ONLY_FIELDS:
+                state[key] = [json.loads(value) for value in stored["items"].get(key, [])]
+        return state
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+# Process-wide store shared by every session
+_store = None
+_store_lock = threading.Lock()
+
+# Function to get the configured session store, or None when persistence is off
+def get_session_store():
+    global _store
+    if SESSION_STORE_BACKEND == "none":
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if SESSION_STORE_BACKEND == "memory":
+                    _store = MemorySessionStore()
+                else:
+                    _store = SQLiteSessionStore()
+    return _store
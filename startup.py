@@ -0,0 +1,118 @@
+import importlib
+import os
+import threading
+import time
+
+# Heavy dependencies that are only imported on first use
+HEAVY_MODULES = [
+    "textblob",
+    "deep_translator",
+    "langdetect",
+    "nltk.stem.snowball",
+    "plotly.graph_objects",
+    "transformers",
+]
+
+# Set TALENTSCOUT_EAGER_IMPORTS=1 to import everything at startup like before
+EAGER_IMPORTS = os.environ.get("TALENTSCOUT_EAGER_IMPORTS", "0") == "1"
+# Set TALENTSCOUT_WARMUP=1 to preload models and corpora when the server boots
+WARMUP_ENABLED = os.environ.get("TALENTSCOUT_WARMUP", "0") == "1"
+
+# Proxy for a module that is imported the first time one of its attributes is used
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+# Proxy for a callable (function or class) inside a lazily imported module
+class LazyAttr:
+    def __init__(self, module_name, attr):
+        self._module = LazyModule(module_name)
+        self._attr = attr
+
+    def __call__(self, *args, **kwargs):
+        return getattr(self._module, self._attr)(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<LazyAttr {self._module._name}.{self._attr}>"
+
+# Function to get a module, lazily unless eager imports are enabled
+def lazy_module(name):
+    module = LazyModule(name)
+    if EAGER_IMPORTS:
+        module._load()
+    return module
+
+# Function to get a callable from a module, lazily unless eager imports are enabled
+def lazy_attr(module_name, attr):
+    proxy = LazyAttr(module_name, attr)
+    if EAGER_IMPORTS:
+        proxy._module._load()
+    return proxy
+
+# Warm-up state shared by the whole process
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+_ready = threading.Event()
+_warmup_timings = {}
+
+# Function to preload the LLM, sentiment lexicon, langdetect profiles and prompt catalog
+def _warmup(model_name):
+    steps = [
+        ("imports", lambda: [importlib.import_module(name) for name in HEAVY_MODULES]),
+        ("sentiment", lambda: importlib.import_module("sentiment_engine").polarity("Warm up the lexicon, great!")),
+        ("langdetect", lambda: importlib.import_module("langdetect").detect("Warm up the language profiles.")),
+        ("prompt_catalog", lambda: importlib.import_module("prompt_catalog").get_prompt_catalog()),
+        ("model", lambda: importlib.import_module("model_registry").get_model(model_name)),
+    ]
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+            _warmup_timings[name] = time.perf_counter() - start
+        except Exception as e:
+            _warmup_timings[name] = None
+            print(f"Warning: warm-up step '{name}' failed: {e}")
+    _ready.set()
+
+# Function to start the background warm-up once per process
+def start_warmup(model_name="distilgpt2"):
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(
+                target=_warmup,
+                args=(model_name,),
+                name="talentscout-warmup",
+                daemon=True
+            )
+            _warmup_thread.start()
+    return _warmup_thread
+
+# Function to check whether the background warm-up has finished
+def is_ready():
+    return _ready.is_set()
+
+# Function to block until warm-up finishes (returns False on timeout)
+def wait_until_ready(timeout=None):
+    return _ready.wait(timeout)
+
+# Function to report warm-up progress and per-step timings in seconds
+def warmup_status():
+    return {
+        "started": _warmup_thread is not None,
+        "ready": _ready.is_set(),
+        "timings": dict(_warmup_timings),
+    }
@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# No network, model, disk caches or shared databases
+_scratch = tempfile.mkdtemp(prefix="talentscout-test-")
+os.environ.setdefault("TALENTSCOUT_TRANSLATOR", "stub")
+os.environ.setdefault("TALENTSCOUT_TRANSLATION_CACHE", "")
+os.environ.setdefault("TALENTSCOUT_PROMPT_CATALOG", "")
+os.environ.setdefault("TALENTSCOUT_QUESTION_POOL", "0")
+os.environ.setdefault("TALENTSCOUT_SESSION_STORE", "memory")
+os.environ.setdefault("TALENTSCOUT_SEARCH_INDEX", "none")
+os.environ.setdefault("TALENTSCOUT_TRANSCRIPT_DIR", os.path.join(_scratch, "chat_store"))
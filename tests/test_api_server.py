@@ -0,0 +1,100 @@
+import asyncio
+
+import tornado.httpclient
+import tornado.httpserver
+import tornado.testing
+import tornado.websocket
+
+import api_server
+import interview_session
+
+ANSWERS = [
+    "Hi there", "Ana Lopez", "ana@example.com", "+1 555 0100", "5 years",
+    "Software developer", "Madrid", "Python, SQL",
+    "First answer", "Second answer", "Third answer",
+    "Fourth answer", "Fifth answer", "Sixth answer",
+    "Nothing else, bye",
+]
+
+def test_turn_replies_after_messages_are_spilled(monkeypatch):
+    monkeypatch.setattr(interview_session, "MAX_LIVE_MESSAGES", 10)
+    monkeypatch.setattr(api_server, "get_model_handle", lambda *args, **kwargs: None)
+
+    async def run():
+        service = api_server.InterviewService(workers=1)
+        try:
+            created = await service.create()
+            entry = await service.get(created["session_id"])
+            replies = [await service.turn(entry, text) for text in ANSWERS]
+            return entry.interview, replies
+        finally:
+            service.shutdown()
+
+    interview, replies = asyncio.run(run())
+    assert interview.spilled_parts > 0
+    for text, result in zip(ANSWERS, replies):
+        roles = [message["role"] for message in result["messages"]]
+        assert roles[0] == "user" and result["messages"][0]["content"] == text
+        assert "assistant" in roles
+    assert replies[-1]["ended"]
+    assert "Thank you for taking the time" in replies[-1]["messages"][-1]["content"]
+
+# Function to try opening an interview WebSocket from a page on origin (None: the server's own host)
+async def open_socket(service, origin):
+    sock, port = tornado.testing.bind_unused_port()
+    server = tornado.httpserver.HTTPServer(api_server.make_app(service))
+    server.add_sockets([sock])
+    created = await service.create()
+    request = tornado.httpclient.HTTPRequest(
+        f"ws://127.0.0.1:{port}/sessions/{created['session_id']}/ws", headers={"Origin": origin or f"http://127.0.0.1:{port}"}
+    )
+    try:
+        connection = await tornado.websocket.websocket_connect(request)
+    except tornado.httpclient.HTTPClientError as e:
+        assert e.code == 403
+        return False
+    else:
+        connection.close()
+        return True
+    finally:
+        server.stop()
+
+def test_websocket_origin_allow_list(monkeypatch):
+    monkeypatch.setattr(api_server, "get_model_handle", lambda *args, **kwargs: None)
+    monkeypatch.setattr(api_server, "ALLOWED_ORIGINS", {"https://jobs.example.com"})
+
+    async def run():
+        service = api_server.InterviewService(workers=1)
+        try:
+            return [
+                await open_socket(service, origin)
+                for origin in ["https://evil.example.net", "https://jobs.example.com", None]
+            ]
+        finally:
+            service.shutdown()
+
+    assert asyncio.run(run()) == [False, True, True]
+
+def test_eviction_keeps_sessions_with_open_sockets(monkeypatch):
+    monkeypatch.setattr(api_server, "get_model_handle", lambda *args, **kwargs: None)
+    monkeypatch.setattr(api_server, "get_session_store", lambda: None)
+
+    async def run():
+        service = api_server.InterviewService(workers=1, max_sessions=2)
+        sock, port = tornado.testing.bind_unused_port()
+        server = tornado.httpserver.HTTPServer(api_server.make_app(service))
+        server.add_sockets([sock])
+        try:
+            pinned = (await service.create())["session_id"]
+            connection = await tornado.websocket.websocket_connect(f"ws://127.0.0.1:{port}/sessions/{pinned}/ws")
+            created = [(await service.create())["session_id"] for _ in range(3)]
+            # Bounded without a store, and the connected session is never dropped
+            kept = list(service._sessions)
+            connection.close()
+            return pinned, created, kept
+        finally:
+            server.stop()
+            service.shutdown()
+
+    pinned, created, kept = asyncio.run(run())
+    assert kept == [pinned, created[-1]]
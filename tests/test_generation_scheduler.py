@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+from generation_controls import GenerationTimeout
+from generation_scheduler import GenerationScheduler
+
+# Pipeline stand-in that records each batch and can be held before answering
+class RecordingModel:
+    def __init__(self):
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, prompts, batch_size=None, **kwargs):
+        self.batches.append(list(prompts))
+        self.started.set()
+        self.release.wait(5)
+        return [[{"generated_text": prompt + " ok?"}] for prompt in prompts]
+
+def test_timed_out_request_is_not_generated():
+    model = RecordingModel()
+    scheduler = GenerationScheduler(model, max_batch_size=1, max_wait_ms=1)
+    running = scheduler.submit("first")
+    model.started.wait(5)
+
+    with pytest.raises(GenerationTimeout):
+        scheduler.generate("late", timeout=0.05)
+    model.release.set()
+    assert running.result(5) == [{"generated_text": "first ok?"}]
+    assert scheduler.generate("next", timeout=5) == [{"generated_text": "next ok?"}]
+    assert model.batches == [["first"], ["next"]]
+    assert scheduler.get_metrics()["cancelled"] == 1
+
+def test_mismatched_settings_keep_their_place_in_the_queue():
+    model = RecordingModel()
+    scheduler = GenerationScheduler(model, max_batch_size=8, max_wait_ms=20)
+    futures = [scheduler.submit("busy")]
+    model.started.wait(5)
+    for prompt, tokens in [("a1", 10), ("b1", 20), ("a2", 10), ("b2", 20), ("a3", 10)]:
+        futures.append(scheduler.submit(prompt, max_new_tokens=tokens))
+    model.release.set()
+    for future in futures:
+        future.result(5)
+    assert model.batches == [["busy"], ["a1", "a2", "a3"], ["b1", "b2"]]
@@ -0,0 +1,47 @@
+import pytest
+
+from input_parsing import compile_exit_pattern, needs_language_detection, parse_email, parse_name, parse_phone
+
+@pytest.mark.parametrize("text, expected", [
+    ("ana@example.com", "ana@example.com"),
+    ("my email is Ana.Lopez+jobs@mail.example.co.uk.", "Ana.Lopez+jobs@mail.example.co.uk"),
+    ("write to x_y%z@sub-domain.io please", "x_y%z@sub-domain.io"),
+    ("ana@localhost", None),
+    ("ana@@example.com", None),
+    ("a@b.c", None),
+    ("no email here", None),
+])
+def test_parse_email(text, expected):
+    assert parse_email(text) == expected
+
+@pytest.mark.parametrize("text, expected", [
+    ("+1 (555) 010-0199", "+1 (555) 010-0199"),
+    ("call 555.010.0199 after 5", "555.010.0199"),
+    ("tel: 0034 612 345 678", "0034 612 345 678"),
+    ("+44 20 7946 0958 ext", "+44 20 7946 0958"),
+    # 7 to 15 digits only
+    ("123 456", None),
+    ("1234567890123456", None),
+    ("five five five", None),
+])
+def test_parse_phone(text, expected):
+    assert parse_phone(text) == expected
+
+def test_parse_name():
+    exit_pattern = compile_exit_pattern(["bye", "exit"])
+    assert parse_name("  Ana   Lopez ", exit_pattern) == "Ana Lopez"
+    assert parse_name("Bye!", exit_pattern) is None
+    assert parse_name("Byers Exitor", exit_pattern) == "Byers Exitor"
+    assert parse_name("   ") is None
+    assert parse_name("x" * 101) is None
+
+def test_exit_pattern_matches_whole_phrases_only():
+    exit_pattern = compile_exit_pattern(["bye", "exit", "that's all"])
+    assert exit_pattern.search("That's ALL, thanks")
+    assert exit_pattern.search("ok, bye.")
+    assert not exit_pattern.search("byebye")
+    assert not exit_pattern.search("exiting the loop")
+
+def test_short_inputs_skip_language_detection():
+    assert not needs_language_detection("  5 years  ")
+    assert needs_language_detection("Tengo cinco años de experiencia")
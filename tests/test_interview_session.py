@@ -0,0 +1,189 @@
+import interview_session
+import model_registry
+from interview_session import InterviewSession
+from prompt_catalog import PROMPTS
+
+POOL_QUESTION = "What does the pool know about Python?"
+LIVE_QUESTION = "What does the live model know about Python?"
+STREAMED_QUESTION = "What does the streamed model know about Python?"
+PREFETCHED_QUESTION = "What does the prefetched model know about Python?"
+
+class FakePool:
+    def __init__(self, questions=()):
+        self.questions = list(questions)
+
+    def draw(self, tech, exclude=()):
+        return self.questions.pop(0) if self.questions else None
+
+    def size(self, tech):
+        return len(self.questions)
+
+class FakePrefetch:
+    language = "en"
+
+    def __init__(self, tech):
+        self.tech = tech
+        self.cancelled = False
+
+    def matches(self, tech):
+        return tech == self.tech
+
+    def take(self):
+        return PREFETCHED_QUESTION, None
+
+    def cancel(self):
+        self.cancelled = True
+
+# Function to build a session waiting for its first Python question
+def technical_session(monkeypatch, pool=None, pool_enabled=True, streaming=False):
+    monkeypatch.setattr(interview_session, "QUESTION_POOL_ENABLED", pool_enabled)
+    monkeypatch.setattr(interview_session, "STREAMING_ENABLED", streaming)
+    monkeypatch.setattr(interview_session, "PREFETCH_ENABLED", False)
+    monkeypatch.setattr(interview_session, "generate_question_with_model", lambda model, tech: LIVE_QUESTION)
+    session = InterviewSession(model=object(), stream_question=lambda tech: STREAMED_QUESTION)
+    monkeypatch.setattr(session, "get_shared_question_pool", lambda: pool or FakePool())
+    session.stage = "technical_questions"
+    session.candidate_info["tech_stack"] = ["python", "sql"]
+    session.current_tech = "python"
+    return session
+
+def last_question(session):
+    return session.messages[-1].content.split(": ", 1)[1]
+
+def test_pool_hit_skips_the_model(monkeypatch):
+    session = technical_session(monkeypatch, pool=FakePool([POOL_QUESTION]))
+    session.ask_technical_questions()
+    assert last_question(session) == POOL_QUESTION
+
+def test_pool_miss_generates_live(monkeypatch):
+    session = technical_session(monkeypatch)
+    session.ask_technical_questions()
+    assert last_question(session) == LIVE_QUESTION
+
+def test_pool_miss_streams_when_enabled(monkeypatch):
+    session = technical_session(monkeypatch, streaming=True)
+    session.ask_technical_questions()
+    assert last_question(session) == STREAMED_QUESTION
+
+def test_pool_miss_uses_the_prefetched_question(monkeypatch):
+    session = technical_session(monkeypatch)
+    session.question_prefetch = FakePrefetch("python")
+    session.ask_technical_questions()
+    assert last_question(session) == PREFETCHED_QUESTION
+
+def test_pool_disabled_generates_live(monkeypatch):
+    session = technical_session(monkeypatch, pool=FakePool([POOL_QUESTION]), pool_enabled=False)
+    session.ask_technical_questions()
+    assert last_question(session) == LIVE_QUESTION
+
+def test_prefetch_runs_only_when_the_pool_is_low(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(
+        interview_session, "prefetch_question", lambda generate, tech, language: scheduled.append(tech) or FakePrefetch(tech)
+    )
+    stocked = FakePool([POOL_QUESTION] * interview_session.POOL_LOW_WATERMARK)
+    session = technical_session(monkeypatch, pool=stocked)
+    monkeypatch.setattr(interview_session, "PREFETCH_ENABLED", True)
+    session.schedule_question_prefetch()
+    assert scheduled == []
+
+    session = technical_session(monkeypatch)
+    monkeypatch.setattr(interview_session, "PREFETCH_ENABLED", True)
+    session.schedule_question_prefetch()
+    assert scheduled == ["python"]
+
+PROFILE = ["Hi there", "Ana Lopez", "ana@example.com", "+1 555 0100", "5 years", "Software developer", "Madrid"]
+
+# Function to walk a session without a model up to the tech stack question
+def session_at_tech_stack():
+    session = InterviewSession()
+    session.greet()
+    for text in PROFILE:
+        session.process_user_input(text)
+    assert session.stage == "tech_stack"
+    return session
+
+def test_exit_words_inside_other_words_do_not_end_the_interview():
+    session = session_at_tech_stack()
+    session.process_user_input("Python, Frontend, Backend")
+    assert session.stage == "technical_questions" and not session.conversation_ended
+
+    for answer in ["I profile the endpoints first", "Byte buffers and quitting workers cleanly", "Exiting threads is the hard part"]:
+        session.process_user_input(answer)
+        assert not session.conversation_ended, answer
+
+def test_exit_phrase_ends_the_interview():
+    session = session_at_tech_stack()
+    session.process_user_input("Python")
+    session.process_user_input("That's all from me, bye")
+    assert session.conversation_ended
+
+def test_lazy_handle_whose_load_failed_counts_as_no_model(monkeypatch):
+    def fail(name, max_length):
+        raise OSError("no weights")
+
+    model_registry.unload_model("test-model")
+    handle = model_registry.get_model_handle("test-model", lazy=True)
+    assert handle is not None and interview_session.model_available(handle)
+    model_registry.get_model("test-model", loader=fail)
+    assert not interview_session.model_available(handle)
+    assert model_registry.get_model_handle("test-model", lazy=True) is None
+
+    session = technical_session(monkeypatch, pool=FakePool([POOL_QUESTION]))
+    session.model = handle
+    session.ask_technical_questions()
+    assert last_question(session) in interview_session.get_question_bank().texts
+    model_registry.unload_model("test-model")
+
+def test_field_stages_record_each_answer_in_order():
+    session = InterviewSession()
+    session.greet()
+    stages = [session.stage]
+    for text in PROFILE:
+        session.process_user_input(text)
+        stages.append(session.stage)
+
+    assert stages == list(interview_session.STAGE_ORDER[:len(stages)])
+    assert session.candidate_info == {
+        "name": "Ana Lopez", "email": "ana@example.com", "phone": "+1 555 0100", "experience": "5 years",
+        "position": "Software developer", "location": "Madrid", "tech_stack": [],
+    }
+
+def test_invalid_field_is_asked_again():
+    session = InterviewSession()
+    session.greet()
+    session.process_user_input("Hi there")
+    session.process_user_input("Ana Lopez")
+    session.process_user_input("not an email")
+    assert session.stage == "email" and session.candidate_info["email"] == ""
+    assert "doesn't look like a valid email" in session.messages[-1].content
+
+def test_technical_stages_walk_every_technology_then_wrap_up():
+    session = session_at_tech_stack()
+    session.process_user_input("Python, SQL")
+    assert session.stage == "technical_questions" and session.current_tech == "python"
+
+    for _ in range(interview_session.QUESTIONS_PER_TECH):
+        session.process_user_input("An answer")
+    assert session.stage == "technical_questions" and session.current_tech == "sql"
+
+    for _ in range(interview_session.QUESTIONS_PER_TECH):
+        session.process_user_input("An answer")
+    assert session.stage == "wrap_up"
+    assert session.messages[-1].content.strip().startswith("Thank you for answering the technical questions, Ana Lopez!")
+
+    session.process_user_input("No questions from me")
+    assert session.conversation_ended
+    assert "ana@example.com" in session.messages[-1].content
+
+def test_unknown_tech_stack_goes_straight_to_wrap_up():
+    session = session_at_tech_stack()
+    session.process_user_input("Quantum basket weaving")
+    assert session.stage == "wrap_up"
+    assert session.messages[-1].content == PROMPTS["general_technical_question"]
+
+def test_unknown_stage_falls_back():
+    session = session_at_tech_stack()
+    session.stage = "something_else"
+    session.process_user_input("Hello?")
+    assert session.messages[-1].content in interview_session.FALLBACK_RESPONSES
@@ -0,0 +1,60 @@
+import threading
+
+from prompt_catalog import PROMPTS, PromptCatalog, protect_placeholders, restore_placeholders, translate_template
+
+# Translator that waits until the test lets it answer
+class SlowTranslator:
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self, text, source, target):
+        self.calls += 1
+        self.release.wait(5)
+        return f"[{target}] {text}"
+
+def test_catalog_miss_serves_english_and_fills_in_the_background(tmp_path):
+    translate = SlowTranslator()
+    catalog = PromptCatalog(str(tmp_path / "catalog.json"), translate=translate)
+
+    # The translator is blocked, so this only returns because the miss path doesn't wait for it
+    assert catalog.render("ask_email", "es", name="Ana") == "Nice to meet you, Ana! Could you please provide your email address?"
+    assert catalog.fill_missing(["es"]) == []
+
+    translate.release.set()
+    catalog._filling["es"].join(5)
+    assert catalog.render("ask_email", "es", name="Ana").startswith("[es] Nice to meet you, Ana!")
+    assert catalog.missing("es") == []
+
+    reloaded = PromptCatalog(str(tmp_path / "catalog.json"), translate=translate)
+    assert reloaded.missing("es") == []
+    assert list(tmp_path.iterdir()) == [tmp_path / "catalog.json"]
+
+def test_failed_translations_are_left_for_a_later_fill(tmp_path):
+    catalog = PromptCatalog(str(tmp_path / "catalog.json"), translate=lambda text, source, target: None)
+    for thread in catalog.fill_missing(["fr"]):
+        thread.join(5)
+    assert catalog.missing("fr") == list(catalog._english)
+    assert not (tmp_path / "catalog.json").exists()
+
+def test_placeholders_survive_translation_as_tokens():
+    protected, names = protect_placeholders("Hi {name}, we will write to {email}. Bye {name}!")
+    assert protected == "Hi __PH0__, we will write to __PH1__. Bye __PH0__!"
+    assert names == ["name", "email"]
+    assert "{" not in protected
+
+    # Translators move tokens around and change their spacing or case
+    restored = restore_placeholders("Hola __ ph0 __, ¡adiós __PH0__! Correo: __PH1__", names)
+    assert restored == "Hola {name}, ¡adiós {name}! Correo: {email}"
+    assert restored.format(name="Ana", email="ana@example.com") == "Hola Ana, ¡adiós Ana! Correo: ana@example.com"
+
+def test_lost_placeholders_reject_the_translation():
+    _, names = protect_placeholders(PROMPTS["farewell"])
+    assert names == ["name", "email", "phone"]
+    assert restore_placeholders("Gracias __PH0__, te escribiremos a __PH1__", names) is None
+    assert translate_template(PROMPTS["farewell"], "es", translate=lambda text, source, target: "Gracias") is None
+
+def test_braces_added_by_the_translator_are_kept_literally():
+    translated = translate_template("About {tech}: {question}", "es", translate=lambda text, source, target: "{Sobre} __PH0__: __PH1__")
+    assert translated == "{{Sobre}} {tech}: {question}"
+    assert translated.format(tech="Go", question="¿Qué es una goroutine?") == "{Sobre} Go: ¿Qué es una goroutine?"
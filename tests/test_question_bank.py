@@ -0,0 +1,79 @@
+import json
+import math
+import random
+
+import pytest
+
+from question_bank import QuestionBank, _stride, compile_bank, normalize
+
+BANK = {"technologies": {
+    "python": {"name": "Python", "aliases": ["py"], "questions": [
+        {"text": f"Python easy {number}", "difficulty": "easy"} for number in range(7)
+    ] + [{"text": f"Python hard {number}", "difficulty": "hard"} for number in range(2)]},
+    "javascript": {"name": "JavaScript", "aliases": ["js", "ecmascript"], "questions": ["What is a closure?"]},
+    "nodejs": {"name": "Node.js", "aliases": ["node", "express"], "questions": ["What is the event loop?"]},
+    "postgresql": {"name": "PostgreSQL", "aliases": ["postgres"], "questions": ["What is MVCC?"]},
+    "html": {"name": "HTML", "questions": ["What is semantic HTML?"]},
+    "css": {"name": "CSS", "questions": ["What is specificity?"]},
+    "go": {"name": "Go", "aliases": ["golang"], "questions": ["What is a goroutine?"]},
+}}
+
+@pytest.fixture
+def bank():
+    return QuestionBank.from_dict(BANK)
+
+def test_names_and_aliases_resolve(bank):
+    assert normalize("Node.js") == normalize("node js") == "nodejs"
+    assert bank.resolve_stack("Node.js, JS; Postgres and Python") == ["nodejs", "javascript", "postgresql", "python"]
+    assert bank.resolve_stack("I mostly use express with HTML/CSS") == ["nodejs", "html", "css"]
+    assert bank.resolve_stack("py, Python, PYTHON") == ["python"]
+    assert bank.display_name("nodejs") == "Node.js"
+
+def test_unknown_technologies_are_kept_as_written(bank):
+    assert bank.resolve_stack("Python, COBOL") == ["python", "cobol"]
+    assert bank.resolve_stack(" , ;") == []
+
+def test_misspellings_match_by_trigrams(bank):
+    assert bank.resolve("Javascipt") == "javascript"
+    assert bank.resolve("Postgress") == "postgresql"
+    assert bank.resolve("Pythn") == "python"
+    assert bank.resolve("expres") == "nodejs"
+    # Short names must match exactly
+    assert bank.resolve("ga") is None
+    assert bank.resolve("Haskell") is None
+
+def test_draw_visits_every_question_once(bank):
+    random.seed(7)
+    cursors = {}
+    drawn = [bank.draw("python", cursors, number=0) for _ in range(9)]
+    # Easy ones first, then the nearest other difficulty
+    assert sorted(drawn[:7]) == [f"Python easy {number}" for number in range(7)]
+    assert sorted(drawn[7:]) == ["Python hard 0", "Python hard 1"]
+    assert bank.draw("python", cursors) is None
+
+def test_draw_starts_at_the_difficulty_for_the_question_number(bank):
+    assert bank.draw("python", {}, number=2).startswith("Python hard")
+    # No medium questions: the easier of the nearest difficulties is used
+    assert bank.draw("python", {}, number=1).startswith("Python easy")
+
+def test_draw_skips_excluded_questions(bank):
+    cursors = {}
+    excluded = {f"Python easy {number}" for number in range(6)}
+    assert bank.draw("python", cursors, exclude=excluded) == "Python easy 6"
+
+def test_stride_is_coprime_with_the_range():
+    random.seed(3)
+    for size in range(1, 60):
+        stride = _stride(size)
+        assert 1 <= stride < max(size, 2) and math.gcd(stride, size) == 1
+        assert len({(stride * step) % size for step in range(size)}) == size
+
+def test_compiled_bank_matches_the_json(tmp_path, bank):
+    source = tmp_path / "bank.json"
+    source.write_text(json.dumps(BANK))
+    compile_bank(str(source), str(tmp_path / "bank.json.bin"))
+    mapped = QuestionBank.load(str(source), use_mmap=True)
+    assert mapped.techs == bank.techs
+    assert mapped.aliases == bank.aliases
+    assert [mapped.texts[index] for index in range(len(mapped))] == list(bank.texts)
+    assert mapped.resolve_stack("node, postgress") == ["nodejs", "postgresql"]
@@ -0,0 +1,25 @@
+import json
+
+from question_pool import QuestionPool
+
+# Function to build a pool with a fixed list of questions to "generate"
+def make_pool(path, questions):
+    questions = list(questions)
+    return QuestionPool(lambda tech: questions.pop(0) if questions else None, ["python"], path=str(path), low_watermark=0, target_size=10)
+
+def test_processes_sharing_the_pool_file_merge_their_saves(tmp_path):
+    path = tmp_path / "pool.json"
+    first = make_pool(path, ["Q1?", "Q2?"])
+    second = make_pool(path, ["Q3?"])
+
+    first.fill("python", 2)
+    first.save()
+    second.fill("python", 1)
+    second.save()
+    assert sorted(json.loads(path.read_text())["python"]) == ["Q1?", "Q2?", "Q3?"]
+
+    # A question drawn by one process is not brought back by the merge
+    assert first.draw("python") == "Q1?"
+    first.save()
+    assert sorted(json.loads(path.read_text())["python"]) == ["Q2?", "Q3?"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["pool.json", "pool.json.lock"]
@@ -0,0 +1,38 @@
+import pytest
+
+TextBlob = pytest.importorskip("textblob").TextBlob
+
+from sentiment_engine import analyze, categorize, polarity, score_batch
+
+TEXTS = [
+    "",
+    "I love working with Python!",
+    "This is not good at all",
+    "Not bad, actually",
+    "It was very very good!!!",
+    "I'm extremely unhappy with the deadlines :(",
+    "Great :-) really great :)",
+    "Oh sure, that was a brilliant idea (!)",
+    "I have 5 years of experience with ci/cd and node.js",
+    "Das ist sehr gut, merci beaucoup",
+    "The build was slow, the tests were flaky, but the team was amazing",
+    "never ever again",
+    "GOOD GOOD GOOD",
+    "a b c good",
+]
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_polarity_matches_textblob(text):
+    assert polarity(text) == pytest.approx(TextBlob(text).sentiment.polarity, abs=1e-12)
+
+def test_batch_matches_textblob_and_keeps_the_input_order():
+    texts = TEXTS + TEXTS[::-1]
+    scores, categories = score_batch(texts)
+    expected = [TextBlob(text).sentiment.polarity for text in texts]
+    assert scores.tolist() == pytest.approx(expected, abs=1e-12)
+    assert categories.tolist() == [analyze(text)[0] for text in texts]
+
+def test_categories_use_the_interview_thresholds():
+    assert categorize([0.31, 0.3, -0.3, -0.31]).tolist() == ["positive", "neutral", "neutral", "negative"]
+    assert analyze("I love working with Python!")[0] == "positive"
+    assert score_batch([])[0].tolist() == []
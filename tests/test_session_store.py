@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+import session_store
+from interview_session import InterviewSession
+from session_store import MemorySessionStore, SessionSnapshot, SQLiteSessionStore
+
+# Function to persist a state the way the app does after each turn
+def persist(store, snapshot, session_id, state):
+    fields, appends, rewrites = snapshot.diff(state)
+    store.save(session_id, fields, appends, rewrites)
+    snapshot.mark_saved(state)
+    return fields, appends, rewrites
+
+def test_snapshot_writes_only_what_changed():
+    snapshot = SessionSnapshot()
+    state = {"stage": "name", "candidate_info": {}, "messages": ["hello"]}
+    fields, appends, rewrites = snapshot.diff(state)
+    assert set(fields) == {"stage", "candidate_info"}
+    assert appends == {"messages": (0, ['"hello"'])}
+    snapshot.mark_saved(state)
+
+    assert snapshot.diff(state) == ({}, {}, {})
+
+    state["candidate_info"] = {"name": "Ana"}
+    state["messages"].append("nice to meet you")
+    fields, appends, rewrites = snapshot.diff(state)
+    assert list(fields) == ["candidate_info"]
+    assert appends == {"messages": (1, ['"nice to meet you"'])}
+    assert rewrites == {}
+
+def test_snapshot_rewrites_lists_edited_in_place_or_trimmed():
+    snapshot = SessionSnapshot()
+    state = {"messages": ["a", "b", "c"]}
+    snapshot.mark_saved(state)
+
+    state["messages"][-1] = "C"
+    assert snapshot.diff(state) == ({}, {}, {"messages": ['"a"', '"b"', '"C"']})
+
+    # Old messages moved to the transcript store
+    state["messages"] = ["c"]
+    assert snapshot.diff(state)[2] == {"messages": ['"c"']}
+
+@pytest.mark.parametrize("make_store", [
+    lambda tmp_path: SQLiteSessionStore(str(tmp_path / "sessions.db")),
+    lambda tmp_path: MemorySessionStore(),
+])
+def test_store_rebuilds_the_saved_state(tmp_path, make_store):
+    store = make_store(tmp_path)
+    snapshot = SessionSnapshot()
+    state = {"stage": "email", "candidate_info": {"name": "Ana"}, "messages": ["a", "b"], "questions_asked": []}
+    persist(store, snapshot, "s1", state)
+    state["messages"].append("c")
+    state["stage"] = "phone"
+    persist(store, snapshot, "s1", state)
+    state["messages"] = ["c", "d"]
+    persist(store, snapshot, "s1", state)
+    state["messages"].append("e")
+    persist(store, snapshot, "s1", state)
+
+    loaded = store.load("s1")
+    assert loaded["stage"] == "phone"
+    assert loaded["candidate_info"] == {"name": "Ana"}
+    assert loaded["messages"] == ["c", "d", "e"]
+    assert loaded["sentiment_history"] == [] and loaded["questions_asked"] == []
+    assert store.load("other") is None
+
+    store.delete("s1")
+    assert store.load("s1") is None
+
+def test_interview_survives_another_worker(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    session = InterviewSession()
+    session.greet()
+    for text in ["Hi there", "Ana Lopez", "ana@example.com"]:
+        session.process_user_input(text)
+    persist(SQLiteSessionStore(path), SessionSnapshot(), session.session_id, session.to_state())
+
+    # A different process opens the same database
+    restored = InterviewSession.from_state(SQLiteSessionStore(path).load(session.session_id))
+    assert restored.stage == session.stage == "phone"
+    assert restored.candidate_info == session.candidate_info
+    assert [message.to_dict() for message in restored.messages] == [message.to_dict() for message in session.messages]
+
+    restored.process_user_input("+1 555 0100")
+    assert restored.candidate_info["phone"] == "+1 555 0100"
+
+def test_prune_drops_idle_sessions(tmp_path, monkeypatch):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    clock = SimpleNamespace(time=lambda: 1000.0)
+    monkeypatch.setattr(session_store, "time", clock)
+    persist(store, SessionSnapshot(), "old", {"stage": "name"})
+    clock.time = lambda: 5000.0
+    persist(store, SessionSnapshot(), "new", {"stage": "name"})
+    assert store.prune(3600) == 1
+    assert store.load("old") is None and store.load("new") is not None
@@ -0,0 +1,93 @@
+import gzip
+import json
+import os
+from functools import partial
+
+import pytest
+
+import transcript_analytics
+from transcript_analytics import analyze_entries, build_report, entry_batches, final_stage, run_pool
+from transcript_store import SegmentTranscriptStore
+
+# Function to build a saved interview that ended at stage
+def transcript(stage, tech_stack=("python",)):
+    return {
+        "stage": stage,
+        "candidate_info": {"name": "Ana", "tech_stack": list(tech_stack)},
+        "messages": [
+            {"role": "assistant", "content": "What is a generator?"},
+            {"role": "user", "content": "A lazy iterator", "stage": "technical_questions",
+             "sentiment": {"category": "neutral", "score": 0.0}},
+        ],
+    }
+
+# Function to report over the store the way the command line does
+def report_for(store):
+    return run_pool(partial(analyze_entries, directory=store.directory), entry_batches(store, size=2), workers=1)
+
+def test_report_reads_only_what_the_index_committed(tmp_path):
+    store = SegmentTranscriptStore(str(tmp_path), compression="gzip")
+    store.save("a", transcript("tech_stack"))
+    store.save("b", transcript("technical_questions", ["sql"]))
+    store.save("c", transcript("technical_questions"))
+    # A re-save supersedes the first record of "a"
+    store.save("a", transcript("conversation_ended"))
+    segment = os.path.join(store.directory, store.index()["a"]["segment"])
+    with open(segment, "ab") as f:
+        # A writer died after appending its record but before indexing it, and another mid-record
+        f.write(gzip.compress((json.dumps(dict(transcript("email"), session_id="lost")) + "\n").encode()))
+        f.write(gzip.compress(b'{"session_id": "torn"}\n')[:12])
+
+    report = report_for(store)
+    assert report.transcripts == 3
+    assert report.final_stages == {"conversation_ended": 1, "technical_questions": 2}
+    assert report.tech == {"python": 2, "sql": 1}
+    assert report.answers == {"What is a generator?": [3, 9, 3]}
+
+def test_report_reads_segments_of_every_compression(tmp_path):
+    pytest.importorskip("zstandard")
+    SegmentTranscriptStore(str(tmp_path), compression="zstd").save("old", transcript("technical_questions"))
+    store = SegmentTranscriptStore(str(tmp_path), compression="gzip")
+    store.save("new", transcript("conversation_ended"))
+
+    assert store.load("old")["session_id"] == "old"
+    report = report_for(store)
+    assert report.final_stages == {"technical_questions": 1, "conversation_ended": 1}
+
+def test_reports_merge_into_the_same_totals():
+    transcripts = [
+        dict(transcript("technical_questions"), language="es"),
+        transcript("conversation_ended", ["python", "sql"]),
+        transcript("email", []),
+        # Spilled parts are already in the final transcript
+        dict(transcript("technical_questions"), part_of="x"),
+    ]
+    whole = build_report(transcripts)
+    merged = build_report(transcripts[:2]).merge(build_report(transcripts[2:]))
+    assert merged.to_dict() == whole.to_dict()
+
+    data = whole.to_dict()
+    assert data["transcripts"] == 3
+    assert data["languages"] == {"en": 2, "es": 1}
+    assert data["tech_stack"] == {"python": 2, "sql": 1}
+    assert data["sentiment"]["messages"] == 3 and data["sentiment"]["mean"] == 0.0
+    assert data["answers"] == [{"question": "What is a generator?", "answers": 3, "mean_words": 3.0, "max_words": 3}]
+
+def test_funnel_counts_where_interviews_stopped():
+    report = build_report([transcript("email", []), transcript("email", []), transcript("technical_questions")])
+    funnel = {stage: (reached, ended) for stage, reached, ended in report.funnel()}
+    assert funnel["greeting"] == (3, 0)
+    assert funnel["email"] == (3, 2)
+    assert funnel["phone"] == (1, 0)
+    assert funnel["technical_questions"] == (1, 1)
+    assert funnel["wrap_up"] == (0, 0)
+
+def test_final_stage_of_transcripts_without_one():
+    assert final_stage({"candidate_info": {}}) == "greeting"
+    assert final_stage({"candidate_info": {"name": "Ana", "email": "ana@example.com"}}) == "phone"
+    assert final_stage({"candidate_info": {"name": "Ana", "tech_stack": ["python"]}}) == "technical_questions"
+
+def test_distinct_keys_are_capped(monkeypatch):
+    monkeypatch.setattr(transcript_analytics, "MAX_DISTINCT", 2)
+    report = build_report([transcript("technical_questions", ["go", "rust", "zig", "nim"])])
+    assert report.tech == {"go": 1, "rust": 1, "(other)": 2}
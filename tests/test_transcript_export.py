@@ -0,0 +1,75 @@
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip("pyarrow")
+import pyarrow.dataset as ds
+
+from transcript_export import export, load_state
+from transcript_store import SegmentTranscriptStore
+
+# Function to build a saved interview with one scored answer
+def transcript(saved_at, language="en"):
+    return {
+        "saved_at": saved_at,
+        "language": language,
+        "stage": "technical_questions",
+        "candidate_info": {"name": "Ana Lopez", "email": "ana@example.com", "tech_stack": ["python"]},
+        "messages": [
+            {"role": "assistant", "content": "What is a generator?"},
+            {"role": "user", "content": "A lazy iterator", "stage": "technical_questions",
+             "sentiment": {"category": "neutral", "score": 0.0}},
+        ],
+        "sentiment_history": [[1, 0.0]],
+    }
+
+# Function to read one exported table
+def read(output, table):
+    return ds.dataset(os.path.join(output, table), partitioning="hive").to_table()
+
+def test_export_only_appends_new_transcripts(tmp_path):
+    store = SegmentTranscriptStore(str(tmp_path / "store"), compression="gzip")
+    output = str(tmp_path / "export")
+    store.save("a", transcript("2024-05-01T10:00:00"))
+    store.save("b", transcript("2024-05-02T10:00:00", "es"))
+    assert export(store, output) == 2
+    first_offset = load_state(output)["index_offset"]
+    assert first_offset == os.path.getsize(store.index_path)
+
+    # Nothing new: nothing is written
+    parts = sorted(p for _, _, files in os.walk(output) for p in files)
+    assert export(store, output) == 2
+    assert sorted(p for _, _, files in os.walk(output) for p in files) == parts
+
+    store.save("c", transcript("2024-05-02T11:00:00", "es"))
+    store.save("c-part1", dict(transcript("2024-05-02T11:00:00", "es"), part_of="c"))
+    assert export(store, output) == 3
+    new_parts = {p for _, _, files in os.walk(output) for p in files} - set(parts)
+    assert new_parts == {f"part-{first_offset:012d}-{os.path.getsize(store.index_path):012d}.parquet"}
+
+    sessions = read(output, "sessions")
+    assert sorted(sessions.column("session_id").to_pylist()) == ["a", "b", "c"]
+    assert "name" not in sessions.column_names and "email" not in sessions.column_names
+    assert read(output, "messages").num_rows == 6
+    assert read(output, "sentiment").num_rows == 3
+    assert sorted(str(value) for value in sessions.column("language").to_pylist()) == ["en", "es", "es"]
+
+def test_parts_from_an_interrupted_run_are_replaced(tmp_path):
+    store = SegmentTranscriptStore(str(tmp_path / "store"), compression="gzip")
+    output = str(tmp_path / "export")
+    for number in range(3):
+        store.save(f"s{number}", transcript("2024-05-01T10:00:00"))
+    # One transcript per part file, so the state moves forward after each
+    assert export(store, output, batch_rows=1) == 3
+
+    # A crashed run wrote a part after the saved offset but never saved its state
+    offset = load_state(output)["index_offset"]
+    store.save("s3", transcript("2024-05-01T10:00:00"))
+    partition = os.path.join(output, "sessions", "date=2024-05-01", "language=en")
+    stray = os.path.join(partition, f"part-{offset:012d}-999999999999.parquet")
+    shutil.copy(os.path.join(partition, sorted(os.listdir(partition))[0]), stray)
+
+    assert export(store, output) == 4
+    assert not os.path.exists(stray)
+    assert sorted(read(output, "sessions").column("session_id").to_pylist()) == ["s0", "s1", "s2", "s3"]
@@ -0,0 +1,89 @@
+from transcript_search import SearchIndex, candidate_messages, matching_lines
+
+# Function to build a saved interview as the transcript store returns it
+def interview(answers, **info):
+    info.setdefault("tech_stack", ["python"])
+    return {
+        "candidate_info": info,
+        "messages": [{"role": "user", "content": answer} for answer in answers],
+    }
+
+def test_contact_details_are_not_indexed_without_stages(tmp_path):
+    # Older transcripts have no per-message "stage"
+    data = interview(
+        ["Hi", "Ana Lopez", "You can write to ANA.LOPEZ@example.com", "Call me on 555 010 0199", "I build Django apps"],
+        name="Ana Lopez", email="ana.lopez@example.com", phone="555 010 0199",
+    )
+    assert [message["content"] for message in candidate_messages(data)] == ["Hi", "Ana Lopez", "I build Django apps"]
+
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.add("s1", data)
+    assert index.search("django")
+    assert index.search("example.com") == []
+    assert index.search("0199") == []
+
+def test_contact_values_are_dropped_even_when_unparsed():
+    data = interview(["reach me at ana at example dot com"], email="ana at example dot com")
+    assert candidate_messages(data) == []
+
+def test_filters_match_wildcards_literally(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.add("s1", interview(["Python services"], location="Madrid", tech_stack=["python"]))
+    index.add("s2", interview(["Python services"], location="Ma_drid 100%", tech_stack=["c_"]))
+
+    assert [hit["session_id"] for hit in index.search("python", location="Ma_drid")] == ["s2"]
+    assert [hit["session_id"] for hit in index.search("python", location="100%")] == ["s2"]
+    assert [hit["session_id"] for hit in index.search("python", location="%")] == ["s2"]
+    assert index.search("python", tech="_") == []
+    assert [hit["session_id"] for hit in index.search("python", tech="c_")] == ["s2"]
+
+# Function to list the session IDs a query finds, best first
+def hits(index, query, **filters):
+    return [hit["session_id"] for hit in index.search(query, **filters)]
+
+def test_bm25_ranks_frequent_and_rare_terms_higher(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.add("once", interview(["I used Kubernetes at work", "Mostly Python services"]))
+    index.add("often", interview(["Kubernetes clusters, Kubernetes operators", "Kubernetes upgrades too"]))
+    index.add("none", interview(["Python services and SQL reports"]))
+
+    assert hits(index, "kubernetes") == ["often", "once"]
+    # Both terms beat one, and three mentions of a term beat one
+    assert hits(index, "services kubernetes") == ["once", "often", "none"]
+    # Stemmed: "cluster" finds "clusters"
+    assert hits(index, "cluster") == ["often"]
+
+def test_phrases_must_match_word_for_word(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.add("phrase", interview(["I ran a Kubernetes cluster on bare metal"]))
+    index.add("apart", interview(["A cluster of Kubernetes nodes"]))
+    index.add("split", interview(["I know Kubernetes", "Cluster sizing is hard"]))
+
+    assert hits(index, '"kubernetes cluster"') == ["phrase"]
+    assert sorted(hits(index, "kubernetes cluster")) == ["apart", "phrase", "split"]
+    # Words outside the phrase only add to the score
+    assert hits(index, '"kubernetes cluster" metal') == ["phrase"]
+
+def test_reindexing_replaces_a_session(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.add("s1", interview(["I like Rust"]))
+    index.add("s1", interview(["I like Go"]))
+    assert hits(index, "rust") == []
+    assert hits(index, "go") == ["s1"]
+    assert len(index) == 1
+
+def test_filters_alone_list_recent_interviews(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.add("junior", interview(["Python"], experience="1 year", location="Madrid"))
+    index.add("senior", interview(["Python"], experience="7 years", location="Madrid"))
+    index.add("remote", interview(["Python"], experience="10 years", location="Lisbon"))
+
+    assert hits(index, "", location="madrid") == ["senior", "junior"]
+    assert hits(index, "", min_experience=5) == ["remote", "senior"]
+    assert hits(index, "") == []
+
+def test_matching_lines_show_the_answers_that_matched():
+    data = interview(["I deploy with Terraform", "Python mostly", "Terraform modules " + "x" * 200])
+    lines = matching_lines(data, "terraform")
+    assert lines[0] == "I deploy with Terraform"
+    assert len(lines) == 2 and lines[1].endswith("…") and len(lines[1]) == 160
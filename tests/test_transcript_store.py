@@ -0,0 +1,73 @@
+import json
+import os
+
+from transcript_store import FileTranscriptStore, SegmentTranscriptStore, migrate_files
+
+def test_save_and_load_round_trip(tmp_path):
+    store = SegmentTranscriptStore(str(tmp_path), compression="gzip")
+    store.save("a", {"messages": [{"role": "user", "content": "¿Qué tal? 👋"}]})
+    store.save("b", {"messages": []})
+    store.save("a", {"messages": [], "stage": "conversation_ended"})
+
+    assert store.load("a")["stage"] == "conversation_ended"
+    assert store.load("b")["session_id"] == "b"
+    assert store.load("missing") is None
+    assert [data["session_id"] for data in store.iter_sessions()] == ["a", "b"]
+
+    # Another process appending to the same directory is picked up
+    other = SegmentTranscriptStore(str(tmp_path), compression="gzip")
+    other.save("c", {"messages": []})
+    assert "c" in store
+
+def test_segments_rotate_at_the_size_limit(tmp_path):
+    store = SegmentTranscriptStore(str(tmp_path), compression="gzip", segment_max_bytes=1)
+    for number in range(3):
+        store.save(f"s{number}", {"messages": []})
+    assert sorted(entry["segment"] for entry in store.index().values()) == [
+        "segment-000001.jsonl.gz", "segment-000002.jsonl.gz", "segment-000003.jsonl.gz"
+    ]
+    assert store.load("s2")["session_id"] == "s2"
+
+def test_torn_appends_are_never_read(tmp_path):
+    store = SegmentTranscriptStore(str(tmp_path), compression="gzip")
+    store.save("a", {"messages": []})
+    segment = os.path.join(str(tmp_path), store.index()["a"]["segment"])
+    with open(segment, "ab") as f:
+        f.write(b"\x1f\x8b half a record")
+    with open(store.index_path, "ab") as f:
+        f.write(b'{"session_id": "torn", "segment"')
+
+    reopened = SegmentTranscriptStore(str(tmp_path), compression="gzip")
+    assert list(reopened.index()) == ["a"]
+    assert [entry["session_id"] for entry, _ in reopened.iter_index()] == ["a"]
+    # Later saves still land after the damage and are readable
+    reopened.save("b", {"messages": []})
+    assert reopened.load("b")["session_id"] == "b"
+    assert reopened.load("a")["session_id"] == "a"
+
+def test_iter_index_resumes_from_an_offset(tmp_path):
+    store = SegmentTranscriptStore(str(tmp_path), compression="gzip")
+    store.save("a", {})
+    store.save("b", {})
+    (_, first_end), (_, second_end) = list(store.iter_index())
+    store.save("c", {})
+    assert [entry["session_id"] for entry, _ in store.iter_index(first_end)] == ["b", "c"]
+    assert [entry["session_id"] for entry, _ in store.iter_index(second_end)] == ["c"]
+
+def test_migrate_imports_chat_files_once(tmp_path):
+    source = tmp_path / "chat_histories"
+    files = FileTranscriptStore(str(source))
+    files.save("with-id", {"messages": [{"role": "user", "content": "hi"}]})
+    (source / "chat_20240101_120000.json").write_text(json.dumps({"messages": []}))
+    (source / "chat_broken.json").write_text("{")
+    os.utime(source / "chat_20240101_120000.json", (1704110400, 1704110400))
+
+    store = SegmentTranscriptStore(str(tmp_path / "store"), compression="gzip")
+    assert migrate_files(str(source), store) == (2, 1)
+    assert store.load("with-id")["messages"][0]["content"] == "hi"
+    legacy = store.load("legacy-20240101_120000")
+    assert legacy["saved_at"].startswith("2024-01-0")
+
+    # A rerun imports nothing new
+    assert migrate_files(str(source), store) == (0, 3)
+    assert len(store.index()) == 2
@@ -0,0 +1,61 @@
+import itertools
+
+import translation_cache
+from translation_cache import TranslationCache
+
+# Stand-in for the time module so last_used values never tie
+class FakeClock:
+    def __init__(self):
+        self.ticks = itertools.count(1)
+
+    def time(self):
+        return float(next(self.ticks))
+
+def test_memory_tier_evicts_the_least_recently_used():
+    cache = TranslationCache(path="", max_memory_entries=2)
+    cache.put("es", "en", "hola", "hello")
+    cache.put("es", "en", "adios", "bye")
+    assert cache.get("es", "en", "hola") == "hello"
+    cache.put("es", "en", "gracias", "thanks")
+
+    assert cache.get("es", "en", "adios") is None
+    assert cache.get("es", "en", "hola") == "hello"
+    stats = cache.get_stats()
+    assert stats["memory_evictions"] == 1 and stats["memory_entries"] == 2
+
+def test_disk_tier_serves_entries_evicted_from_memory(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = TranslationCache(path=path, max_memory_entries=1)
+    cache.put("es", "en", "hola", "hello")
+    cache.put("es", "en", "adios", "bye")
+    assert cache.get("es", "en", "hola") == "hello"
+    assert cache.get_stats()["disk_hits"] == 1
+
+    # A new process finds the translations on disk
+    reopened = TranslationCache(path=path)
+    assert reopened.get("es", "en", "adios") == "bye"
+    assert reopened.get("fr", "en", "adios") is None
+
+def test_disk_tier_trims_the_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_cache, "time", FakeClock())
+    cache = TranslationCache(path=str(tmp_path / "cache.db"), max_memory_entries=1, max_disk_entries=200)
+    cache.put("es", "en", "text 0", "translated 0")
+    for number in range(1, 200):
+        cache.put("es", "en", f"text {number}", f"translated {number}")
+    # Reading an old entry refreshes it, so the trim keeps it
+    assert cache.get("es", "en", "text 0") == "translated 0"
+    for number in range(200, 256):
+        cache.put("es", "en", f"text {number}", f"translated {number}")
+
+    assert cache.get_stats()["disk_evictions"] == 56
+    assert cache.get("es", "en", "text 0") == "translated 0"
+    assert cache.get("es", "en", "text 1") is None
+    assert cache.get("es", "en", "text 56") is None
+    assert cache.get("es", "en", "text 57") == "translated 57"
+
+def test_cached_translate_calls_the_translator_once(monkeypatch):
+    monkeypatch.setattr(translation_cache, "_cache", TranslationCache(path=""))
+    counters = {}
+    for _ in range(3):
+        assert translation_cache.cached_translate("Hello", "en", "es", counters) == "[es] Hello"
+    assert counters == {"translate": 1}
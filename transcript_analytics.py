@@ -0,0 +1,307 @@
+"""Funnel and sentiment reports over every saved interview.
+
+Reads the transcript store (or a directory of ``chat_*.json`` files) with a
+pool of worker processes:
+
+    python transcript_analytics.py
+    python transcript_analytics.py --files chat_histories --workers 8 --json report.json
+
+Each worker streams its share of the corpus one transcript at a time and
+returns a small ``Report``; the reports are merged as they arrive. Batches of
+index entries are the unit of work for the segment store, so only records the
+index committed are read (the latest save of each session, never a torn or
+repeated append), and batches of file names for the one-file-per-chat layout.
+Only a few tasks are queued at once, so memory grows with the index but not
+with the transcripts. Spilled message parts (records with ``part_of``) are
+skipped: the final transcript already holds every message.
+
+The report covers aggregate sentiment, the stage where each interview ended
+(drop-off), tech-stack frequencies and answer lengths per technical question.
+``--rescore`` recomputes the sentiment of every answer with the batched
+``sentiment_engine`` instead of using the scores saved with each message.
+"""
+import argparse
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from functools import partial
+
+from interview_session import FIELD_STAGES, STAGE_ORDER
+from sentiment_engine import score_batch
+from transcript_store import STORE_BACKEND, STORE_DIR, FILES_DIR, SegmentTranscriptStore
+
+# Distinct tech names and questions tracked; the rest are counted as "(other)"
+MAX_DISTINCT = int(os.environ.get("TALENTSCOUT_ANALYTICS_MAX_DISTINCT", "5000"))
+# Transcript files handed to a worker at a time (files layout only)
+FILES_PER_TASK = 500
+# Index entries handed to a worker at a time (segment store only)
+ENTRIES_PER_TASK = 500
+# Transcripts whose messages are rescored together with --rescore
+RESCORE_BATCH = 256
+# Bins of the per-interview average sentiment, over [-1, 1]
+SENTIMENT_BINS = 10
+OTHER = "(other)"
+
+# Mergeable totals for any number of transcripts
+class Report:
+    def __init__(self):
+        self.transcripts = 0
+        self.languages = Counter()
+        self.final_stages = Counter()
+        self.tech = Counter()
+        self.sentiment_count = 0
+        self.sentiment_sum = 0.0
+        self.sentiment_categories = Counter()
+        self.interview_sentiment = [0] * SENTIMENT_BINS
+        # question -> [answers, total words, longest answer in words]
+        self.answers = {}
+
+    def add(self, data):
+        self.transcripts += 1
+        self.languages[data.get("language", "en")] += 1
+        self.final_stages[final_stage(data)] += 1
+        for tech in data.get("candidate_info", {}).get("tech_stack") or []:
+            _bump(self.tech, tech.strip().lower(), 1)
+
+        scores = []
+        question = None
+        for message in data.get("messages", []):
+            if message["role"] == "assistant":
+                question = message["content"].strip()
+                continue
+            sentiment = message.get("sentiment")
+            if sentiment:
+                scores.append(sentiment["score"])
+                self.sentiment_categories[sentiment["category"]] += 1
+            if message.get("stage") == "technical_questions" and question is not None:
+                self.add_answer(question, 1, len(message["content"].split()))
+        if scores:
+            self.sentiment_count += len(scores)
+            self.sentiment_sum += sum(scores)
+            average = sum(scores) / len(scores)
+            self.interview_sentiment[min(int((average + 1) / 2 * SENTIMENT_BINS), SENTIMENT_BINS - 1)] += 1
+
+    def add_answer(self, question, answers, words, longest=None):
+        if question not in self.answers and len(self.answers) >= MAX_DISTINCT:
+            question = OTHER
+        stats = self.answers.setdefault(question, [0, 0, 0])
+        stats[0] += answers
+        stats[1] += words
+        stats[2] = max(stats[2], words if longest is None else longest)
+
+    def merge(self, other):
+        self.transcripts += other.transcripts
+        self.languages.update(other.languages)
+        self.final_stages.update(other.final_stages)
+        for tech, total in other.tech.items():
+            _bump(self.tech, tech, total)
+        self.sentiment_count += other.sentiment_count
+        self.sentiment_sum += other.sentiment_sum
+        self.sentiment_categories.update(other.sentiment_categories)
+        self.interview_sentiment = [a + b for a, b in zip(self.interview_sentiment, other.interview_sentiment)]
+        for question, (answers, words, longest) in other.answers.items():
+            self.add_answer(question, answers, words, longest)
+        return self
+
+    def funnel(self):
+        # (stage, interviews that reached it, interviews that ended there)
+        rows = []
+        reached = self.transcripts - sum(
+            total for stage, total in self.final_stages.items() if stage not in STAGE_ORDER
+        )
+        for stage in STAGE_ORDER:
+            ended = self.final_stages.get(stage, 0)
+            rows.append((stage, reached, ended))
+            reached -= ended
+        return rows
+
+    def to_dict(self, top=None):
+        answers = sorted(self.answers.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return {
+            "transcripts": self.transcripts,
+            "languages": dict(self.languages.most_common()),
+            "funnel": [
+                {"stage": stage, "reached": reached, "ended_here": ended}
+                for stage, reached, ended in self.funnel()
+            ],
+            "sentiment": {
+                "messages": self.sentiment_count,
+                "mean": self.sentiment_sum / self.sentiment_count if self.sentiment_count else None,
+                "categories": dict(self.sentiment_categories),
+                "interview_mean_bins": self.interview_sentiment,
+            },
+            "tech_stack": dict(self.tech.most_common(top)),
+            "answers": [
+                {"question": question, "answers": count, "mean_words": words / count, "max_words": longest}
+                for question, (count, words, longest) in answers
+            ],
+        }
+
+# Function to count a key without letting the counter grow past MAX_DISTINCT keys
+def _bump(counter, key, amount):
+    if key not in counter and len(counter) >= MAX_DISTINCT:
+        key = OTHER
+    counter[key] += amount
+
+# Function to find where an interview stopped; older transcripts have no "stage"
+def final_stage(data):
+    if data.get("stage"):
+        return data["stage"]
+    info = data.get("candidate_info", {})
+    if info.get("tech_stack"):
+        return "technical_questions"
+    stage = "greeting"
+    for field, next_stage, _ in FIELD_STAGES.values():
+        if field is not None and field in info:
+            stage = next_stage
+    return stage
+
+# Function to recompute the sentiment of every candidate message in a few transcripts
+def rescore(transcripts):
+    messages = [message for data in transcripts for message in data.get("messages", []) if message["role"] == "user"]
+    scores, categories = score_batch(message["content"] for message in messages)
+    for message, score, category in zip(messages, scores.tolist(), categories.tolist()):
+        message["sentiment"] = {"category": category, "score": score}
+
+# Function to summarize a stream of transcripts, optionally rescoring them in batches
+def build_report(transcripts, rescore_sentiment=False):
+    report = Report()
+    batch = []
+    for data in transcripts:
+        # Spilled message parts are repeated in the final transcript
+        if "part_of" in data:
+            continue
+        batch.append(data)
+        if len(batch) >= RESCORE_BATCH or not rescore_sentiment:
+            if rescore_sentiment:
+                rescore(batch)
+            for item in batch:
+                report.add(item)
+            batch = []
+    if batch:
+        rescore(batch)
+        for item in batch:
+            report.add(item)
+    return report
+
+# Function to read the records that index entries point at, one at a time
+def read_entries(directory, entries):
+    store = SegmentTranscriptStore(directory)
+    for entry in entries:
+        try:
+            yield store.read_entry(entry)
+        except (OSError, EOFError, ValueError) as e:
+            print(f"Warning: skipping unreadable transcript {entry['session_id']}: {e}")
+
+# Worker: a batch of index entries of the segment store
+def analyze_entries(entries, directory=STORE_DIR, rescore_sentiment=False):
+    return build_report(read_entries(directory, entries), rescore_sentiment)
+
+# Function to batch the latest index entry of every session, in file order
+def entry_batches(store, size=ENTRIES_PER_TASK):
+    entries = sorted(store.index().values(), key=lambda entry: (entry["segment"], entry["offset"]))
+    for start in range(0, len(entries), size):
+        yield entries[start:start + size]
+
+# Function to read per-chat JSON files one at a time
+def read_files(paths):
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                yield json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: skipping unreadable transcript {path}: {e}")
+
+# Worker: a batch of per-chat JSON files
+def analyze_files(paths, rescore_sentiment=False):
+    return build_report(read_files(paths), rescore_sentiment)
+
+# Function to list chat files in batches without holding the whole listing
+def file_batches(directory, size=FILES_PER_TASK):
+    batch = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith("chat_") and entry.name.endswith(".json"):
+                batch.append(entry.path)
+                if len(batch) >= size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+# Function to run worker tasks with only a few queued at a time and merge their reports
+def run_pool(worker, tasks, workers):
+    report = Report()
+    tasks = iter(tasks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            while len(pending) < workers * 2:
+                task = next(tasks, None)
+                if task is None:
+                    break
+                pending.add(pool.submit(worker, task))
+            if not pending:
+                return report
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                report.merge(future.result())
+
+# Function to print the report as text tables
+def print_report(report, top):
+    data = report.to_dict(top)
+    print(f"{data['transcripts']} transcripts")
+    print()
+    print(f"{'stage':<22}{'reached':>10}{'ended here':>12}{'drop-off':>10}")
+    for row in data["funnel"]:
+        rate = f"{100 * row['ended_here'] / row['reached']:.1f}%" if row["reached"] else "-"
+        print(f"{row['stage']:<22}{row['reached']:>10}{row['ended_here']:>12}{rate:>10}")
+
+    sentiment = data["sentiment"]
+    print()
+    if sentiment["messages"]:
+        shares = ", ".join(
+            f"{category} {100 * total / sentiment['messages']:.1f}%"
+            for category, total in sorted(sentiment["categories"].items())
+        )
+        print(f"Sentiment over {sentiment['messages']} answers: mean {sentiment['mean']:+.3f} ({shares})")
+    print(f"Languages: {', '.join(f'{language} {total}' for language, total in data['languages'].items())}")
+
+    print()
+    print(f"{'technology':<30}{'interviews':>12}")
+    for tech, total in data["tech_stack"].items():
+        print(f"{tech[:29]:<30}{total:>12}")
+
+    print()
+    print(f"{'question':<70}{'answers':>9}{'mean words':>12}{'max':>6}")
+    for row in data["answers"]:
+        question = " ".join(row["question"].split())
+        print(f"{question[:69]:<70}{row['answers']:>9}{row['mean_words']:>12.1f}{row['max_words']:>6}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--store", default=STORE_DIR, help="segment store directory")
+    parser.add_argument("--files", nargs="?", const=FILES_DIR, help="read chat_*.json files from this directory instead")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--top", type=int, default=15, help="rows shown per table (the JSON output keeps all)")
+    parser.add_argument("--json", help="also write the full report to this file")
+    parser.add_argument("--rescore", action="store_true", help="recompute message sentiment instead of using the saved scores")
+    args = parser.parse_args()
+
+    if args.files is None and STORE_BACKEND == "files":
+        args.files = FILES_DIR
+    if args.files is not None:
+        worker = partial(analyze_files, rescore_sentiment=args.rescore)
+        report = run_pool(worker, file_batches(args.files), args.workers)
+    else:
+        worker = partial(analyze_entries, directory=args.store, rescore_sentiment=args.rescore)
+        report = run_pool(worker, entry_batches(SegmentTranscriptStore(args.store)), args.workers)
+
+    print_report(report, args.top)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
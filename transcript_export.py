@@ -0,0 +1,225 @@
+"""Columnar (Parquet) export of the transcript store.
+
+Flattens every saved interview into three tables, each partitioned by the
+date it was saved and the interview language:
+
+* ``sessions``: one row per interview (stage reached, experience, position,
+  location, tech stack, message and sentiment totals). Name, email and phone
+  are left out.
+* ``messages``: one row per chat message, with its stage and sentiment.
+* ``sentiment``: one row per point of the sentiment series.
+
+The layout is ``<output>/<table>/date=YYYY-MM-DD/language=xx/part-*.parquet``,
+so it can be read with ``pyarrow.dataset``, pandas, DuckDB or Spark, loading
+only the columns and partitions a query needs:
+
+    python transcript_export.py --output transcripts_parquet
+    python -c "import pyarrow.dataset as ds; print(ds.dataset('transcripts_parquet/messages', partitioning='hive').to_table(columns=['stage', 'sentiment_score']))"
+
+Exports are incremental: the byte offset reached in the store's append-only
+index is kept in ``<output>/_export_state.json``, and each run only reads the
+transcripts saved since then and writes them as new part files. Older
+partitions are never rewritten. ``--rebuild`` starts over from the first
+transcript. Per-chat JSON files must be imported with
+``python transcript_store.py migrate`` first.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # Only the export needs pyarrow; it is listed in requirements.txt
+    pa = pq = None
+PYARROW_MISSING = "pyarrow is required for the Parquet export (pip install -r requirements.txt)"
+
+from transcript_store import STORE_DIR, SegmentTranscriptStore, atomic_write
+
+EXPORT_DIR = os.environ.get("TALENTSCOUT_EXPORT_DIR", "transcripts_parquet")
+# Message rows buffered before part files are written
+BATCH_ROWS = int(os.environ.get("TALENTSCOUT_EXPORT_BATCH_ROWS", "200000"))
+STATE_FILE = "_export_state.json"
+
+SCHEMAS = {}
+if pa is not None:
+    SCHEMAS = {
+        "sessions": pa.schema([
+            ("session_id", pa.string()),
+            ("saved_at", pa.timestamp("s")),
+            ("stage", pa.string()),
+            ("experience", pa.string()),
+            ("position", pa.string()),
+            ("location", pa.string()),
+            ("tech_stack", pa.list_(pa.string())),
+            ("messages", pa.int32()),
+            ("answers", pa.int32()),
+            ("mean_sentiment", pa.float64()),
+            ("detect_calls", pa.int32()),
+            ("translate_calls", pa.int32()),
+        ]),
+        "messages": pa.schema([
+            ("session_id", pa.string()),
+            ("saved_at", pa.timestamp("s")),
+            ("seq", pa.int32()),
+            ("role", pa.string()),
+            ("content", pa.string()),
+            ("stage", pa.string()),
+            ("sentiment_category", pa.string()),
+            ("sentiment_score", pa.float64()),
+        ]),
+        "sentiment": pa.schema([
+            ("session_id", pa.string()),
+            ("saved_at", pa.timestamp("s")),
+            ("message_number", pa.int32()),
+            ("score", pa.float64()),
+        ]),
+    }
+
+# Function to turn one saved transcript into rows for each table
+def flatten(session_id, data):
+    saved_at = datetime.fromisoformat(data["saved_at"]) if data.get("saved_at") else None
+    info = data.get("candidate_info", {})
+    messages = data.get("messages", [])
+    calls = data.get("service_calls", {})
+
+    message_rows = []
+    scores = []
+    for seq, message in enumerate(messages):
+        sentiment = message.get("sentiment") or {}
+        if sentiment:
+            scores.append(sentiment["score"])
+        message_rows.append({
+            "session_id": session_id,
+            "saved_at": saved_at,
+            "seq": seq,
+            "role": message["role"],
+            "content": message["content"],
+            "stage": message.get("stage"),
+            "sentiment_category": sentiment.get("category"),
+            "sentiment_score": sentiment.get("score"),
+        })
+
+    session_row = {
+        "session_id": session_id,
+        "saved_at": saved_at,
+        "stage": data.get("stage"),
+        "experience": info.get("experience"),
+        "position": info.get("position"),
+        "location": info.get("location"),
+        "tech_stack": info.get("tech_stack"),
+        "messages": len(messages),
+        "answers": len(scores),
+        "mean_sentiment": sum(scores) / len(scores) if scores else None,
+        "detect_calls": calls.get("detect"),
+        "translate_calls": calls.get("translate"),
+    }
+    sentiment_rows = [
+        {"session_id": session_id, "saved_at": saved_at, "message_number": position, "score": score}
+        for position, score in data.get("sentiment_history", [])
+    ]
+    return {"sessions": [session_row], "messages": message_rows, "sentiment": sentiment_rows}
+
+# Function to get the (date, language) partition of a transcript
+def partition_of(data):
+    date = (data.get("saved_at") or "unknown")[:10]
+    return date, data.get("language") or "en"
+
+# Buffers rows per table and partition and writes them as new part files
+class PartitionWriter:
+    def __init__(self, output):
+        self.output = output
+        self.buffers = {}
+        self.rows = 0
+
+    def add(self, partition, tables):
+        for table, rows in tables.items():
+            self.buffers.setdefault((table, partition), []).extend(rows)
+        self.rows += len(tables["messages"]) + 1
+
+    def flush(self, name):
+        written = 0
+        for (table, (date, language)), rows in sorted(self.buffers.items()):
+            if not rows:
+                continue
+            directory = os.path.join(self.output, table, f"date={date}", f"language={language}")
+            os.makedirs(directory, exist_ok=True)
+            arrow_table = pa.Table.from_pylist(rows, schema=SCHEMAS[table])
+            sink = pa.BufferOutputStream()
+            pq.write_table(arrow_table, sink, compression="zstd")
+            atomic_write(os.path.join(directory, f"{name}.parquet"), sink.getvalue().to_pybytes())
+            written += 1
+        self.buffers = {}
+        self.rows = 0
+        return written
+
+# Function to read the index offset reached by the previous export
+def load_state(output):
+    try:
+        with open(os.path.join(output, STATE_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"index_offset": 0, "sessions": 0}
+
+def save_state(output, state):
+    atomic_write(os.path.join(output, STATE_FILE), json.dumps(state).encode("utf-8"))
+
+# Function to drop part files written by a run that stopped before saving its state
+def remove_unfinished_parts(output, index_offset):
+    for path in glob.glob(os.path.join(output, "*", "date=*", "language=*", "part-*.parquet")):
+        start = int(os.path.basename(path).split("-")[1])
+        if start >= index_offset:
+            os.remove(path)
+
+# Function to export the transcripts saved since the last run; returns how many were exported
+def export(store, output=EXPORT_DIR, batch_rows=BATCH_ROWS):
+    if pa is None:
+        raise ImportError(PYARROW_MISSING)
+    os.makedirs(output, exist_ok=True)
+    state = load_state(output)
+    remove_unfinished_parts(output, state["index_offset"])
+
+    writer = PartitionWriter(output)
+    start = end = state["index_offset"]
+    exported = 0
+    for entry, offset in store.iter_index(start):
+        data = store.read_entry(entry)
+        end = offset
+        # Spilled message parts are repeated in the final transcript
+        if "part_of" in data:
+            continue
+        writer.add(partition_of(data), flatten(entry["session_id"], data))
+        exported += 1
+        if writer.rows >= batch_rows:
+            # Part files are named after the index range they cover
+            writer.flush(f"part-{start:012d}-{end:012d}")
+            state = {"index_offset": end, "sessions": state["sessions"] + exported}
+            save_state(output, state)
+            start, exported = end, 0
+    if end > start:
+        writer.flush(f"part-{start:012d}-{end:012d}")
+        state = {"index_offset": end, "sessions": state["sessions"] + exported}
+        save_state(output, state)
+    return state["sessions"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--store", default=STORE_DIR, help="segment store directory")
+    parser.add_argument("--output", default=EXPORT_DIR)
+    parser.add_argument("--rebuild", action="store_true", help="delete the export and write everything again")
+    args = parser.parse_args()
+
+    if pa is None:
+        parser.error(PYARROW_MISSING)
+    if args.rebuild and os.path.exists(args.output):
+        shutil.rmtree(args.output)
+    before = load_state(args.output)["sessions"]
+    total = export(SegmentTranscriptStore(args.store), args.output)
+    print(f"Exported {total - before} new transcripts to {args.output} ({total} in total)")
+
+if __name__ == "__main__":
+    main()
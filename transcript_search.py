@@ -0,0 +1,350 @@
+"""Full-text search over saved interviews.
+
+A local inverted index (SQLite, TALENTSCOUT_SEARCH_INDEX) maps every stemmed
+term of the candidate's messages and ``candidate_info`` (name, position,
+location, experience, tech stack) to the positions where it occurs in each
+interview. ``InterviewSession.save_chat_history()`` indexes each session as it
+is saved; the whole transcript store can be (re)indexed with:
+
+    python transcript_search.py index
+
+Queries are ranked with BM25. Bare words match any interview containing one
+of them, ``"quoted phrases"`` must appear word for word, and structured
+filters narrow the candidates first:
+
+    python transcript_search.py query '"kubernetes cluster" terraform' --tech python --min-experience 3
+
+Email addresses and phone numbers are not indexed.
+"""
+import argparse
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from functools import lru_cache
+
+from input_parsing import parse_email, parse_phone
+from startup import lazy_attr
+from transcript_store import get_transcript_store
+
+# SQLite file of the index; "none" turns indexing off
+SEARCH_INDEX_PATH = os.environ.get("TALENTSCOUT_SEARCH_INDEX", "search_index.db")
+# Show the search box in the app's sidebar (it exposes other candidates' answers)
+RECRUITER_SEARCH = os.environ.get("TALENTSCOUT_RECRUITER_SEARCH", "0") == "1"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Position gap between messages so a phrase never spans two answers
+MESSAGE_GAP = 16
+# candidate_info fields that are searchable, in indexing order
+INDEXED_FIELDS = ("name", "position", "location", "experience")
+# Answers never indexed or shown, so contact details stay out of search
+PRIVATE_STAGES = ("email", "phone")
+
+# Words, keeping tech names such as c++, c#, node.js and ci/cd together
+TOKEN_PATTERN = re.compile(r"\w[\w.+#/-]*")
+QUERY_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+# nltk is imported on first use to keep cold start fast
+SnowballStemmer = lazy_attr("nltk.stem.snowball", "SnowballStemmer")
+_stemmer = None
+
+@lru_cache(maxsize=65536)
+def stem(token):
+    global _stemmer
+    if _stemmer is None:
+        _stemmer = SnowballStemmer("english")
+    return _stemmer.stem(token)
+
+# Function to split text into stemmed terms
+def tokenize(text):
+    return [stem(match.group().rstrip(".-/")) for match in TOKEN_PATTERN.finditer(text.lower())]
+
+# Function to read "5 years" style answers as a number
+def parse_experience(text):
+    match = NUMBER_PATTERN.search(text or "")
+    return float(match.group()) if match else None
+
+# Positional inverted index of interviews in a local SQLite database
+class SearchIndex:
+    def __init__(self, path=SEARCH_INDEX_PATH):
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " doc_id INTEGER PRIMARY KEY, session_id TEXT UNIQUE NOT NULL, saved_at TEXT,"
+            " name TEXT, position TEXT, location TEXT, experience_years REAL,"
+            " tech_stack TEXT, language TEXT, length INTEGER NOT NULL);"
+            # tf and the document length are repeated here so ranking needs no join
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " term TEXT NOT NULL, doc_id INTEGER NOT NULL, tf INTEGER NOT NULL, length INTEGER NOT NULL,"
+            " positions BLOB NOT NULL, PRIMARY KEY (term, doc_id)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS postings_by_doc ON postings (doc_id);"
+        )
+        self._db.commit()
+
+    def add(self, session_id, data):
+        with self._lock, self._db:
+            self._add(session_id, data)
+
+    def add_many(self, items, batch=500):
+        # Bulk (re)indexing: one transaction per batch instead of per interview
+        added = 0
+        items = iter(items)
+        while True:
+            with self._lock, self._db:
+                for session_id, data in items:
+                    self._add(session_id, data)
+                    added += 1
+                    if added % batch == 0:
+                        break
+                else:
+                    return added
+
+    def _add(self, session_id, data):
+        # Replaces the interview's postings if it was indexed before
+        info = data.get("candidate_info", {})
+        tech_stack = [tech.strip().lower() for tech in info.get("tech_stack") or []]
+        texts = [str(info[field]) for field in INDEXED_FIELDS if info.get(field)]
+        texts.append(" ".join(tech_stack))
+        texts.extend(message["content"] for message in candidate_messages(data))
+
+        postings = {}
+        position = 0
+        for text in texts:
+            for term in tokenize(text):
+                postings.setdefault(term, array("I")).append(position)
+                position += 1
+            position += MESSAGE_GAP
+        length = sum(len(positions) for positions in postings.values())
+
+        row = self._db.execute("SELECT doc_id FROM documents WHERE session_id=?", (session_id,)).fetchone()
+        if row is not None:
+            self._db.execute("DELETE FROM postings WHERE doc_id=?", (row[0],))
+        cursor = self._db.execute(
+            "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                row[0] if row is not None else None, session_id, data.get("saved_at"),
+                info.get("name"), info.get("position"), info.get("location"),
+                parse_experience(info.get("experience")),
+                f",{','.join(tech_stack)}," if tech_stack else "", data.get("language"), length,
+            )
+        )
+        doc_id = cursor.lastrowid
+        self._db.executemany(
+            "INSERT INTO postings VALUES (?, ?, ?, ?, ?)",
+            [(term, doc_id, len(positions), length, positions.tobytes()) for term, positions in postings.items()]
+        )
+
+    def _filtered_docs(self, tech, location, min_experience):
+        clauses = []
+        params = []
+        if tech:
+            clauses.append("tech_stack LIKE ? ESCAPE '\\'")
+            params.append(f"%,{escape_like(tech.strip().lower())},%")
+        if location:
+            clauses.append("location LIKE ? ESCAPE '\\'")
+            params.append(f"%{escape_like(location.strip())}%")
+        if min_experience is not None:
+            clauses.append("experience_years >= ?")
+            params.append(min_experience)
+        if not clauses:
+            return None
+        rows = self._db.execute(f"SELECT doc_id FROM documents WHERE {' AND '.join(clauses)}", params)
+        return {row[0] for row in rows}
+
+    def _postings(self, term, allowed, with_positions):
+        # Returns (document frequency, {doc_id: (tf, length, positions blob)})
+        column = "positions" if with_positions else "NULL"
+        rows = self._db.execute(
+            f"SELECT doc_id, tf, length, {column} FROM postings WHERE term=?", (term,)
+        ).fetchall()
+        if allowed is None:
+            return len(rows), {doc_id: (tf, length, blob) for doc_id, tf, length, blob in rows}
+        return len(rows), {doc_id: (tf, length, blob) for doc_id, tf, length, blob in rows if doc_id in allowed}
+
+    def search(self, query, tech=None, location=None, min_experience=None, limit=10):
+        phrases = []
+        for phrase, word in QUERY_PATTERN.findall(query):
+            terms = tokenize(phrase or word)
+            if terms:
+                phrases.append(terms)
+
+        with self._lock:
+            allowed = self._filtered_docs(tech, location, min_experience)
+            total_docs, total_length = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents"
+            ).fetchone()
+            if not phrases:
+                # Filters only: most recently indexed interviews first
+                if allowed is None:
+                    return []
+                scores = {doc_id: 0.0 for doc_id in sorted(allowed, reverse=True)[:limit]}
+            else:
+                postings = {}
+                phrase_terms = {term for terms in phrases if len(terms) > 1 for term in terms}
+                for terms in phrases:
+                    for term in terms:
+                        if term not in postings:
+                            postings[term] = self._postings(term, allowed, term in phrase_terms)
+                scores = self._score(phrases, postings, total_docs, total_length / max(total_docs, 1))
+            return self._results(scores, limit)
+
+    def _score(self, phrases, postings, total_docs, average_length):
+        required = [terms for terms in phrases if len(terms) > 1]
+        if required:
+            # Every phrase has to appear; single words only add to the score
+            candidates = None
+            for terms in required:
+                matched = set.intersection(*(set(postings[term][1]) for term in terms))
+                matched = {
+                    doc_id for doc_id in matched
+                    if contains_phrase([postings[term][1][doc_id][2] for term in terms])
+                }
+                candidates = matched if candidates is None else candidates & matched
+        else:
+            candidates = None
+
+        scores = {}
+        for df, docs in postings.values():
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for doc_id, (tf, length, _) in docs.items():
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def _results(self, scores, limit):
+        if not scores:
+            return []
+        top = heapq.nlargest(limit, scores, key=scores.get)
+        rows = {row[0]: row for row in self._db.execute(
+            "SELECT doc_id, session_id, saved_at, name, position, location, experience_years, tech_stack"
+            f" FROM documents WHERE doc_id IN ({','.join('?' * len(top))})", top
+        )}
+        results = []
+        for doc_id in top:
+            _, session_id, saved_at, name, position, location, experience, tech_stack = rows[doc_id]
+            results.append({
+                "session_id": session_id,
+                "score": scores[doc_id],
+                "saved_at": saved_at,
+                "name": name,
+                "position": position,
+                "location": location,
+                "experience_years": experience,
+                "tech_stack": [tech for tech in (tech_stack or "").split(",") if tech],
+            })
+        return results
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+# Function to get the candidate's searchable messages
+def candidate_messages(data):
+    info = data.get("candidate_info", {})
+    contacts = [str(info[field]).strip().lower() for field in ("email", "phone") if info.get(field)]
+    return [
+        message for message in data.get("messages", [])
+        if message["role"] == "user" and message.get("stage") not in PRIVATE_STAGES
+        and not contains_contact(message["content"], contacts)
+    ]
+
+# Function to check whether an answer gives contact details; older transcripts have no "stage" to go by
+def contains_contact(text, contacts=()):
+    lowered = text.lower()
+    if any(contact in lowered for contact in contacts):
+        return True
+    return parse_email(text) is not None or parse_phone(text) is not None
+
+# Function to make user input match literally inside a LIKE pattern
+def escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+# Function to check whether consecutive terms occur at consecutive positions
+def contains_phrase(blobs):
+    position_lists = []
+    for blob in blobs:
+        positions = array("I")
+        positions.frombytes(blob)
+        position_lists.append(positions)
+    starts = set(position_lists[0])
+    for offset, positions in enumerate(position_lists[1:], start=1):
+        starts &= {position - offset for position in positions}
+        if not starts:
+            return False
+    return True
+
+# Function to get the candidate's messages that contain any of the query's terms
+def matching_lines(data, query, limit=2, width=160):
+    terms = {term for phrase, word in QUERY_PATTERN.findall(query) for term in tokenize(phrase or word)}
+    lines = []
+    for message in candidate_messages(data):
+        if terms.intersection(tokenize(message["content"])):
+            text = " ".join(message["content"].split())
+            lines.append(text if len(text) <= width else text[:width - 1] + "…")
+            if len(lines) >= limit:
+                break
+    return lines
+
+# Process-wide index shared by every session
+_index = None
+_index_lock = threading.Lock()
+
+# Function to get the search index, or None when indexing is off
+def get_search_index():
+    global _index
+    if SEARCH_INDEX_PATH == "none":
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SearchIndex()
+    return _index
+
+def main():
+    parser = argparse.ArgumentParser(description="Search saved interviews.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("index", help="index every transcript in the transcript store")
+    query = sub.add_parser("query", help="find interviews by what the candidate said")
+    query.add_argument("text", nargs="?", default="")
+    query.add_argument("--tech", help="only candidates with this technology in their stack")
+    query.add_argument("--location", help="only candidates whose location contains this")
+    query.add_argument("--min-experience", type=float, help="only candidates with at least this many years")
+    query.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    store = get_transcript_store()
+    if args.command == "index":
+        # Spilled message parts are repeated in the final transcript
+        indexed = index.add_many(
+            (data["session_id"], data) for data in store.iter_sessions()
+            if "part_of" not in data and data.get("session_id")
+        )
+        print(f"Indexed {indexed} transcripts into {SEARCH_INDEX_PATH}")
+        return
+
+    started = time.perf_counter()
+    results = index.search(args.text, args.tech, args.location, args.min_experience, args.limit)
+    elapsed = time.perf_counter() - started
+    print(f"{len(results)} results in {elapsed * 1000:.1f} ms")
+    for result in results:
+        tech = ", ".join(result["tech_stack"])
+        print(f"\n{result['score']:6.2f}  {result['name']} — {result['position']}, {result['location']} [{tech}]")
+        print(f"        session {result['session_id']}, saved {result['saved_at']}")
+        data = store.load(result["session_id"]) if args.text else None
+        for line in matching_lines(data or {}, args.text):
+            print(f"        > {line}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Storage for finished interview transcripts.
+
+Two backends are available (TALENTSCOUT_TRANSCRIPT_STORE):
+
+* ``segments`` (default) appends each session as one compressed JSON line to
+  rotating segment files, with a separate offset index so a single session
+  can be read without scanning.
+* ``files`` keeps the original one-JSON-file-per-chat layout.
+
+Existing ``chat_histories/*.json`` files can be imported with:
+
+    python transcript_store.py migrate chat_histories
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on the in-process lock only
+    fcntl = None
+
+STORE_BACKEND = os.environ.get("TALENTSCOUT_TRANSCRIPT_STORE", "segments")
+STORE_DIR = os.environ.get("TALENTSCOUT_TRANSCRIPT_DIR", "chat_store")
+FILES_DIR = os.environ.get("TALENTSCOUT_CHAT_HISTORY_DIR", "chat_histories")
+COMPRESSION = os.environ.get("TALENTSCOUT_TRANSCRIPT_COMPRESSION", "gzip")
+SEGMENT_MAX_BYTES = int(os.environ.get("TALENTSCOUT_SEGMENT_MAX_BYTES", str(64 * 2**20)))
+
+# Function to create a unique session ID
+def new_session_id():
+    return uuid.uuid4().hex
+
+# Function to get (compress, decompress, extension) for a compression name
+def _codec(name):
+    if name == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            print("Warning: zstandard is not installed. Using gzip for transcripts.")
+        else:
+            return (
+                lambda data: zstandard.ZstdCompressor().compress(data),
+                lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+                ".jsonl.zst",
+            )
+    return gzip.compress, gzip.decompress, ".jsonl.gz"
+
+# Function to get the decompressor of an existing segment file from its extension
+def _segment_decompressor(segment):
+    if segment.endswith(".zst"):
+        import zstandard
+        return lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress
+
+# Function to read one index line; None for the remains of a torn write
+def _parse_index_line(line):
+    try:
+        return json.loads(line)
+    except ValueError:
+        print(f"Warning: skipping damaged transcript index line: {line[:80]!r}")
+        return None
+
+# Function to write a file so readers never see it half-written
+def atomic_write(path, data):
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# Append-only, compressed JSONL segments with an offset index
+class SegmentTranscriptStore:
+    def __init__(self, directory=STORE_DIR, compression=COMPRESSION, segment_max_bytes=SEGMENT_MAX_BYTES):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self._compress, self._decompress, self._extension = _codec(compression)
+        self._lock = threading.Lock()
+        self._index = None
+        self._index_size = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, "index.jsonl")
+
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f"segment-{number:06d}{self._extension}")
+
+    def _segments(self):
+        return sorted(glob.glob(os.path.join(self.directory, f"segment-*{self._extension}")))
+
+    def _current_segment(self):
+        segments = self._segments()
+        if not segments:
+            return self._segment_path(1)
+        latest = segments[-1]
+        if os.path.getsize(latest) >= self.segment_max_bytes:
+            number = int(os.path.basename(latest).split("-")[1].split(".")[0])
+            return self._segment_path(number + 1)
+        return latest
+
+    def _append(self, path, data, line=False):
+        # O_APPEND plus an exclusive lock keeps concurrent writers from interleaving
+        fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            offset = os.lseek(fd, 0, os.SEEK_END)
+            # A writer that died mid-line must not swallow this line
+            if line and offset and os.pread(fd, 1, offset - 1) != b"\n":
+                data = b"\n" + data
+            os.write(fd, data)
+            os.fsync(fd)
+            return offset
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def save(self, session_id, data):
+        record = dict(data, session_id=session_id)
+        record.setdefault("saved_at", datetime.now().isoformat(timespec="seconds"))
+        # Each record is its own compressed member, so it can be read on its own
+        payload = self._compress((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+
+        with self._lock:
+            segment = self._current_segment()
+            offset = self._append(segment, payload)
+            # The index is written last, so it never points at incomplete data
+            entry = {
+                "session_id": session_id,
+                "segment": os.path.basename(segment),
+                "offset": offset,
+                "length": len(payload),
+                "saved_at": record["saved_at"],
+            }
+            self._append(self.index_path, (json.dumps(entry) + "\n").encode("utf-8"), line=True)
+        return session_id
+
+    def _load_index(self):
+        # Read only the index lines appended since the last call
+        if self._index is None:
+            self._index = {}
+            self._index_size = 0
+        if not os.path.exists(self.index_path):
+            return self._index
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_size)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._index_size += len(line)
+                entry = _parse_index_line(line)
+                if entry is not None:
+                    self._index[entry["session_id"]] = entry
+        return self._index
+
+    def index(self):
+        with self._lock:
+            return dict(self._load_index())
+
+    def __contains__(self, session_id):
+        with self._lock:
+            return session_id in self._load_index()
+
+    def load(self, session_id):
+        with self._lock:
+            entry = self._load_index().get(session_id)
+        if entry is None:
+            return None
+        return self.read_entry(entry)
+
+    def read_entry(self, entry):
+        with open(os.path.join(self.directory, entry["segment"]), "rb") as f:
+            f.seek(entry["offset"])
+            payload = f.read(entry["length"])
+        # Segments written before a compression change keep their own format
+        if entry["segment"].endswith(self._extension):
+            return json.loads(self._decompress(payload))
+        return json.loads(_segment_decompressor(entry["segment"])(payload))
+
+    def iter_index(self, offset=0):
+        # Stream (entry, byte offset after it) for the complete index lines from offset on
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                entry = _parse_index_line(line)
+                if entry is not None:
+                    yield entry, offset
+
+    def iter_sessions(self):
+        # Stream every session through the index, one record in memory at a time
+        for session_id in self.index():
+            data = self.load(session_id)
+            if data is not None:
+                yield data
+
+# Function to shorten a key for file names; spilled parts keep their "-partN" suffix
+def _file_key(session_id):
+    head, sep, tail = session_id.partition("-")
+    return head[:12] + sep + tail
+
+# The original layout: one JSON file per chat, now with a unique name
+class FileTranscriptStore:
+    def __init__(self, directory=FILES_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, session_id, data):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        record = dict(data, session_id=session_id)
+        record.setdefault("saved_at", datetime.now().isoformat(timespec="seconds"))
+        filename = os.path.join(self.directory, f"chat_{timestamp}_{_file_key(session_id)}.json")
+        atomic_write(filename, json.dumps(record, indent=2).encode("utf-8"))
+        return session_id
+
+    def load(self, session_id):
+        for path in glob.glob(os.path.join(self.directory, f"chat_*_{_file_key(session_id)}.json")):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        return None
+
+    def iter_sessions(self):
+        for path in sorted(glob.glob(os.path.join(self.directory, "chat_*.json"))):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    yield json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: skipping unreadable transcript {path}: {e}")
+
+# Process-wide store shared by every session
+_store = None
+_store_lock = threading.Lock()
+
+# Function to get the configured transcript store
+def get_transcript_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if STORE_BACKEND == "files":
+                    _store = FileTranscriptStore()
+                else:
+                    _store = SegmentTranscriptStore()
+    return _store
+
+# Function to import per-file chat histories into a segment store
+def migrate_files(source_dir, store):
+    imported = skipped = 0
+    for path in sorted(glob.glob(os.path.join(source_dir, "chat_*.json"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: skipping unreadable transcript {path}: {e}")
+            skipped += 1
+            continue
+        # Old files have no session ID; derive a stable one so reruns are no-ops
+        session_id = data.get("session_id") or f"legacy-{name[len('chat_'):]}"
+        if session_id in store:
+            skipped += 1
+            continue
+        if "saved_at" not in data:
+            data["saved_at"] = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="seconds")
+        store.save(session_id, data)
+        imported += 1
+    return imported, skipped
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the transcript store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="import chat_histories/*.json into the segment store")
+    migrate.add_argument("source", nargs="?", default=FILES_DIR)
+    migrate.add_argument("--store", default=STORE_DIR)
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        imported, skipped = migrate_files(args.source, SegmentTranscriptStore(args.store))
+        print(f"Imported {imported} transcripts into {args.store} ({skipped} skipped)")
+
+if __name__ == "__main__":
+    main()
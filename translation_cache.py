@@ -0,0 +1,167 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Where the on-disk tier lives; set TALENTSCOUT_TRANSLATION_CACHE="" to disable it
+CACHE_PATH = os.environ.get("TALENTSCOUT_TRANSLATION_CACHE", "translation_cache.db")
+# Set TALENTSCOUT_TRANSLATOR=stub to run without network access
+TRANSLATOR_BACKEND = os.environ.get("TALENTSCOUT_TRANSLATOR", "google")
+
+# Local stand-in for GoogleTranslator used in network-free environments
+class StubTranslator:
+    def __init__(self, source="auto", target="en"):
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        if self.target == "en" or self.source == self.target:
+            return text
+        return f"[{self.target}] {text}"
+
+# Function to create a translator for the configured backend
+def make_translator(source, target):
+    if TRANSLATOR_BACKEND == "stub":
+        return StubTranslator(source=source, target=target)
+    from deep_translator import GoogleTranslator
+    return GoogleTranslator(source=source, target=target)
+
+# Two-tier cache: an in-memory LRU in front of a SQLite table
+class TranslationCache:
+    def __init__(self, path=CACHE_PATH, max_memory_entries=2048, max_disk_entries=100000):
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes_since_trim = 0
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    " source TEXT NOT NULL, target TEXT NOT NULL, text TEXT NOT NULL,"
+                    " translated TEXT NOT NULL, last_used REAL NOT NULL,"
+                    " PRIMARY KEY (source, target, text))"
+                )
+                self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: translation cache disk tier disabled: {e}")
+                self._db = None
+
+    def _remember(self, key, translated):
+        self._memory[key] = translated
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["memory_evictions"] += 1
+
+    def get(self, source, target, text):
+        key = (source, target, text)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT translated FROM translations WHERE source=? AND target=? AND text=?",
+                    key
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE translations SET last_used=? WHERE source=? AND target=? AND text=?",
+                        (time.time(),) + key
+                    )
+                    self._db.commit()
+                    self._remember(key, row[0])
+                    self.stats["disk_hits"] += 1
+                    return row[0]
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, source, target, text, translated):
+        key = (source, target, text)
+        with self._lock:
+            self._remember(key, translated)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                    key + (translated, time.time())
+                )
+                self._db.commit()
+                # Trimming needs a COUNT, so only do it every so often
+                self._writes_since_trim += 1
+                if self._writes_since_trim >= 256:
+                    self._writes_since_trim = 0
+                    self._trim_disk()
+
+    def _trim_disk(self):
+        count = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM translations WHERE rowid IN ("
+                " SELECT rowid FROM translations ORDER BY last_used LIMIT ?)",
+                (excess,)
+            )
+            self._db.commit()
+            self.stats["disk_evictions"] += excess
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM translations")
+                self._db.commit()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+# Process-wide cache shared by every session
+_cache = None
+_cache_lock = threading.Lock()
+
+# Function to get the shared translation cache
+def get_translation_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TranslationCache()
+    return _cache
+
+# Function to translate text through the cache; raises if the translator fails
+def cached_translate(text, source, target, counters=None):
+    cache = get_translation_cache()
+    translated = cache.get(source, target, text)
+    if translated is not None:
+        return translated
+
+    # Only real translator round trips are counted
+    if counters is not None:
+        counters["translate"] = counters.get("translate", 0) + 1
+    translated = make_translator(source, target).translate(text)
+    # Only cache real results so a failed call is retried next time
+    if translated:
+        cache.put(source, target, text, translated)
+    return translated
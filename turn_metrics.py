@@ -0,0 +1,202 @@
+"""Timing spans and counters for the per-turn hot path.
+
+Each candidate turn runs inside ``turn(stage)``. The expensive calls made
+during that turn are wrapped in ``span(name)`` and land in one latency
+histogram per (span, stage). Failures that the interview recovers from, such
+as translator errors or LLM questions replaced by the question bank, are
+counted rather than silently dropped.
+
+Metrics are exposed in the Prometheus text format by ``render_prometheus()``:
+at ``/metrics`` in ``api_server.py``, and in TALENTSCOUT_METRICS_FILE when that
+is set. Set TALENTSCOUT_PROFILE_SLOWEST=N to keep cProfile dumps of the N
+slowest turns in TALENTSCOUT_PROFILE_DIR (inspect them with ``pstats`` or
+snakeviz).
+"""
+import bisect
+import cProfile
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Set to a path to have the metrics written there periodically (Prometheus text format)
+METRICS_FILE = os.environ.get("TALENTSCOUT_METRICS_FILE", "")
+METRICS_FILE_INTERVAL_S = float(os.environ.get("TALENTSCOUT_METRICS_INTERVAL_S", "15"))
+# Profile every turn and keep the N slowest (0 disables profiling)
+PROFILE_SLOWEST = int(os.environ.get("TALENTSCOUT_PROFILE_SLOWEST", "0"))
+PROFILE_DIR = os.environ.get("TALENTSCOUT_PROFILE_DIR", "turn_profiles")
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Counters reported even before they are first incremented
+COUNTERS = {
+    "llm_fallbacks_total": "Technical questions taken from the question bank instead of the LLM",
+    "generation_failures_total": "LLM generations that timed out, failed or produced no usable question",
+    "translator_failures_total": "Language detection or translation calls that raised and were skipped",
+}
+
+# Latency histogram with fixed buckets
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+# Process-wide histograms and counters
+class TurnMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, span_name, stage, seconds):
+        key = (span_name, stage)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def render(self):
+        lines = [
+            "# HELP talentscout_span_seconds Time spent in each hot-path call, by interview stage",
+            "# TYPE talentscout_span_seconds histogram",
+        ]
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+            for (span_name, stage), histogram in histograms:
+                labels = f'span="{span_name}",stage="{stage}"'
+                cumulative = 0
+                for bound, bucket_count in zip(BUCKETS + ("+Inf",), histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f'talentscout_span_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"talentscout_span_seconds_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"talentscout_span_seconds_count{{{labels}}} {histogram.count}")
+        for name, help_text in COUNTERS.items():
+            lines.append(f"# HELP talentscout_{name} {help_text}")
+            lines.append(f"# TYPE talentscout_{name} counter")
+            for (counter, labels), value in counters:
+                if counter == name:
+                    label_text = ",".join(f'{key}="{val}"' for key, val in labels)
+                    suffix = f"{{{label_text}}}" if label_text else ""
+                    lines.append(f"talentscout_{name}{suffix} {value}")
+        return "\n".join(lines) + "\n"
+
+# Keeps cProfile dumps of the slowest turns seen so far
+class SlowestTurns:
+    def __init__(self, keep=PROFILE_SLOWEST, directory=PROFILE_DIR):
+        self.keep = keep
+        self.directory = directory
+        self._heap = []
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def offer(self, seconds, stage, profiler):
+        with self._lock:
+            if len(self._heap) >= self.keep and seconds <= self._heap[0][0]:
+                return None
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(
+                self.directory,
+                f"turn-{next(self._sequence):06d}-{stage}-{seconds * 1000:.0f}ms.prof"
+            )
+            profiler.dump_stats(path)
+            heapq.heappush(self._heap, (seconds, path))
+            if len(self._heap) > self.keep:
+                _, dropped = heapq.heappop(self._heap)
+                try:
+                    os.remove(dropped)
+                except OSError:
+                    pass
+            return path
+
+    def paths(self):
+        with self._lock:
+            return [path for _, path in sorted(self._heap, reverse=True)]
+
+turn_metrics = TurnMetrics()
+slowest_turns = SlowestTurns()
+
+# The stage of the turn running on this thread, used to label spans
+_current = threading.local()
+_file_lock = threading.Lock()
+_file_written_at = 0.0
+
+def current_stage():
+    # Work done outside a turn (prefetch, pool refills, greetings)
+    return getattr(_current, "stage", None) or "background"
+
+# Function to time a block and record it under the current turn's stage
+@contextmanager
+def span(name, stage=None):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        turn_metrics.observe(name, stage or current_stage(), time.perf_counter() - started)
+
+# Function to time (and optionally profile) one whole candidate turn
+@contextmanager
+def turn(stage):
+    _current.stage = stage
+    profiler = None
+    if PROFILE_SLOWEST > 0:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        if profiler is not None:
+            profiler.disable()
+            slowest_turns.offer(elapsed, stage, profiler)
+        turn_metrics.observe("turn", stage, elapsed)
+        _current.stage = None
+        maybe_write_metrics_file()
+
+# Function to count an event that was handled without failing the turn
+def count(name, **labels):
+    turn_metrics.inc(name, **labels)
+
+# Function to get all metrics in the Prometheus text exposition format
+def render_prometheus():
+    return turn_metrics.render()
+
+# Function to write the metrics file, at most once per interval
+def maybe_write_metrics_file(path=None, force=False):
+    global _file_written_at
+    path = path or METRICS_FILE
+    if not path:
+        return False
+    now = time.monotonic()
+    with _file_lock:
+        if not force and now - _file_written_at < METRICS_FILE_INTERVAL_S:
+            return False
+        _file_written_at = now
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(render_prometheus())
+        os.replace(tmp_path, path)
+    return True